@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+spaCy Annotation Store
+
+Persists POS-tagged questions as sharded spaCy DocBin files so proper noun
+rules can be re-run over the stored annotations without tagging again.
+A store lives in its own directory keyed by the corpus hash and the spaCy
+model name and version, and holds one Doc per question row, in row order
+(rows that were not tagged get an empty Doc). Shards are loaded lazily,
+one at a time.
+"""
+
+import os
+import json
+
+import spacy
+from spacy.tokens import Doc, DocBin
+
+# Token attributes kept per Doc; whitespace is always stored by DocBin
+STORED_ATTRS = ["ORTH", "POS", "TAG", "LEMMA"]
+DEFAULT_SHARD_SIZE = 10000
+MANIFEST = "manifest.json"
+
+
+def store_dir(root, texts_hash, nlp):
+    """Return the store directory for a corpus hash and spaCy pipeline."""
+    model = f"{nlp.meta.get('lang', 'xx')}_{nlp.meta.get('name', 'model')}"
+    version = nlp.meta.get("version", "0")
+    return os.path.join(root, f"{texts_hash[:16]}_{model}-{version}")
+
+
+class AnnotationWriter:
+    """Writes Docs for consecutive rows into fixed-size DocBin shards."""
+
+    def __init__(self, path, total, texts_hash, nlp, shard_size=DEFAULT_SHARD_SIZE):
+        """
+        Args:
+            path (str): Store directory (see store_dir)
+            total (int): Number of rows in the corpus
+            texts_hash (str): corpus_hash of the question texts
+            nlp (spacy.Language): Pipeline the Docs are tagged with
+            shard_size (int): Docs per shard file
+        """
+        self.path = path
+        self.total = total
+        self.shard_size = shard_size
+        self.vocab = nlp.vocab
+        self.manifest = {
+            "corpus_hash": texts_hash,
+            "model": nlp.meta.get("name"),
+            "model_version": nlp.meta.get("version"),
+            "lang": nlp.meta.get("lang"),
+            "attrs": STORED_ATTRS,
+            "shard_size": shard_size,
+            "num_docs": total,
+            "shards": [],
+            "complete": False,
+        }
+        self._bin = DocBin(attrs=STORED_ATTRS)
+        self._next = 0
+        os.makedirs(path, exist_ok=True)
+
+    def add(self, position, doc):
+        """Store the Doc of row `position`; skipped rows get empty Docs."""
+        while self._next < position:
+            self._append(Doc(self.vocab))
+        self._append(doc)
+
+    def close(self):
+        """Pad to the full row count, write the last shard and the manifest."""
+        while self._next < self.total:
+            self._append(Doc(self.vocab))
+        if len(self._bin):
+            self._flush()
+        self.manifest["complete"] = True
+        with open(os.path.join(self.path, MANIFEST), "w") as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def _append(self, doc):
+        self._bin.add(doc)
+        self._next += 1
+        if len(self._bin) == self.shard_size:
+            self._flush()
+
+    def _flush(self):
+        name = f"shard_{len(self.manifest['shards']):05d}.spacy"
+        self._bin.to_disk(os.path.join(self.path, name))
+        self.manifest["shards"].append(name)
+        self._bin = DocBin(attrs=STORED_ATTRS)
+
+
+class AnnotationStore:
+    """Read access to a completed annotation store."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Store directory containing manifest.json
+
+        Raises:
+            ValueError: If the store is missing or was not completed
+        """
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"No annotation store at {path}")
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+        if not self.manifest.get("complete"):
+            raise ValueError(f"Annotation store {path} is incomplete")
+
+    def __len__(self):
+        return self.manifest["num_docs"]
+
+    def iter_docs(self, vocab=None):
+        """
+        Yield the stored Docs in row order, loading one shard at a time.
+
+        Args:
+            vocab (Optional[Vocab]): Vocab to attach Docs to (default: that of a
+                blank pipeline for the store's language, so no model is loaded)
+        """
+        if vocab is None:
+            vocab = spacy.blank(self.manifest.get("lang") or "en").vocab
+        for name in self.manifest["shards"]:
+            shard = DocBin().from_disk(os.path.join(self.path, name))
+            yield from shard.get_docs(vocab)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Detector Benchmarks
+
+Measures the throughput of each detector on a seeded sample of questions
+and reports how often the n-gram non-English engine agrees with the
+enchant dictionary backend.
+
+Usage: python benchmark_detectors.py [--sample-size N] [--data-dir DIR]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+from data_download_and_eda import load_jeopardy_data
+
+
+def load_detectors(foreign_threshold=None):
+    """
+    Import the detectors as the batch functions the curation pipeline runs.
+
+    Proper nouns are timed through the nlp.pipe batch path. That detector is
+    skipped with a warning when the spaCy model is not installed.
+
+    Returns:
+        dict: Detector name -> callable(List[str]) -> List
+    """
+    from check_for_numbers import contains_number_batch
+    from check_for_non_english_words import contains_non_english_and_words_batch
+    from check_for_non_english_ngrams import (
+        DEFAULT_FOREIGN_THRESHOLD,
+        NgramLanguageScorer,
+    )
+    import check_for_unusual_proper_nouns as proper_nouns
+
+    scorer = NgramLanguageScorer()
+    threshold = (
+        DEFAULT_FOREIGN_THRESHOLD if foreign_threshold is None else foreign_threshold
+    )
+    detectors = {
+        "numbers": contains_number_batch,
+        "non_english_enchant": contains_non_english_and_words_batch,
+        "non_english_ngram": lambda texts: scorer.contains_non_english_batch(
+            texts, threshold
+        ),
+    }
+    if proper_nouns.nlp is None:
+        print(
+            "Warning: spaCy model en_core_web_sm not available; "
+            "skipping the unusual_proper_nouns detector",
+            file=sys.stderr,
+        )
+    else:
+        detectors["unusual_proper_nouns"] = lambda texts: [
+            score is not None and score < proper_nouns.DEFAULT_GLOBAL_RARE_THRESHOLD
+            for score in proper_nouns.unusual_proper_noun_scores(texts)
+        ]
+    return detectors
+
+
+def time_detectors(texts, detectors):
+    """
+    Run each detector over the texts once.
+
+    Returns:
+        Tuple[dict, dict]: Detector name -> results, and name -> {"seconds", "per_second"}
+    """
+    outputs, timings = {}, {}
+    for name, detect in detectors.items():
+        start = time.perf_counter()
+        outputs[name] = list(detect(texts))
+        seconds = time.perf_counter() - start
+        timings[name] = {
+            "seconds": seconds,
+            "per_second": len(texts) / seconds if seconds > 0 else float("inf"),
+        }
+    return outputs, timings
+
+
+def agreement(reference, candidate):
+    """
+    Compare two lists of boolean flags.
+
+    Returns:
+        dict: Agreement rate, Cohen's kappa and disagreement counts
+    """
+    n = len(reference)
+    both = sum(1 for r, c in zip(reference, candidate) if r and c)
+    only_reference = sum(1 for r, c in zip(reference, candidate) if r and not c)
+    only_candidate = sum(1 for r, c in zip(reference, candidate) if c and not r)
+    agree = n - only_reference - only_candidate
+    observed = agree / n if n else 0.0
+    p_ref = (both + only_reference) / n if n else 0.0
+    p_cand = (both + only_candidate) / n if n else 0.0
+    expected = p_ref * p_cand + (1 - p_ref) * (1 - p_cand)
+    kappa = (observed - expected) / (1 - expected) if expected < 1 else 1.0
+    return {
+        "agreement": observed,
+        "kappa": kappa,
+        "both": both,
+        "only_reference": only_reference,
+        "only_candidate": only_candidate,
+    }
+
+
+def main():
+    """Benchmark detectors on a sample of the Jeopardy questions."""
+    parser = argparse.ArgumentParser(description="Benchmark the curation detectors")
+    parser.add_argument("--data-dir", type=str, help="Raw data dir (default: ../data)")
+    parser.add_argument(
+        "--sample-size", type=int, default=2000, help="Questions to benchmark on"
+    )
+    parser.add_argument(
+        "--foreign-threshold", type=float, help="Threshold for the n-gram engine"
+    )
+    args = parser.parse_args()
+
+    random.seed(42)
+    root = Path(__file__).parent.parent
+    data_dir = Path(args.data_dir) if args.data_dir else root / "data"
+    df = load_jeopardy_data(data_dir=str(data_dir), filename="JEOPARDY_QUESTIONS1.json")
+    questions = [str(q) for q in df["question"].dropna()]
+    texts = random.sample(questions, min(args.sample_size, len(questions)))
+
+    outputs, timings = time_detectors(texts, load_detectors(args.foreign_threshold))
+    print(f"\nThroughput on {len(texts)} questions:")
+    for name, timing in timings.items():
+        print(
+            f"  {name:<22} {timing['per_second']:>10.0f} questions/s"
+            f"  ({timing['seconds']:.2f}s)"
+        )
+
+    stats = agreement(outputs["non_english_enchant"], outputs["non_english_ngram"])
+    print("\nn-gram vs enchant non-English agreement:")
+    print(f"  agreement:         {stats['agreement']:.3f}")
+    print(f"  Cohen's kappa:     {stats['kappa']:.3f}")
+    print(f"  flagged by both:   {stats['both']}")
+    print(f"  enchant only:      {stats['only_reference']}")
+    print(f"  n-gram only:       {stats['only_candidate']}")
+
+
+if __name__ == "__main__":
+    main()
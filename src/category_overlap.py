@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Category Overlap Analytics
+
+Computes how the curation categories overlap using one bitmask per
+question: bit i is set when the question belongs to category i. A single
+bincount over the masks yields the size of every exact combination, from
+which the pairwise overlap matrix follows as a small matrix product.
+"""
+
+import numpy as np
+
+
+def category_masks(classified, n):
+    """
+    Build a per-question category bitmask.
+
+    Args:
+        classified (dict): Category -> row positions
+        n (int): Number of rows
+
+    Returns:
+        np.ndarray: uint8/uint16 mask per row (bit i = i-th category)
+    """
+    dtype = np.uint8 if len(classified) <= 8 else np.uint16
+    masks = np.zeros(n, dtype=dtype)
+    for bit, idxs in enumerate(classified.values()):
+        masks[np.asarray(idxs, dtype=np.int64)] |= dtype(1 << bit)
+    return masks
+
+
+def overlap_summary(classified, n):
+    """
+    Summarize overlaps between categories.
+
+    Args:
+        classified (dict): Category -> row positions
+        n (int): Number of rows
+
+    Returns:
+        dict: "matrix" (questions in both categories, diagonal = category
+            size), "jaccard" (intersection over union) and "combinations"
+            (questions in exactly each combination of categories, "none"
+            for questions in no category)
+    """
+    cats = list(classified)
+    combos = np.bincount(category_masks(classified, n), minlength=1 << len(cats))
+    # bits[c, i] is 1 when combination c includes category i
+    bits = (np.arange(len(combos))[:, None] >> np.arange(len(cats))) & 1
+    matrix = bits.T @ (bits * combos[:, None])
+    sizes = np.diag(matrix)
+    union = sizes[:, None] + sizes[None, :] - matrix
+
+    combinations = {}
+    for code, count in enumerate(combos):
+        name = "+".join(c for i, c in enumerate(cats) if code >> i & 1) or "none"
+        combinations[name] = int(count)
+    return {
+        "matrix": {
+            a: {b: int(matrix[i, j]) for j, b in enumerate(cats)}
+            for i, a in enumerate(cats)
+        },
+        "jaccard": {
+            a: {
+                b: float(matrix[i, j] / union[i, j]) if union[i, j] else 0.0
+                for j, b in enumerate(cats)
+            }
+            for i, a in enumerate(cats)
+        },
+        "combinations": combinations,
+    }
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Character N-gram Non-English Detection
+
+Alternative to the enchant dictionary check: scores tokens with a compact
+character trigram language model stored as NumPy arrays. Trigrams are hashed
+into a fixed-size table of log-likelihood ratios (foreign vs. English),
+trained from wordfreq word lists, so English inflections and common names
+score as English even when a spell-checker would reject them.
+
+Words of the training lists are looked up directly in a hashed lexicon, so
+a single known foreign word such as "hola" or "danke" is detected even
+though a few trigrams are not enough to tell it apart from English.
+
+All distinct tokens of a batch are scored in one vectorized pass.
+"""
+
+import os
+import re
+from typing import Iterable, List, Optional
+
+import numpy as np
+from wordfreq import get_frequency_dict, top_n_list
+
+from corpus_arena import CorpusArena
+
+REGEX_TOKEN = r"\b\w[\w'-]*\b"
+REGEX_NUMBER = r"^\d[\d,.-]*$"
+
+# Questions with a token scoring above this mean trigram log-likelihood ratio
+# (foreign vs. English) are flagged as non-English. Only tokens outside the
+# lexicon are scored by trigrams; on held-out wordfreq words this flags 67%
+# of foreign and 6% of English words.
+DEFAULT_FOREIGN_THRESHOLD = 0.5
+# Shorter Latin-script tokens carry too few trigrams to score reliably
+MIN_TOKEN_LENGTH = 3
+# Tokens are truncated to this many characters before scoring
+MAX_TOKEN_LENGTH = 30
+# Characters beyond Latin Extended-B are never English
+MAX_LATIN_CODEPOINT = 0x24F
+
+TABLE_BITS = 18
+ENGLISH_VOCAB_SIZE = 50000
+FOREIGN_VOCAB_SIZE = 20000
+# Words this frequent in English are English, whatever other languages use them
+COMMON_ENGLISH_FREQUENCY = 1e-5
+# Rarer words are foreign if this many times more frequent in a foreign language
+FOREIGN_FREQUENCY_RATIO = 10
+FOREIGN_LANGUAGES = [
+    "fr",
+    "de",
+    "es",
+    "it",
+    "pt",
+    "nl",
+    "sv",
+    "pl",
+    "tr",
+    "fi",
+    "cs",
+    "id",
+]
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "ngram_language_model.npz",
+)
+
+_HASH_MULTIPLIERS = [
+    np.uint64(0x9E3779B1),
+    np.uint64(0x85EBCA77),
+    np.uint64(0xC2B2AE3D),
+]
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def encode_tokens(tokens: List[str]) -> np.ndarray:
+    """
+    Encode tokens as a zero-padded matrix of code points with ^/$ boundaries.
+
+    Args:
+        tokens (List[str]): Tokens to encode (lowercased here)
+
+    Returns:
+        np.ndarray: uint64 array of shape (len(tokens), MAX_TOKEN_LENGTH + 2)
+    """
+    width = MAX_TOKEN_LENGTH + 2
+    if not tokens:
+        return np.zeros((0, width), dtype=np.uint64)
+    marked = [f"^{token.lower()[:MAX_TOKEN_LENGTH]}$" for token in tokens]
+    codes = np.array(marked, dtype=f"U{width}").view(np.uint32)
+    return codes.reshape(len(marked), width).astype(np.uint64)
+
+
+def trigram_hashes(codes: np.ndarray, bits: int = TABLE_BITS):
+    """
+    Hash every character trigram of encoded tokens into table slots.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Slot per trigram position and a mask of
+            positions holding a real trigram (not padding)
+    """
+    first, second, third = codes[:, :-2], codes[:, 1:-1], codes[:, 2:]
+    mixed = (
+        first * _HASH_MULTIPLIERS[0]
+        ^ second * _HASH_MULTIPLIERS[1]
+        ^ third * _HASH_MULTIPLIERS[2]
+    )
+    mixed ^= mixed >> np.uint64(17)
+    slots = (mixed & np.uint64((1 << bits) - 1)).astype(np.int64)
+    return slots, third != 0
+
+
+def word_hashes(codes: np.ndarray) -> np.ndarray:
+    """
+    Hash encoded tokens to 64-bit FNV-1a values, one per row.
+
+    Returns:
+        np.ndarray: uint64 hash per token
+    """
+    hashes = np.full(len(codes), _FNV_OFFSET, dtype=np.uint64)
+    for column in codes.T:
+        hashes = (hashes ^ column) * _FNV_PRIME
+    return hashes
+
+
+def _log_probabilities(words: List[str], bits: int) -> np.ndarray:
+    slots, valid = trigram_hashes(encode_tokens(words), bits)
+    counts = np.bincount(slots[valid], minlength=1 << bits).astype(np.float64)
+    smoothing = 0.5
+    return np.log((counts + smoothing) / (counts.sum() + smoothing * (1 << bits)))
+
+
+def train_model(
+    languages: Iterable[str] = FOREIGN_LANGUAGES, bits: int = TABLE_BITS
+) -> dict:
+    """
+    Train the trigram table and word lexicon from wordfreq word lists.
+
+    Candidate words are the most frequent English types and the most frequent
+    types of the given languages. A word is foreign if it is not common in
+    English and FOREIGN_FREQUENCY_RATIO times more frequent in one of the
+    languages, so greetings like "hola" that appear in English text still
+    count as foreign; the remaining English types are English.
+
+    Returns:
+        dict: "llr", float16 table of log P(trigram | foreign) -
+            log P(trigram | English); "words", sorted uint64 word hashes of
+            the lexicon; "foreign", bool per lexicon word
+    """
+    english_freq = get_frequency_dict("en")
+    foreign_freqs = [get_frequency_dict(lang) for lang in languages]
+    english_types = [w for w in top_n_list("en", ENGLISH_VOCAB_SIZE) if w.isalpha()]
+    candidates = set(english_types).union(
+        w
+        for lang in languages
+        for w in top_n_list(lang, FOREIGN_VOCAB_SIZE)
+        if w.isalpha()
+    )
+    foreign = set()
+    for w in candidates:
+        frequency = english_freq.get(w, 0.0)
+        if frequency < COMMON_ENGLISH_FREQUENCY and any(
+            freqs.get(w, 0.0) >= FOREIGN_FREQUENCY_RATIO * frequency
+            for freqs in foreign_freqs
+        ):
+            foreign.add(w)
+    english = [w for w in english_types if w not in foreign]
+    foreign = sorted(foreign)
+    llr = _log_probabilities(foreign, bits) - _log_probabilities(english, bits)
+
+    hashes = word_hashes(encode_tokens(english + foreign))
+    is_foreign = np.arange(len(hashes)) >= len(english)
+    words, first = np.unique(hashes, return_index=True)
+    return {"llr": llr.astype(np.float16), "words": words, "foreign": is_foreign[first]}
+
+
+def load_model(path: str = DEFAULT_MODEL_PATH) -> dict:
+    """
+    Load the model, training and saving it first if it does not exist.
+
+    Model files from before the word lexicon was added are retrained.
+
+    Args:
+        path (str): Model file (.npz)
+
+    Returns:
+        dict: Model arrays as returned by train_model(), with a float32 table
+    """
+    model = None
+    if os.path.exists(path):
+        with np.load(path) as saved:
+            if "words" in saved:
+                model = dict(saved)
+    if model is None:
+        print(f"Training n-gram language model at {path}...")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        model = train_model()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **model)
+        os.replace(tmp_path, path)
+    model["llr"] = model["llr"].astype(np.float32)
+    return model
+
+
+class NgramLanguageScorer:
+    """Scores tokens and texts for foreign-language likelihood."""
+
+    def __init__(self, model: Optional[dict] = None):
+        """
+        Args:
+            model (Optional[dict]): Model arrays as returned by train_model()
+                (default: load_model())
+        """
+        self.model = load_model() if model is None else model
+        self.llr = self.model["llr"].astype(np.float32)
+        self.words = self.model["words"]
+        self.foreign = self.model["foreign"]
+        self.bits = int(np.log2(len(self.llr)))
+
+    def score_tokens(self, tokens: List[str]) -> np.ndarray:
+        """
+        Score tokens by their mean trigram log-likelihood ratio.
+
+        Lexicon words score +inf if foreign and -inf if English, and tokens
+        with non-Latin characters score +inf.
+
+        Returns:
+            np.ndarray: float32 score per token; higher means more foreign
+        """
+        codes = encode_tokens(tokens)
+        slots, valid = trigram_hashes(codes, self.bits)
+        totals = np.where(valid, self.llr[slots], 0.0).sum(axis=1)
+        scores = (totals / np.maximum(valid.sum(axis=1), 1)).astype(np.float32)
+        if len(self.words):
+            hashes = word_hashes(codes)
+            found = np.minimum(np.searchsorted(self.words, hashes), len(self.words) - 1)
+            known = self.words[found] == hashes
+            scores[known] = np.where(self.foreign[found[known]], np.inf, -np.inf)
+        scores[(codes > MAX_LATIN_CODEPOINT).any(axis=1)] = np.inf
+        return scores
+
+    def text_scores(self, texts: List[str]) -> np.ndarray:
+        """
+        Score texts by their most foreign token, scoring each distinct token once.
+
+        Numbers and Latin-script tokens shorter than MIN_TOKEN_LENGTH are
+        ignored; texts without scoreable tokens score -inf.
+
+        Returns:
+            np.ndarray: float32 score per text
+        """
+        vocab = {}
+        token_ids = []
+        for text in texts:
+            ids = []
+            for token in re.findall(REGEX_TOKEN, text):
+                if re.fullmatch(REGEX_NUMBER, token) or (
+                    len(token) < MIN_TOKEN_LENGTH
+                    and max(map(ord, token)) <= MAX_LATIN_CODEPOINT
+                ):
+                    continue
+                ids.append(vocab.setdefault(token.lower(), len(vocab)))
+            token_ids.append(ids)
+
+        token_scores = self.score_tokens(list(vocab))
+        scores = np.full(len(texts), -np.inf, dtype=np.float32)
+        lengths = np.array([len(ids) for ids in token_ids], dtype=np.int64)
+        if lengths.sum():
+            flat = token_scores[np.concatenate([ids for ids in token_ids if ids])]
+            has_tokens = lengths > 0
+            offsets = np.concatenate([[0], np.cumsum(lengths[has_tokens])[:-1]])
+            scores[has_tokens] = np.maximum.reduceat(flat, offsets)
+        return scores
+
+    def contains_non_english_batch(
+        self, texts: List[str], threshold: float = DEFAULT_FOREIGN_THRESHOLD
+    ) -> List[bool]:
+        """
+        Flag texts whose most foreign token scores above the threshold.
+
+        Args:
+            texts (List[str]): Texts to analyze
+            threshold (float): Foreign-likelihood threshold
+
+        Returns:
+            List[bool]: True for texts judged to contain non-English words
+        """
+        return (self.text_scores(texts) > threshold).tolist()
+
+    def contains_non_english_in_range(
+        self,
+        arena: CorpusArena,
+        start: int,
+        stop: int,
+        threshold: float = DEFAULT_FOREIGN_THRESHOLD,
+    ) -> List[bool]:
+        """
+        Flag texts start..stop-1 of a shared corpus arena (see
+        contains_non_english_batch).
+
+        Args:
+            arena (CorpusArena): Shared question texts
+            start (int): First text position
+            stop (int): End position, exclusive
+            threshold (float): Foreign-likelihood threshold
+
+        Returns:
+            List[bool]: True for texts judged to contain non-English words
+        """
+        return self.contains_non_english_batch(arena.texts(start, stop), threshold)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the n-gram language model")
+    parser.add_argument(
+        "--output", type=str, default=DEFAULT_MODEL_PATH, help="Model file (.npz)"
+    )
+    args = parser.parse_args()
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    model = load_model(args.output)
+    print(
+        f"Saved {len(model['llr'])}-slot trigram table and "
+        f"{len(model['words'])}-word lexicon to {args.output}"
+    )
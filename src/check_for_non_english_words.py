@@ -3,8 +3,12 @@ Module for detecting non-English words in text using PyEnchant dictionary.
 """
 
 import re
+from typing import List
+
 import enchant
 
+from corpus_arena import CorpusArena
+
 # Initialize English dictionary
 ENGLISH_DICT = enchant.Dict("en_US")
 REGEX_NUMBER = r"^\d[\d,.-]*$"
@@ -28,3 +32,49 @@ def contains_non_english_and_words(text: str) -> bool:
         if not ENGLISH_DICT.check(token):
             return True
     return False
+
+
+def contains_non_english_and_words_batch(texts: List[str]) -> List[bool]:
+    """
+    Check a batch of texts for words not found in the English dictionary.
+
+    Each distinct token in the batch is looked up only once.
+
+    Args:
+        texts (List[str]): The texts to analyze
+
+    Returns:
+        List[bool]: contains_non_english_and_words result for each text
+    """
+    token_lists = [re.findall(r"\b\w[\w'-]*\b", text) for text in texts]
+    known = {}
+    results = []
+    for tokens in token_lists:
+        found = False
+        for token in tokens:
+            if token not in known:
+                known[token] = bool(
+                    re.fullmatch(REGEX_NUMBER, token) or ENGLISH_DICT.check(token)
+                )
+            if not known[token]:
+                found = True
+                break
+        results.append(found)
+    return results
+
+
+def contains_non_english_and_words_in_range(
+    arena: CorpusArena, start: int, stop: int
+) -> List[bool]:
+    """
+    Check texts start..stop-1 of a shared corpus arena for non-English words.
+
+    Args:
+        arena (CorpusArena): Shared question texts
+        start (int): First text position
+        stop (int): End position, exclusive
+
+    Returns:
+        List[bool]: contains_non_english_and_words result for each text in the range
+    """
+    return contains_non_english_and_words_batch(arena.texts(start, stop))
@@ -6,6 +6,9 @@ Detects numeric content in text strings for NER filtering.
 """
 
 import re
+from typing import List
+
+from corpus_arena import CorpusArena
 
 
 def contains_number(text: str) -> bool:
@@ -20,3 +23,31 @@ def contains_number(text: str) -> bool:
     """
     text = text.strip()
     return bool(re.search(r"\d", text))
+
+
+def contains_number_batch(texts: List[str]) -> List[bool]:
+    """
+    Check a batch of texts for digit characters.
+
+    Args:
+        texts (List[str]): Input texts to analyze
+
+    Returns:
+        List[bool]: contains_number result for each text
+    """
+    return [contains_number(text) for text in texts]
+
+
+def contains_number_in_range(arena: CorpusArena, start: int, stop: int) -> List[bool]:
+    """
+    Check texts start..stop-1 of a shared corpus arena for digit characters.
+
+    Args:
+        arena (CorpusArena): Shared question texts
+        start (int): First text position
+        stop (int): End position, exclusive
+
+    Returns:
+        List[bool]: contains_number result for each text in the range
+    """
+    return contains_number_batch(arena.texts(start, stop))
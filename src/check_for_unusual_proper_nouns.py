@@ -3,51 +3,224 @@
 Unusual Proper Noun Detection Module
 
 Detects rare proper nouns using spaCy POS tagging and wordfreq analysis.
+Optionally, proper nouns must also be rare within the corpus itself (see
+corpus_frequency), so names that are globally rare but common in Jeopardy
+do not count.
 """
 
+from typing import Iterable, List, Mapping, Optional
+
 import spacy
 from wordfreq import word_frequency
 
+from corpus_arena import CorpusArena
+
 # Load spaCy English model
 try:
     nlp = spacy.load("en_core_web_sm")
 except OSError:
     nlp = None
 
+# Proper nouns rarer than this (by global word frequency) count as unusual
+DEFAULT_GLOBAL_RARE_THRESHOLD = 1e-6
+# With corpus counts, proper nouns in this many questions or more are not unusual
+DEFAULT_CORPUS_RARE_THRESHOLD = 10
+
+
+def _require_model():
+    if not nlp:
+        raise ValueError(
+            "spaCy model not available. Please install with:\n"
+            "python -m spacy download en_core_web_sm"
+        )
+
 
-def has_unusual_proper_nouns(text: str, global_rare_threshold: float = 1e-6) -> bool:
+def tag_text(text: str):
     """
-    Check if text contains unusual proper nouns based on global frequency.
+    Run the spaCy pipeline over text.
+
+    Args:
+        text (str): Input text to tag
+
+    Returns:
+        spacy.tokens.Doc: POS-tagged document
+
+    Raises:
+        ValueError: If spaCy model not available
+    """
+    _require_model()
+    return nlp(text)
+
+
+def unusual_proper_noun_score(
+    text: str,
+    corpus_counts: Optional[Mapping[str, int]] = None,
+    corpus_rare_threshold: int = DEFAULT_CORPUS_RARE_THRESHOLD,
+) -> Optional[float]:
+    """
+    Score text by the global frequency of its rarest proper noun.
 
     Args:
         text (str): Input text to analyze
-        global_rare_threshold (float): Frequency threshold for unusual classification
+        corpus_counts (Optional[Mapping[str, int]]): Questions containing each
+            lowercased token (see unusual_proper_noun_score_doc)
+        corpus_rare_threshold (int): Corpus count at which a proper noun is common
 
     Returns:
-        bool: True if unusual proper nouns found, False otherwise
+        Optional[float]: Minimum word frequency among qualifying proper nouns,
+            or None if the text has no qualifying proper nouns
 
     Raises:
         ValueError: If spaCy model not available
     """
-    if not nlp:
-        raise ValueError(
-            "spaCy model not available. Please install with:\n"
-            "python -m spacy download en_core_web_sm"
-        )
+    _require_model()
 
     if not text or not text.strip():
-        return False
+        return None
+
+    return unusual_proper_noun_score_doc(
+        nlp(text),
+        corpus_counts=corpus_counts,
+        corpus_rare_threshold=corpus_rare_threshold,
+    )
 
-    doc = nlp(text)
 
+def unusual_proper_noun_score_doc(
+    doc,
+    min_length: int = 3,
+    pos_tags: Iterable[str] = ("PROPN",),
+    require_alpha: bool = True,
+    corpus_counts: Optional[Mapping[str, int]] = None,
+    corpus_rare_threshold: int = DEFAULT_CORPUS_RARE_THRESHOLD,
+) -> Optional[float]:
+    """
+    Score an already tagged spaCy Doc by the frequency of its rarest proper noun.
+
+    Args:
+        doc (spacy.tokens.Doc): POS-tagged document
+        min_length (int): Minimum token length to qualify
+        pos_tags (Iterable[str]): Coarse POS tags that qualify
+        require_alpha (bool): Only alphabetic tokens qualify
+        corpus_counts (Optional[Mapping[str, int]]): Questions containing each
+            lowercased token; when given, only tokens found in fewer than
+            corpus_rare_threshold questions qualify
+        corpus_rare_threshold (int): Corpus count at which a proper noun is common
+
+    Returns:
+        Optional[float]: Minimum word frequency among qualifying proper nouns,
+            or None if the document has no qualifying proper nouns
+    """
+    rarest = None
     for token in doc:
-        if token.pos_ == "PROPN" and len(token.text) >= 3 and token.is_alpha:
+        if (
+            token.pos_ in pos_tags
+            and len(token.text) >= min_length
+            and (token.is_alpha or not require_alpha)
+            and (
+                corpus_counts is None
+                or corpus_counts.get(token.text.lower(), 0) < corpus_rare_threshold
+            )
+        ):
 
             global_freq = word_frequency(
                 token.text.lower(), "en", wordlist="best", minimum=0.0
             )
 
-            if global_freq < global_rare_threshold:
-                return True
+            if rarest is None or global_freq < rarest:
+                rarest = global_freq
+
+    return rarest
+
 
-    return False
+def has_unusual_proper_nouns(
+    text: str,
+    global_rare_threshold: float = DEFAULT_GLOBAL_RARE_THRESHOLD,
+    corpus_counts: Optional[Mapping[str, int]] = None,
+    corpus_rare_threshold: int = DEFAULT_CORPUS_RARE_THRESHOLD,
+) -> bool:
+    """
+    Check if text contains unusual proper nouns based on global frequency.
+
+    With `corpus_counts`, a proper noun must be rare globally and in the corpus.
+
+    Args:
+        text (str): Input text to analyze
+        global_rare_threshold (float): Frequency threshold for unusual classification
+        corpus_counts (Optional[Mapping[str, int]]): Questions containing each
+            lowercased token (see corpus_frequency)
+        corpus_rare_threshold (int): Corpus count at which a proper noun is common
+
+    Returns:
+        bool: True if unusual proper nouns found, False otherwise
+
+    Raises:
+        ValueError: If spaCy model not available
+    """
+    score = unusual_proper_noun_score(text, corpus_counts, corpus_rare_threshold)
+    return score is not None and score < global_rare_threshold
+
+
+def unusual_proper_noun_scores(
+    texts: List[str],
+    batch_size: int = 256,
+    corpus_counts: Optional[Mapping[str, int]] = None,
+    corpus_rare_threshold: int = DEFAULT_CORPUS_RARE_THRESHOLD,
+) -> List[Optional[float]]:
+    """
+    Score a batch of texts, tagging them together with nlp.pipe.
+
+    Args:
+        texts (List[str]): Input texts to analyze
+        batch_size (int): spaCy pipe batch size
+        corpus_counts (Optional[Mapping[str, int]]): See unusual_proper_noun_score_doc
+        corpus_rare_threshold (int): Corpus count at which a proper noun is common
+
+    Returns:
+        List[Optional[float]]: unusual_proper_noun_score result for each text
+
+    Raises:
+        ValueError: If spaCy model not available
+    """
+    _require_model()
+
+    scores = [None] * len(texts)
+    positions = [i for i, text in enumerate(texts) if text and text.strip()]
+    docs = nlp.pipe((texts[i] for i in positions), batch_size=batch_size)
+    for i, doc in zip(positions, docs):
+        scores[i] = unusual_proper_noun_score_doc(
+            doc,
+            corpus_counts=corpus_counts,
+            corpus_rare_threshold=corpus_rare_threshold,
+        )
+    return scores
+
+
+def unusual_proper_noun_scores_in_range(
+    arena: CorpusArena,
+    start: int,
+    stop: int,
+    batch_size: int = 256,
+    corpus_counts: Optional[Mapping[str, int]] = None,
+    corpus_rare_threshold: int = DEFAULT_CORPUS_RARE_THRESHOLD,
+) -> List[Optional[float]]:
+    """
+    Score texts start..stop-1 of a shared corpus arena (see
+    unusual_proper_noun_scores).
+
+    Args:
+        arena (CorpusArena): Shared question texts
+        start (int): First text position
+        stop (int): End position, exclusive
+        batch_size (int): spaCy pipe batch size
+        corpus_counts (Optional[Mapping[str, int]]): See unusual_proper_noun_score_doc
+        corpus_rare_threshold (int): Corpus count at which a proper noun is common
+
+    Returns:
+        List[Optional[float]]: unusual_proper_noun_score result for each text in the range
+
+    Raises:
+        ValueError: If spaCy model not available
+    """
+    return unusual_proper_noun_scores(
+        arena.texts(start, stop), batch_size, corpus_counts, corpus_rare_threshold
+    )
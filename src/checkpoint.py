@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Classification Checkpointing
+
+Periodically persists classification progress (next row position, partial
+category results, the top-k rarity heap and the per-question rarity array)
+so that a long `classify` run can resume after a crash or preemption.
+Checkpoints are written atomically: a temporary file in the same directory
+is fully written and then renamed over the previous checkpoint. Every
+setting that affects classification results is stored with the progress,
+and resuming under different settings is refused.
+"""
+
+import os
+import json
+import time
+
+import numpy as np
+
+
+class ClassificationCheckpoint:
+    """Atomic, periodic checkpoint of classify() progress stored as .npz."""
+
+    def __init__(
+        self,
+        path,
+        every_rows=10000,
+        every_seconds=300.0,
+        resume=False,
+        settings=None,
+    ):
+        """
+        Args:
+            path (str): Checkpoint file path
+            every_rows (int): Save after this many newly processed rows
+            every_seconds (float): Save after this many seconds since the last save
+            resume (bool): Restore progress from an existing checkpoint on start
+            settings (dict): JSON-serializable settings that affect classification
+                results (engine, thresholds, rarity rule, exclusions, ...);
+                a checkpoint only resumes under identical settings
+        """
+        self.path = str(path)
+        self.every_rows = every_rows
+        self.every_seconds = every_seconds
+        self.resume = resume
+        self.settings = json.loads(json.dumps(settings or {}, sort_keys=True))
+        self.total = None
+        self._last_position = 0
+        self._last_time = time.monotonic()
+
+    def start(self, total, results, rarest=None, rarity=None):
+        """
+        Begin a run over `total` rows, restoring saved progress if resuming.
+
+        Restored category indices, heap entries and rarity scores are loaded
+        into the given containers in place.
+
+        Returns:
+            int: Row position to continue classification from
+
+        Raises:
+            ValueError: If the checkpoint was written for a different run setup
+        """
+        self.total = total
+        self._last_time = time.monotonic()
+        if not self.resume or not os.path.exists(self.path):
+            if self.resume:
+                print(f"No checkpoint at {self.path}. Starting from the beginning.")
+            self._last_position = 0
+            return 0
+
+        with np.load(self.path) as saved:
+            if int(saved["total"]) != total:
+                raise ValueError(
+                    f"Checkpoint {self.path} covers {int(saved['total'])} rows, "
+                    f"but the data has {total}."
+                )
+            has_rarest = "rarest_k" in saved.files
+            if has_rarest != (rarest is not None) or (
+                has_rarest and int(saved["rarest_k"]) != rarest.k
+            ):
+                raise ValueError(
+                    f"Checkpoint {self.path} was written with a different --select setup."
+                )
+            if ("rarity" in saved.files) != (rarity is not None):
+                raise ValueError(
+                    f"Checkpoint {self.path} was written with a different --rarity-file setup."
+                )
+            saved_settings = (
+                json.loads(str(saved["settings"])) if "settings" in saved.files else {}
+            )
+            changed = sorted(
+                key
+                for key in set(saved_settings) | set(self.settings)
+                if saved_settings.get(key) != self.settings.get(key)
+            )
+            if changed:
+                raise ValueError(
+                    f"Checkpoint {self.path} was written with different settings: "
+                    + ", ".join(
+                        f"{key}={saved_settings.get(key)!r} "
+                        f"(now {self.settings.get(key)!r})"
+                        for key in changed
+                    )
+                )
+
+            for cat in results:
+                results[cat] = saved[f"results_{cat}"].tolist()
+            if rarest is not None:
+                rarest.load_entries(
+                    zip(
+                        saved["rarest_neg_score"].tolist(),
+                        saved["rarest_neg_idx"].tolist(),
+                    )
+                )
+            if rarity is not None:
+                rarity[:] = saved["rarity"]
+            position = int(saved["position"])
+
+        print(f"Resuming classification from row {position} of {total}.")
+        self._last_position = position
+        return position
+
+    def tick(self, position, results, rarest=None, rarity=None):
+        """Save if enough rows or time have passed; `position` rows are done."""
+        if (
+            position - self._last_position >= self.every_rows
+            or time.monotonic() - self._last_time >= self.every_seconds
+        ):
+            self.save(position, results, rarest, rarity)
+
+    def save(self, position, results, rarest=None, rarity=None):
+        """Atomically write a checkpoint recording `position` processed rows."""
+        arrays = {
+            "position": np.int64(position),
+            "total": np.int64(self.total),
+            "settings": np.array(json.dumps(self.settings, sort_keys=True)),
+        }
+        for cat, idxs in results.items():
+            arrays[f"results_{cat}"] = np.asarray(idxs, dtype=np.int64)
+        if rarest is not None:
+            entries = rarest.entries()
+            arrays["rarest_k"] = np.int64(rarest.k)
+            arrays["rarest_neg_score"] = np.array(
+                [neg_score for neg_score, _ in entries], dtype=np.float64
+            )
+            arrays["rarest_neg_idx"] = np.array(
+                [neg_idx for _, neg_idx in entries], dtype=np.int64
+            )
+        if rarity is not None:
+            arrays["rarity"] = rarity
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_position = position
+        self._last_time = time.monotonic()
+
+    def clear(self):
+        """Remove the checkpoint once its run has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
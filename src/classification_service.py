@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Jeopardy Classification Service
+
+Local HTTP/JSON service that keeps the spaCy and enchant models loaded and
+answers "which curation buckets would this clue land in?". Concurrent
+requests are collected into micro-batches (up to --max-batch-size texts or
+--max-wait-ms after the first one arrives) and run through the batched
+detectors in a worker thread.
+
+Endpoints:
+    POST /classify  {"texts": ["...", ...]} or {"text": "..."}
+    GET  /metrics   latency and batch size statistics
+    GET  /health
+
+Usage: python classification_service.py [--host HOST] [--port PORT]
+"""
+
+import json
+import time
+import asyncio
+import argparse
+import sys
+from collections import Counter, deque
+
+MAX_BODY_BYTES = 1024 * 1024
+# How long to wait for the client to finish sending a rejected request
+LINGER_SECONDS = 1.0
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+def load_batch_classifier():
+    """
+    Import the detectors (loading spaCy and enchant) and return a batch classifier.
+
+    Returns:
+        Callable[[List[str]], List[dict]]: Maps texts to per-text category flags
+
+    Raises:
+        ValueError: If the spaCy model is not available
+    """
+    from check_for_numbers import contains_number_batch
+    from check_for_non_english_words import contains_non_english_and_words_batch
+    from check_for_unusual_proper_nouns import (
+        DEFAULT_GLOBAL_RARE_THRESHOLD,
+        _require_model,
+        unusual_proper_noun_scores,
+    )
+
+    # Fail at startup rather than on the first request
+    _require_model()
+
+    def classify_batch(texts):
+        numbers = contains_number_batch(texts)
+        non_english = contains_non_english_and_words_batch(texts)
+        scores = unusual_proper_noun_scores(texts)
+        return [
+            {
+                "numbers": n,
+                "non_english": e,
+                "unusual_proper_nouns": s is not None
+                and s < DEFAULT_GLOBAL_RARE_THRESHOLD,
+                "rarity": s,
+            }
+            for n, e, s in zip(numbers, non_english, scores)
+        ]
+
+    return classify_batch
+
+
+class ServiceMetrics:
+    """Request latency and batch size statistics over a sliding window."""
+
+    def __init__(self, window=10000):
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+        self.latencies_ms = deque(maxlen=window)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.texts += size
+        self.batch_sizes[size] += 1
+
+    def record_request(self, latency_ms):
+        self.requests += 1
+        self.latencies_ms.append(latency_ms)
+
+    def snapshot(self):
+        """Return metrics as a JSON-serializable dict."""
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+        return {
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "mean_batch_size": self.texts / self.batches if self.batches else 0,
+            "batch_size_histogram": {
+                str(size): count for size, count in sorted(self.batch_sizes.items())
+            },
+            "latency_ms": {
+                "p50": percentile(50),
+                "p90": percentile(90),
+                "p99": percentile(99),
+                "max": latencies[-1] if latencies else None,
+            },
+        }
+
+
+class MicroBatcher:
+    """Collects texts submitted concurrently and classifies them in batches."""
+
+    def __init__(self, classify_batch, metrics, max_batch_size=32, max_wait_ms=10.0):
+        self.classify_batch = classify_batch
+        self.metrics = metrics
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def classify(self, texts):
+        """Queue texts and wait for their results."""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            self.metrics.record_batch(len(batch))
+            try:
+                results = await loop.run_in_executor(None, self.classify_batch, texts)
+            except Exception:
+                # Classify text by text so that only the requests with a
+                # failing text fail
+                results = await loop.run_in_executor(None, self._classify_each, texts)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _classify_each(self, texts):
+        """Classify texts one at a time; a failing text yields its exception."""
+        results = []
+        for text in texts:
+            try:
+                results.extend(self.classify_batch([text]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+class ClassificationService:
+    """Minimal asyncio HTTP/1.1 server in front of a MicroBatcher."""
+
+    def __init__(self, classify_batch, max_batch_size=32, max_wait_ms=10.0):
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(
+            classify_batch, self.metrics, max_batch_size, max_wait_ms
+        )
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Start listening; returns the bound port (useful with port=0)."""
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            status, payload = await self._respond(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("ascii") + body
+        )
+        try:
+            await writer.drain()
+            if status == 413:
+                # The rest of the request is unread; discard it so that
+                # closing does not reset the connection under the response
+                writer.write_eof()
+                await asyncio.wait_for(self._discard(reader), LINGER_SECONDS)
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _discard(reader):
+        while await reader.read(MAX_BODY_BYTES):
+            pass
+
+    async def _respond(self, reader):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            # readline raises ValueError for lines over the stream limit
+            return 413, {"error": "Request line or header too long"}
+        if len(request_line) < 2:
+            return 400, {"error": "Malformed request line"}
+        method, path = request_line[0], request_line[1]
+
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if method != "POST" or path != "/classify":
+            return 404, {"error": f"No route for {method} {path}"}
+
+        try:
+            length = int(headers.get("content-length", 0))
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            return 400, {"error": "Invalid Content-Length header"}
+        if length > MAX_BODY_BYTES:
+            return 413, {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"}
+        try:
+            request = json.loads(await reader.readexactly(length))
+            texts = request["texts"] if "texts" in request else [request["text"]]
+            if not isinstance(texts, list) or not all(
+                isinstance(text, str) for text in texts
+            ):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": 'Expected {"texts": [str, ...]} or {"text": str}'}
+
+        start = time.perf_counter()
+        try:
+            results = await self.batcher.classify(texts)
+        except Exception as e:
+            return 500, {"error": f"Classification failed: {e}"}
+        self.metrics.record_request((time.perf_counter() - start) * 1000)
+        return 200, {"results": results}
+
+
+async def serve(classify_batch, host, port, max_batch_size, max_wait_ms):
+    """Serve a loaded batch classifier until cancelled."""
+    service = ClassificationService(classify_batch, max_batch_size, max_wait_ms)
+    port = await service.start(host, port)
+    print(f"Serving on http://{host}:{port}")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Jeopardy clue classification")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Port")
+    parser.add_argument(
+        "--max-batch-size", type=int, default=32, help="Texts per micro-batch"
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=10.0,
+        help="How long to wait for more requests before running a batch",
+    )
+    args = parser.parse_args()
+    print("Loading detectors...")
+    try:
+        classify_batch = load_batch_classifier()
+    except (ImportError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    try:
+        asyncio.run(
+            serve(
+                classify_batch,
+                args.host,
+                args.port,
+                args.max_batch_size,
+                args.max_wait_ms,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Corpus Arena
+
+Packs question texts once into a single shared memory block: an int64
+offsets array (n + 1 entries) followed by all texts as contiguous UTF-8.
+Worker processes attach to the block by name, so handing an arena to a
+process pool pickles only its name and size, never the texts. raw() gives
+zero-copy byte views, but the detectors work on str: each worker decodes
+the texts of the rows it analyzes into new str objects (texts()), so the
+saving is in pickling and transfer, not in decoding.
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional
+
+import numpy as np
+
+
+class CorpusArena:
+    """Question texts in one shared UTF-8 buffer with an offsets array."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, size: int, owner: bool):
+        self._shm = shm
+        self._size = size
+        self._owner = owner
+        self.offsets = np.ndarray((size + 1,), dtype=np.int64, buffer=shm.buf)
+        self._data = shm.buf[self.offsets.nbytes :]
+
+    @classmethod
+    def create(cls, texts: List[str], name: Optional[str] = None) -> "CorpusArena":
+        """
+        Pack texts into a new shared memory block.
+
+        Args:
+            texts (List[str]): Texts to store (None is stored as "")
+            name (Optional[str]): Shared memory name (default: generated)
+
+        Returns:
+            CorpusArena: Owning arena; call unlink() when done with it
+        """
+        encoded = [(t or "").encode("utf-8") for t in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=max(1, offsets.nbytes + int(offsets[-1]))
+        )
+        arena = cls(shm, len(encoded), owner=True)
+        arena.offsets[:] = offsets
+        arena._data[: int(offsets[-1])] = b"".join(encoded)
+        return arena
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> "CorpusArena":
+        """
+        Attach to an arena created in another process.
+
+        Args:
+            name (str): Shared memory name of the creating arena
+            size (int): Number of texts in it
+
+        Returns:
+            CorpusArena: Non-owning view of the same buffer
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Only the creator may unlink the block; stop this process's
+            # resource tracker from removing it on exit
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, size, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __reduce__(self):
+        return (CorpusArena.attach, (self.name, self._size))
+
+    def raw(self, i: int) -> memoryview:
+        """Return text i as a zero-copy view of its UTF-8 bytes."""
+        return self._data[self.offsets[i] : self.offsets[i + 1]]
+
+    def text(self, i: int) -> str:
+        """Decode text i."""
+        return str(self.raw(i), "utf-8")
+
+    def texts(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """
+        Decode texts start..stop-1 from the shared buffer into new str objects.
+
+        Args:
+            start (int): First text position
+            stop (Optional[int]): End position, exclusive (default: all)
+
+        Returns:
+            List[str]: Decoded texts
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return []
+        bounds = self.offsets[start : stop + 1].tolist()
+        data = self._data
+        return [str(data[a:b], "utf-8") for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def ranges(self, parts: int) -> List[tuple]:
+        """Split the arena into at most `parts` contiguous (start, stop) ranges."""
+        edges = np.linspace(0, self._size, max(1, parts) + 1).astype(np.int64)
+        return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+    def close(self):
+        """Release this process's mapping of the buffer."""
+        self._data.release()
+        self._data = None
+        self.offsets = None
+        self._shm.close()
+
+    def unlink(self):
+        """Close and free the shared memory block (creating arena only)."""
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
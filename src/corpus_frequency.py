@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Corpus Frequency Index
+
+Counts, for every lowercased alphabetic token, how many questions of the
+corpus contain it, so proper nouns can be judged rare relative to Jeopardy
+itself and not only by global wordfreq frequency. The index is built in one
+pass over the question column and stored compactly as .npz: the sorted
+vocabulary as one newline-joined UTF-8 blob plus a uint32 count array,
+keyed by the corpus hash so a stale index is rebuilt. Loaded indexes are
+plain dicts, giving O(1) lookups.
+
+Usage: python corpus_frequency.py [--data-dir DIR] [--top N]
+"""
+
+import os
+import re
+import argparse
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from corpus_hashing import corpus_hash
+
+INDEX_SUFFIX = ".token_counts.npz"
+# Alphabetic runs, matching the tokens spaCy marks is_alpha
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+
+def corpus_tokens(text):
+    """Return the distinct lowercased alphabetic tokens of a text."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+class CorpusFrequencyIndex:
+    """Number of questions containing each lowercased token."""
+
+    def __init__(self, counts, num_questions, texts_hash):
+        """
+        Args:
+            counts (dict): Token -> number of questions containing it
+            num_questions (int): Questions in the corpus
+            texts_hash (str): corpus_hash of the question texts
+        """
+        self.counts = counts
+        self.num_questions = num_questions
+        self.corpus_hash = texts_hash
+
+    @classmethod
+    def build(cls, texts):
+        """Count the questions containing each token, in one pass over texts."""
+        counts = Counter()
+        for text in texts:
+            counts.update(corpus_tokens(text))
+        return cls(dict(counts), len(texts), corpus_hash(texts))
+
+    def __len__(self):
+        return len(self.counts)
+
+    def count(self, token):
+        """Return how many questions contain `token` (lowercased)."""
+        return self.counts.get(token.lower(), 0)
+
+    def save(self, path):
+        """Atomically write the index as .npz."""
+        vocab = sorted(self.counts)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                vocab=np.frombuffer("\n".join(vocab).encode("utf-8"), dtype=np.uint8),
+                counts=np.array([self.counts[t] for t in vocab], dtype=np.uint32),
+                num_questions=np.int64(self.num_questions),
+                corpus_hash=np.array(self.corpus_hash),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save()."""
+        with np.load(path) as saved:
+            blob = saved["vocab"].tobytes().decode("utf-8")
+            vocab = blob.split("\n") if blob else []
+            counts = dict(zip(vocab, saved["counts"].tolist()))
+            return cls(counts, int(saved["num_questions"]), str(saved["corpus_hash"]))
+
+    @classmethod
+    def load_or_build(cls, path, texts):
+        """
+        Load the index at `path` if it was built from `texts`, else build and save it.
+
+        Args:
+            path (str): Index file (.npz)
+            texts (List[str]): Question texts
+
+        Returns:
+            CorpusFrequencyIndex: Index over texts
+        """
+        texts_hash = corpus_hash(texts)
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.corpus_hash == texts_hash:
+                return index
+            print(f"Corpus frequency index {path} is stale. Rebuilding...")
+        else:
+            print(f"Building corpus frequency index {path}...")
+        index = cls.build(texts)
+        index.save(path)
+        return index
+
+
+def index_path_for(json_path):
+    """Return where the corpus frequency index of a JSON file is stored."""
+    return f"{json_path}{INDEX_SUFFIX}"
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    from data_download_and_eda import load_jeopardy_data
+
+    parser = argparse.ArgumentParser(
+        description="Build the corpus frequency index and show the most common tokens"
+    )
+    parser.add_argument("--data-dir", type=str, help="Raw data dir (default: ../data)")
+    parser.add_argument("--top", type=int, default=20, help="Tokens to show")
+    args = parser.parse_args()
+
+    root = Path(__file__).parent.parent
+    data_dir = Path(args.data_dir) if args.data_dir else root / "data"
+    filename = "JEOPARDY_QUESTIONS1.json"
+    df = load_jeopardy_data(
+        data_dir=str(data_dir), filename=filename, columns=["question"]
+    )
+    texts = [str(q) if pd.notna(q) else "" for q in df["question"]]
+    index = CorpusFrequencyIndex.load_or_build(
+        index_path_for(str(data_dir / filename)), texts
+    )
+    print(f"{len(index)} distinct tokens in {index.num_questions} questions")
+    for token, count in Counter(index.counts).most_common(args.top):
+        print(f"  {token:<20} {count}")
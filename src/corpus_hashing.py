@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Corpus Hashing
+
+Identifies an ordered list of question texts by a single digest, so that
+derived data stored on disk (annotation stores, corpus frequency indexes)
+can tell whether it was built from the same corpus. Depends only on the
+standard library, so every store can use it without heavy imports.
+"""
+
+import hashlib
+
+
+def corpus_hash(texts):
+    """Return a SHA-256 hex digest identifying an ordered list of texts."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -7,23 +7,72 @@ Creates three subsets:
 2. Questions with non-English words
 3. Questions with unusual proper nouns
 
-Usage: python curate_jeopardy_dataset.py [--sample-size N] [--output-dir DIR]
+Usage: python curate_jeopardy_dataset.py [--sample-size N] [--output-dir DIR] [--select top-k]
 """
 
 import sys
 import json
+import heapq
+import hashlib
 import argparse
+import itertools
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
 from data_download_and_eda import load_jeopardy_data
-from check_for_numbers import contains_number
-from check_for_non_english_words import contains_non_english_and_words
-from check_for_unusual_proper_nouns import has_unusual_proper_nouns
+from category_overlap import overlap_summary
+from sampling import (
+    STRATIFY_CHOICES,
+    build_group_index,
+    drop_taken,
+    group_keys,
+    sample_indices,
+    save_index_samples,
+    save_raw_samples,
+    save_samples,
+    stratified_sample,
+)
+from record_index import load_record_index
+from pilot_estimate import estimate_run, print_estimate
+from corpus_frequency import CorpusFrequencyIndex, index_path_for
+from exclusion_filter import ExclusionFilter
+from near_duplicates import (
+    DEFAULT_DEDUPE_THRESHOLD,
+    collapse_duplicates,
+    duplicate_summary,
+    find_near_duplicates,
+)
+from checkpoint import ClassificationCheckpoint
+from corpus_arena import CorpusArena
+from check_for_numbers import (
+    contains_number,
+    contains_number_batch,
+    contains_number_in_range,
+)
+from check_for_non_english_words import (
+    contains_non_english_and_words,
+    contains_non_english_and_words_batch,
+    contains_non_english_and_words_in_range,
+)
+from check_for_non_english_ngrams import DEFAULT_FOREIGN_THRESHOLD, NgramLanguageScorer
+from check_for_unusual_proper_nouns import (
+    DEFAULT_CORPUS_RARE_THRESHOLD,
+    DEFAULT_GLOBAL_RARE_THRESHOLD,
+    nlp,
+    tag_text,
+    unusual_proper_noun_score,
+    unusual_proper_noun_score_doc,
+    unusual_proper_noun_scores,
+    unusual_proper_noun_scores_in_range,
+)
+from annotation_store import AnnotationStore, AnnotationWriter, store_dir
+from corpus_hashing import corpus_hash
 
 
 def get_question_text(row):
@@ -35,50 +84,415 @@ def get_question_text(row):
     return ""
 
 
-def classify(df):
-    """Classify questions into categories: numbers, non-English, unusual proper nouns."""
+class TopKRarest:
+    """Bounded max-heap keeping the k rarest (lowest-scoring) questions seen."""
+
+    def __init__(self, k, labels=None):
+        """
+        Args:
+            k (int): Number of questions to keep
+            labels (Optional[np.ndarray]): Near-duplicate cluster label per row
+                (see near_duplicates); when given, at most one question, the
+                rarest, is kept per cluster, so k distinct clusters are kept
+        """
+        self.k = k
+        self.labels = labels
+        # Entries are (-score, -idx) so the root is the least rare question kept;
+        # on equal scores the earlier question wins.
+        self._heap = []
+        # With labels: cluster -> its kept entry; heap entries of a cluster
+        # that are no longer kept are stale and skipped lazily
+        self._kept = {}
+
+    def __len__(self):
+        return len(self._kept) if self.labels is not None else len(self._heap)
+
+    def _is_kept(self, entry):
+        return self._kept.get(self.labels[-entry[1]]) == entry
+
+    def push(self, score, idx):
+        """Offer a question; keeps it only if it is among the k rarest so far."""
+        entry = (-score, -idx)
+        if self.labels is None:
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry > self._heap[0]:
+                heapq.heapreplace(self._heap, entry)
+            return
+
+        label = self.labels[idx]
+        current = self._kept.get(label)
+        if current is not None:
+            if entry > current:
+                self._kept[label] = entry
+                heapq.heappush(self._heap, entry)
+        elif len(self._kept) < self.k:
+            self._kept[label] = entry
+            heapq.heappush(self._heap, entry)
+        else:
+            while not self._is_kept(self._heap[0]):
+                heapq.heappop(self._heap)
+            if entry > self._heap[0]:
+                dropped = heapq.heapreplace(self._heap, entry)
+                del self._kept[self.labels[-dropped[1]]]
+                self._kept[label] = entry
+        if len(self._heap) > 2 * self.k:
+            self._heap = list(self._kept.values())
+            heapq.heapify(self._heap)
+
+    def entries(self):
+        """Return a copy of the raw heap entries (for checkpointing)."""
+        if self.labels is not None:
+            return list(self._kept.values())
+        return list(self._heap)
+
+    def load_entries(self, entries):
+        """Replace the heap with entries previously returned by entries()."""
+        self._heap = [tuple(entry) for entry in entries]
+        heapq.heapify(self._heap)
+        if self.labels is not None:
+            self._kept = {self.labels[-entry[1]]: entry for entry in self._heap}
+
+    def indices(self):
+        """Return kept indices ordered from rarest to least rare."""
+        return [-neg_idx for _, neg_idx in sorted(self.entries(), reverse=True)]
+
+
+def question_texts(df):
+    """Return the question text of every row, as get_question_text would."""
+    if "question" not in df.columns:
+        return [""] * len(df)
+    return [str(q) if pd.notna(q) else "" for q in df["question"]]
+
+
+def new_rarity_array(n):
+    """Allocate a per-question rarity array; inf marks questions without a score."""
+    return np.full(n, np.inf, dtype=np.float32)
+
+
+def _add_proper_noun_score(results, pos, idx, score, rarest, rarity, excluded):
+    """Record a question's proper noun rarity score as classify() does."""
+    if rarity is not None and score is not None:
+        rarity[pos] = score
+    if score is not None and score < DEFAULT_GLOBAL_RARE_THRESHOLD:
+        results["unusual_proper_nouns"].append(idx)
+        if rarest is not None and (excluded is None or not excluded[pos]):
+            rarest.push(score, idx)
+
+
+def classification_settings(args, excluded=None):
+    """
+    Settings of a run that affect classify() results, for checkpoint validation.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+        excluded (Optional[np.ndarray]): Boolean exclusion mask per row
+
+    Returns:
+        dict: JSON-serializable settings
+    """
+    settings = {
+        "non_english_engine": args.non_english_engine,
+        "foreign_threshold": args.foreign_threshold,
+        "rarity_rule": args.rarity_rule,
+    }
+    if args.rarity_rule == "global-and-corpus":
+        settings["corpus_rare_threshold"] = args.corpus_rare_threshold
+    if args.select == "top-k" and args.dedupe:
+        # The top-k heap keeps one question per near-duplicate cluster
+        settings["dedupe_threshold"] = args.dedupe_threshold
+    if excluded is not None:
+        settings["excluded_rows"] = hashlib.blake2b(
+            np.packbits(excluded).tobytes(), digest_size=16
+        ).hexdigest()
+    return settings
+
+
+def classify(
+    df,
+    rarest=None,
+    rarity=None,
+    checkpoint=None,
+    ngram_scorer=None,
+    foreign_threshold=DEFAULT_FOREIGN_THRESHOLD,
+    stored_docs=None,
+    annotations=None,
+    excluded=None,
+    corpus_counts=None,
+    corpus_rare_threshold=DEFAULT_CORPUS_RARE_THRESHOLD,
+):
+    """
+    Classify questions into categories: numbers, non-English, unusual proper nouns.
+
+    If `rarest` (a TopKRarest) is given, every unusual proper noun question is
+    also offered to it with its rarity score. If `rarity` (see new_rarity_array)
+    is given, each question's rarity score is stored at its row position.
+    If `checkpoint` (a ClassificationCheckpoint) is given, progress is saved
+    periodically and, when resuming, classification continues where it stopped.
+    If `ngram_scorer` (a NgramLanguageScorer) is given, non-English questions
+    are detected with it, scoring all questions up front, instead of enchant.
+    Proper nouns are scored from `stored_docs` (one Doc per row, e.g.
+    AnnotationStore.iter_docs()) when given, without tagging; otherwise
+    questions are tagged and, if `annotations` (an AnnotationWriter) is
+    given, their Docs are stored. Rows marked in `excluded` (boolean per
+    row) are classified as usual but not offered to `rarest`. With
+    `corpus_counts` (see corpus_frequency), proper nouns must also appear in
+    fewer than `corpus_rare_threshold` questions of the corpus.
+    """
+    rule = {
+        "corpus_counts": corpus_counts,
+        "corpus_rare_threshold": corpus_rare_threshold,
+    }
     results = {"numbers": [], "non_english": [], "unusual_proper_nouns": []}
-    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Classifying"):
+    non_english = None
+    if ngram_scorer is not None:
+        non_english = ngram_scorer.contains_non_english_batch(
+            question_texts(df), foreign_threshold
+        )
+    start = 0
+    if checkpoint is not None:
+        start = checkpoint.start(len(df), results, rarest, rarity)
+    if stored_docs is not None:
+        stored_docs = itertools.islice(stored_docs, start, None)
+    rows = enumerate(df.iloc[start:].iterrows(), start=start)
+    for pos, (idx, row) in tqdm(rows, total=len(df), initial=start, desc="Classifying"):
+        if checkpoint is not None:
+            checkpoint.tick(pos, results, rarest, rarity)
+        stored_doc = next(stored_docs) if stored_docs is not None else None
         text = get_question_text(row)
         if not text.strip():
             continue
         if contains_number(text):
             results["numbers"].append(idx)
-        if contains_non_english_and_words(text):
+        if (
+            non_english[pos]
+            if non_english is not None
+            else contains_non_english_and_words(text)
+        ):
             results["non_english"].append(idx)
         try:
-            if has_unusual_proper_nouns(text):
-                results["unusual_proper_nouns"].append(idx)
+            if stored_doc is not None:
+                score = unusual_proper_noun_score_doc(stored_doc, **rule)
+            elif annotations is not None:
+                doc = tag_text(text)
+                annotations.add(pos, doc)
+                score = unusual_proper_noun_score_doc(doc, **rule)
+            else:
+                score = unusual_proper_noun_score(text, **rule)
         except Exception:
-            pass
+            continue
+        _add_proper_noun_score(results, pos, idx, score, rarest, rarity, excluded)
+    if annotations is not None:
+        annotations.close()
+    if checkpoint is not None:
+        checkpoint.save(len(df), results, rarest, rarity)
     return results
 
 
-def sample_indices(indices, n):
-    """Sample n indices from the list."""
+# Per-worker state of classify_parallel, set by _init_classify_worker
+_worker_arena = None
+_worker_scorer = None
+_worker_rule = {}
+
+
+def _init_classify_worker(arena, model, rule):
+    global _worker_arena, _worker_scorer, _worker_rule
+    _worker_arena = arena
+    _worker_scorer = NgramLanguageScorer(model) if model is not None else None
+    _worker_rule = rule
+
+
+def _classify_range(start, stop, foreign_threshold):
+    """Run every detector over arena rows start..stop-1 in a worker process."""
+    numbers = contains_number_in_range(_worker_arena, start, stop)
+    if _worker_scorer is not None:
+        non_english = _worker_scorer.contains_non_english_in_range(
+            _worker_arena, start, stop, foreign_threshold
+        )
+    else:
+        non_english = contains_non_english_and_words_in_range(
+            _worker_arena, start, stop
+        )
+    try:
+        scores = unusual_proper_noun_scores_in_range(
+            _worker_arena, start, stop, **_worker_rule
+        )
+    except Exception:
+        # Score row by row so that, as in classify(), a failing row only
+        # loses its own score
+        scores = []
+        for text in _worker_arena.texts(start, stop):
+            try:
+                scores.append(unusual_proper_noun_score(text, **_worker_rule))
+            except Exception:
+                scores.append(None)
+    return numbers, non_english, scores
+
+
+def classify_parallel(
+    df,
+    workers,
+    rarest=None,
+    rarity=None,
+    ngram_scorer=None,
+    foreign_threshold=DEFAULT_FOREIGN_THRESHOLD,
+    excluded=None,
+    corpus_counts=None,
+    corpus_rare_threshold=DEFAULT_CORPUS_RARE_THRESHOLD,
+    ranges_per_worker=4,
+):
+    """
+    Classify questions like classify(), spreading the detectors over processes.
+
+    Question texts are packed once into a shared CorpusArena; each worker
+    attaches to it and runs the detectors over contiguous row ranges, so no
+    text is pickled. Results are merged in row order, giving the same output
+    as classify() with the same `rarest`, `rarity`, `ngram_scorer`,
+    `excluded` and corpus rarity arguments. Checkpoints and annotation stores
+    are not supported.
+
+    Args:
+        workers (int): Number of worker processes
+        ranges_per_worker (int): Row ranges per worker, for load balancing
+    """
+    results = {"numbers": [], "non_english": [], "unusual_proper_nouns": []}
+    texts = question_texts(df)
+    model = ngram_scorer.model if ngram_scorer is not None else None
+    rule = {
+        "corpus_counts": corpus_counts,
+        "corpus_rare_threshold": corpus_rare_threshold,
+    }
+    arena = CorpusArena.create(texts)
+    try:
+        ranges = arena.ranges(workers * ranges_per_worker)
+        with ProcessPoolExecutor(
+            workers, initializer=_init_classify_worker, initargs=(arena, model, rule)
+        ) as pool:
+            chunks = pool.map(
+                _classify_range,
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+                [foreign_threshold] * len(ranges),
+            )
+            for (start, stop), (numbers, non_english, scores) in tqdm(
+                zip(ranges, chunks), total=len(ranges), desc="Classifying"
+            ):
+                for pos in range(start, stop):
+                    if not texts[pos].strip():
+                        continue
+                    idx = df.index[pos]
+                    k = pos - start
+                    if numbers[k]:
+                        results["numbers"].append(idx)
+                    if non_english[k]:
+                        results["non_english"].append(idx)
+                    _add_proper_noun_score(
+                        results, pos, idx, scores[k], rarest, rarity, excluded
+                    )
+    finally:
+        arena.unlink()
+    return results
+
+
+def select_rarest(rarest, n, duplicate_labels=None, taken=None):
+    """
+    Select the n rarest indices kept by a TopKRarest heap.
+
+    With `duplicate_labels` (see near_duplicates), only the rarest question
+    of each near-duplicate cluster is eligible; rows marked in `taken`
+    (boolean per row) are skipped.
+    """
+    indices = rarest.indices()
+    if taken is not None:
+        indices = drop_taken(indices, taken).tolist()
+    if duplicate_labels is not None:
+        indices = collapse_duplicates(indices, duplicate_labels).tolist()
     if len(indices) < n:
         raise ValueError(
             f"Not enough indices to sample: requested {n}, but only {len(indices)} available."
         )
-    return random.sample(indices, n)
+    return indices[:n]
 
 
-def save_samples(samples, df, outdir, fmt, timestamp):
-    """Save sampled data to files."""
-    for cat, idxs in samples.items():
-        if not idxs:
-            continue
-        outpath = outdir / f"jeopardy_ner_{cat}_{timestamp}.{fmt}"
-        subset = df.iloc[idxs].reset_index(drop=True)
-        if fmt == "json":
-            subset.to_json(outpath, orient="records", indent=2)
-        else:
-            subset.to_json(outpath, orient="records", lines=True)
-        print(f"Saved {len(subset)} to {outpath}")
+def draw_samples(
+    classified,
+    n,
+    rarest=None,
+    group_index=None,
+    allocation="equal",
+    exclusive=False,
+    duplicate_labels=None,
+    excluded=None,
+):
+    """
+    Draw n indices per category.
+
+    Unusual proper nouns come from `rarest` when given (top-k selection);
+    otherwise categories are sampled uniformly, or per group from
+    `group_index` (see sampling.build_group_index) when stratifying.
+    With `exclusive`, no question is sampled into more than one category:
+    categories are filled scarcest first, each drawing only from questions
+    not already taken. `duplicate_labels` is passed on to select_rarest;
+    the other categories are expected to be collapsed beforehand.
+    Rows marked in `excluded` (boolean per row) are never sampled.
 
+    Raises:
+        ValueError: Naming the category that has too few indices
+    """
+    top_k_cat = "unusual_proper_nouns" if rarest is not None else None
+    order = list(classified)
+    taken = None
+    if excluded is not None:
+        taken = np.array(excluded, dtype=bool)
+    if exclusive:
+        order.sort(key=lambda cat: (cat != top_k_cat, len(classified[cat])))
+        if taken is None:
+            size = max((max(idxs) for idxs in classified.values() if idxs), default=-1)
+            taken = np.zeros(size + 1, dtype=bool)
 
-def save_summary(df, classified, samples, outdir, timestamp):
-    """Save curation summary statistics."""
+    samples = {}
+    for cat in order:
+        try:
+            if cat == top_k_cat:
+                samples[cat] = select_rarest(rarest, n, duplicate_labels, taken)
+            elif group_index is not None:
+                groups = group_index[cat]
+                if taken is not None:
+                    groups = {g: drop_taken(m, taken) for g, m in groups.items()}
+                    groups = {g: m for g, m in groups.items() if len(m)}
+                samples[cat] = stratified_sample(groups, n, allocation)
+            elif taken is not None:
+                samples[cat] = sample_indices(
+                    drop_taken(classified[cat], taken).tolist(), n
+                )
+            else:
+                samples[cat] = sample_indices(classified[cat], n)
+        except ValueError as e:
+            raise ValueError(f"Error for category '{cat}': {e}")
+        if exclusive:
+            taken[samples[cat]] = True
+    return {cat: samples[cat] for cat in classified}
+
+
+def save_summary(
+    df,
+    classified,
+    samples,
+    outdir,
+    timestamp,
+    groups=None,
+    duplicates=None,
+    exclusion=None,
+):
+    """
+    Save curation summary statistics.
+
+    Includes the overlap between categories (and between their samples).
+    If `groups` (group label per row) is given, each category also
+    reports how its samples are spread over the groups. `duplicates`
+    (near-duplicate statistics) and `exclusion` (exclusion filter
+    statistics) are stored as given.
+    """
     summary = {
         "timestamp": timestamp,
         "total_questions_analyzed": len(df),
@@ -92,7 +506,19 @@ def save_summary(df, classified, samples, outdir, timestamp):
             }
             for cat in classified
         },
+        "overlap": overlap_summary(classified, len(df)),
+        "sample_overlap": overlap_summary(samples, len(df))["matrix"],
     }
+    if groups is not None:
+        for cat, idxs in samples.items():
+            counts = groups.iloc[idxs].value_counts().sort_index()
+            summary["categories"][cat]["samples_by_group"] = {
+                str(g): int(c) for g, c in counts.items()
+            }
+    if duplicates is not None:
+        summary["near_duplicates"] = duplicates
+    if exclusion is not None:
+        summary["exclusion_filter"] = exclusion
     with open(outdir / f"curation_summary_{timestamp}.json", "w") as f:
         json.dump(summary, f, indent=2)
 
@@ -112,7 +538,160 @@ def main():
     parser.add_argument(
         "--format", choices=["json", "jsonl"], default="jsonl", help="Output format"
     )
+    parser.add_argument(
+        "--select",
+        choices=["random", "top-k"],
+        default="random",
+        help="Unusual proper noun selection: random draw or the K rarest questions",
+    )
+    parser.add_argument(
+        "--rarity-file",
+        type=str,
+        help="Store per-question proper noun rarity here (.npy) for sweep_rarity_threshold.py",
+    )
+    parser.add_argument(
+        "--rarity-rule",
+        choices=["global", "global-and-corpus"],
+        default="global",
+        help="Proper nouns must be rare globally, or globally and within this corpus",
+    )
+    parser.add_argument(
+        "--corpus-rare-threshold",
+        type=int,
+        default=DEFAULT_CORPUS_RARE_THRESHOLD,
+        help="With global-and-corpus, proper nouns in this many questions are common",
+    )
+    parser.add_argument(
+        "--corpus-index",
+        type=str,
+        help="Corpus frequency index (.npz), reused or built (default: next to the data)",
+    )
+    parser.add_argument(
+        "--stratify-by",
+        choices=STRATIFY_CHOICES,
+        help="Spread samples over rounds, air date decades or categories",
+    )
+    parser.add_argument(
+        "--stratify-allocation",
+        choices=["equal", "proportional"],
+        default="equal",
+        help="Samples per group: equal shares (capped) or proportional to group size",
+    )
+    parser.add_argument(
+        "--exclusive",
+        action="store_true",
+        help="Never sample the same question into more than one category",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Sample at most one question per near-duplicate cluster (MinHash LSH)",
+    )
+    parser.add_argument(
+        "--dedupe-threshold",
+        type=float,
+        default=DEFAULT_DEDUPE_THRESHOLD,
+        help="Estimated Jaccard similarity at which questions count as near-duplicates",
+    )
+    parser.add_argument(
+        "--exclusion-filter",
+        type=str,
+        help="Bloom filter (.npz) of past samples: matches are excluded, new samples added",
+    )
+    parser.add_argument(
+        "--non-english-engine",
+        choices=["enchant", "ngram"],
+        default="enchant",
+        help="Non-English detection: enchant dictionary or character n-gram model",
+    )
+    parser.add_argument(
+        "--foreign-threshold",
+        type=float,
+        default=DEFAULT_FOREIGN_THRESHOLD,
+        help="Foreign-likelihood threshold for the n-gram engine",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=["copy", "raw", "index-only"],
+        default="copy",
+        help="Write rows from the DataFrame, raw source records, or record offsets only",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Convert data to compact column dtypes after loading",
+    )
+    parser.add_argument(
+        "--arrow-strings",
+        action="store_true",
+        help="Store question/answer text as Arrow strings",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=1,
+        help="Parse the source JSON in this many processes",
+    )
+    parser.add_argument(
+        "--eda-profile",
+        type=str,
+        help="Write a JSON EDA report of the loaded data to this path",
+    )
+    parser.add_argument(
+        "--annotation-store",
+        type=str,
+        help="Root dir for stored spaCy annotations: reused if present, else written",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Classify in this many processes over a shared-memory copy of the questions",
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Classify a seeded pilot sample, project run time and category sizes, and exit",
+    )
+    parser.add_argument(
+        "--pilot-size",
+        type=int,
+        default=1000,
+        help="Questions in the --estimate pilot sample",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Periodically save classification progress to this file (.npz)",
+    )
+    parser.add_argument(
+        "--checkpoint-every-rows",
+        type=int,
+        default=10000,
+        help="Checkpoint after this many classified rows",
+    )
+    parser.add_argument(
+        "--checkpoint-every-seconds",
+        type=float,
+        default=300.0,
+        help="Checkpoint after this many seconds",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue classification from the --checkpoint file",
+    )
     args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    if args.annotation_store and nlp is None:
+        parser.error("--annotation-store requires the spaCy model en_core_web_sm")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and (args.checkpoint or args.annotation_store):
+        parser.error(
+            "--workers cannot be combined with --checkpoint or --annotation-store"
+        )
 
     random.seed(42)
     script_dir = Path(__file__).parent
@@ -122,20 +701,205 @@ def main():
     outdir.mkdir(parents=True, exist_ok=True)
 
     # Use the same filename as in data_download_and_eda.py by default
-    df = load_jeopardy_data(data_dir=str(data_dir), filename="JEOPARDY_QUESTIONS1.json")
+    filename = "JEOPARDY_QUESTIONS1.json"
+    df = load_jeopardy_data(
+        data_dir=str(data_dir),
+        filename=filename,
+        low_memory=args.low_memory,
+        arrow_strings=args.arrow_strings,
+        profile_path=args.eda_profile,
+        parse_workers=args.parse_workers,
+    )
 
-    classified = classify(df)
+    ngram_scorer = NgramLanguageScorer() if args.non_english_engine == "ngram" else None
+    texts = question_texts(df)
+    rule = {}
+    if args.rarity_rule == "global-and-corpus":
+        index_path = args.corpus_index or index_path_for(str(data_dir / filename))
+        corpus_index = CorpusFrequencyIndex.load_or_build(index_path, texts)
+        rule = {
+            "corpus_counts": corpus_index.counts,
+            "corpus_rare_threshold": args.corpus_rare_threshold,
+        }
+        print(f"Using corpus frequency index {index_path} ({len(corpus_index)} tokens)")
 
-    samples = {}
-    for cat in classified:
+    exclusion_filter, excluded = None, None
+    if args.exclusion_filter:
+        exclusion_filter = ExclusionFilter.load_or_create(args.exclusion_filter)
+        excluded = exclusion_filter.contains(texts)
+        print(f"Excluding {int(excluded.sum())} previously sampled questions")
+
+    labels = None
+    if args.dedupe:
+        labels = find_near_duplicates(texts, threshold=args.dedupe_threshold)
+
+    if args.estimate:
+        detectors = {"numbers": contains_number_batch}
+        if ngram_scorer is not None:
+            detectors["non_english"] = lambda texts: (
+                ngram_scorer.contains_non_english_batch(texts, args.foreign_threshold)
+            )
+        else:
+            detectors["non_english"] = contains_non_english_and_words_batch
+        if nlp is not None:
+            detectors["unusual_proper_nouns"] = lambda texts: (
+                unusual_proper_noun_scores(texts, **rule)
+            )
+        report = estimate_run(
+            lambda pilot: classify(
+                pilot,
+                ngram_scorer=ngram_scorer,
+                foreign_threshold=args.foreign_threshold,
+                **rule,
+            ),
+            df,
+            detectors,
+            args.pilot_size,
+            args.sample_size,
+            workers=args.workers,
+            excluded=excluded,
+            duplicate_labels=labels,
+        )
+        print_estimate(report, args.sample_size, exclusive=args.exclusive)
+        return
+
+    rarest = None
+    if args.select == "top-k":
+        # With --dedupe the heap keeps one question per near-duplicate cluster
+        rarest = TopKRarest(args.sample_size, labels=labels)
+    rarity = new_rarity_array(len(df)) if args.rarity_file else None
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = ClassificationCheckpoint(
+            args.checkpoint,
+            every_rows=args.checkpoint_every_rows,
+            every_seconds=args.checkpoint_every_seconds,
+            resume=args.resume,
+            settings=classification_settings(args, excluded),
+        )
+    stored_docs, annotations = None, None
+    if args.annotation_store:
+        texts_hash = corpus_hash(texts)
+        store_path = store_dir(args.annotation_store, texts_hash, nlp)
         try:
-            samples[cat] = sample_indices(classified[cat], args.sample_size)
-        except ValueError as e:
-            print(f"Error for category '{cat}': {e}", file=sys.stderr)
-            sys.exit(1)
+            stored_docs = AnnotationStore(store_path).iter_docs(nlp.vocab)
+            print(f"Using stored annotations from {store_path}")
+        except ValueError:
+            if args.resume:
+                parser.error("--resume cannot write a new --annotation-store")
+            annotations = AnnotationWriter(store_path, len(df), texts_hash, nlp)
+            print(f"Storing annotations in {store_path}")
+    if args.workers > 1:
+        classified = classify_parallel(
+            df,
+            args.workers,
+            rarest=rarest,
+            rarity=rarity,
+            ngram_scorer=ngram_scorer,
+            foreign_threshold=args.foreign_threshold,
+            excluded=excluded,
+            **rule,
+        )
+    else:
+        classified = classify(
+            df,
+            rarest=rarest,
+            rarity=rarity,
+            checkpoint=checkpoint,
+            ngram_scorer=ngram_scorer,
+            foreign_threshold=args.foreign_threshold,
+            stored_docs=stored_docs,
+            annotations=annotations,
+            excluded=excluded,
+            **rule,
+        )
+    if rarity is not None:
+        with open(args.rarity_file, "wb") as f:
+            np.save(f, rarity)
+        print(f"Saved question rarity to {args.rarity_file}")
+
+    candidates, duplicates = classified, None
+    if args.dedupe:
+        candidates = {
+            cat: collapse_duplicates(idxs, labels).tolist()
+            for cat, idxs in classified.items()
+        }
+        duplicates = {
+            "threshold": args.dedupe_threshold,
+            **duplicate_summary(labels),
+            "removed_by_category": {
+                cat: len(classified[cat]) - len(candidates[cat]) for cat in classified
+            },
+        }
+        print(
+            f"Collapsed {duplicates['clusters_collapsed']} near-duplicate clusters "
+            f"({duplicates['questions_collapsed']} questions)"
+        )
+
+    keys = group_keys(df, args.stratify_by) if args.stratify_by else None
+    group_index = build_group_index(keys, candidates) if keys is not None else None
+    try:
+        samples = draw_samples(
+            candidates,
+            args.sample_size,
+            rarest=rarest,
+            group_index=group_index,
+            allocation=args.stratify_allocation,
+            exclusive=args.exclusive,
+            duplicate_labels=labels,
+            excluded=excluded,
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    save_samples(samples, df, outdir, args.format, timestamp)
-    save_summary(df, classified, samples, outdir, timestamp)
+    if args.output_mode == "copy":
+        save_samples(samples, df, outdir, args.format, timestamp)
+    else:
+        source = str(data_dir / filename)
+        offsets = load_record_index(source)
+        if len(offsets[0]) != len(df):
+            print(
+                f"Error: record index of {source} has {len(offsets[0])} records "
+                f"but the data has {len(df)}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        if args.output_mode == "raw":
+            save_raw_samples(samples, source, offsets, outdir, args.format, timestamp)
+        else:
+            save_index_samples(samples, offsets, outdir, args.format, timestamp)
+    exclusion = None
+    if exclusion_filter is not None:
+        # A question sampled into several categories is recorded once
+        sampled = dict.fromkeys(idx for idxs in samples.values() for idx in idxs)
+        exclusion_filter.add([texts[idx] for idx in sampled])
+        exclusion_filter.save(args.exclusion_filter)
+        exclusion = {
+            "path": args.exclusion_filter,
+            "excluded_questions": int(excluded.sum()),
+            "questions_in_filter": exclusion_filter.count,
+            "capacity": exclusion_filter.capacity,
+        }
+        print(f"Added samples to exclusion filter {args.exclusion_filter}")
+        if exclusion_filter.count > exclusion_filter.capacity:
+            print(
+                "Warning: exclusion filter is over capacity; its false positive "
+                "rate is rising. Rebuild it with exclusion_filter.py --capacity.",
+                file=sys.stderr,
+            )
+    save_summary(
+        df,
+        classified,
+        samples,
+        outdir,
+        timestamp,
+        groups=keys,
+        duplicates=duplicates,
+        exclusion=exclusion,
+    )
+    if checkpoint is not None:
+        checkpoint.clear()
     print(f"\nCuration complete! Check {outdir} for output files.")
 
 
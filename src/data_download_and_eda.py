@@ -2,10 +2,12 @@
 """
 Jeopardy Data Download and Exploratory Data Analysis
 
-Downloads Jeopardy! data from Google Drive and performs basic EDA.
-Handles automatic downloading, data loading, and missing value analysis.
+Downloads Jeopardy! data from Google Drive and loads it as a DataFrame.
+Exploratory statistics are opt-in: pass a profile path to stream every
+record through the EDA profiler and write a JSON report.
 
-Usage: python data_download_and_eda.py [--filename FILE] [--data_dir DIR]
+Usage: python data_download_and_eda.py [--filename FILE] [--data_dir DIR] [--low_memory]
+                                       [--profile_path REPORT.json] [--parse_workers N]
 """
 
 import gdown
@@ -14,13 +16,215 @@ import os
 import json
 import argparse
 import sys
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from eda_profiler import EDAProfiler
+from record_index import load_record_index, open_source
+
+# Low-cardinality columns stored as pandas categoricals in low-memory mode
+CATEGORICAL_COLUMNS = ["round", "category", "value"]
+# Free-text columns that can be backed by Arrow strings
+TEXT_COLUMNS = ["question", "answer"]
+
+
+def _round_trips(source: pd.Series, converted: pd.Series) -> bool:
+    """
+    Check that a converted column writes back to exactly its source values.
+
+    Args:
+        source (pd.Series): Column as loaded from JSON
+        converted (pd.Series): Converted column rendered back to strings
+
+    Returns:
+        bool: True if every non-null source value is reproduced unchanged
+    """
+    present = source.notna()
+    if (converted.isna() & present).any():
+        return False
+    return bool((converted[present].astype(str) == source[present].astype(str)).all())
+
+
+def optimize_dtypes(
+    df: pd.DataFrame, arrow_strings: bool = False, compact: bool = True
+) -> pd.DataFrame:
+    """
+    Convert Jeopardy columns to compact dtypes.
+
+    With `compact`, low-cardinality columns become categoricals, `air_date`
+    is parsed to datetime64 and `show_number` to a 32-bit integer. A column
+    is only converted if every value writes back unchanged, so unparseable
+    dates or show numbers keep the source strings. Columns that are not
+    present are left alone. The conversion runs on an already parsed frame,
+    so it shrinks the frame kept afterwards, not the peak memory of parsing.
+
+    Args:
+        df (pd.DataFrame): Data as loaded from JSON (object columns)
+        arrow_strings (bool): Store free-text columns as Arrow-backed strings
+        compact (bool): Convert the non-text columns as described above
+
+    Returns:
+        pd.DataFrame: New DataFrame with optimized dtypes
+
+    Raises:
+        ValueError: If arrow_strings is requested but pyarrow is not installed
+    """
+    df = df.copy()
+    if compact:
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        if "air_date" in df.columns:
+            air_date = pd.to_datetime(df["air_date"], errors="coerce")
+            if _round_trips(df["air_date"], air_date.dt.strftime("%Y-%m-%d")):
+                df["air_date"] = air_date
+        if "show_number" in df.columns:
+            show_number = pd.to_numeric(df["show_number"], errors="coerce")
+            if _round_trips(df["show_number"], show_number.astype("Int64")):
+                df["show_number"] = show_number.astype(
+                    "Int32" if show_number.isna().any() else "int32"
+                )
+    if arrow_strings:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(
+                "pyarrow not available. Please install with:\npip install pyarrow"
+            )
+        for col in TEXT_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(pd.StringDtype("pyarrow"))
+    return df
+
+
+def profile_records(records, path: str) -> dict:
+    """
+    Stream raw JSON records through EDAProfiler and write the report.
+
+    Args:
+        records (Iterable[dict]): Records as parsed from the JSON file
+        path (str): Report output path
+
+    Returns:
+        dict: The report that was written
+    """
+    profiler = EDAProfiler()
+    for record in records:
+        profiler.update(record)
+    report = profiler.write_report(path)
+    print_profile(report, path)
+    return report
+
+
+def print_profile(report: dict, path: str):
+    """Print a short summary of an EDA report written to `path`."""
+    print(f"EDA report written to {path} ({report['records']} records)")
+    print("Percentage of missing values per column:")
+    for col, rate in report["missing_rate"].items():
+        print(f"  {col}: {rate * 100:.2f}")
+
+
+def _parse_byte_range(
+    path: str, start: int, end: int, columns=None, profile: bool = False
+) -> tuple:
+    """
+    Parse the records in bytes start..end-1 of a JSON array file.
+
+    Returns:
+        tuple: (number of records, dict of column -> list of values in key
+            order of first appearance; NaN where a record lacks the key,
+            EDAProfiler over the records or None unless `profile`)
+    """
+    with open_source(path) as buf:
+        records = json.loads(b"[" + buf[start:end] + b"]")
+    profiler = None
+    if profile:
+        profiler = EDAProfiler()
+        for record in records:
+            profiler.update(record)
+    if columns is None:
+        columns = dict.fromkeys(key for record in records for key in record)
+    return (
+        len(records),
+        {col: [record.get(col, np.nan) for record in records] for col in columns},
+        profiler,
+    )
+
+
+def parse_json_parallel(
+    path: str,
+    workers: int,
+    columns: Optional[List[str]] = None,
+    ranges_per_worker: int = 4,
+    profile_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Parse a top-level JSON array of objects into a DataFrame in parallel.
+
+    Record boundaries come from the byte-offset index (see record_index),
+    which is built on first use and cached next to the file. The records are
+    split into contiguous byte ranges, each parsed into column chunks in a
+    process pool, and the chunks are concatenated in file order. The result
+    equals pd.DataFrame(json.load(f), columns=columns).
+
+    Args:
+        path (str): JSON array file
+        workers (int): Worker processes
+        columns (Optional[List[str]]): Only keep these columns (default: all)
+        ranges_per_worker (int): Byte ranges per worker, for load balancing
+        profile_path (Optional[str]): Write an EDA report here, profiled by the
+            workers from the records they parse and merged in file order
+
+    Returns:
+        pd.DataFrame: Parsed data
+    """
+    starts, ends = load_record_index(path)
+    total = len(starts)
+    edges = np.linspace(0, total, workers * ranges_per_worker + 1).astype(np.int64)
+    ranges = [
+        (int(starts[a]), int(ends[b - 1])) for a, b in zip(edges, edges[1:]) if b > a
+    ]
+    with ProcessPoolExecutor(workers) as pool:
+        chunks = list(
+            pool.map(
+                _parse_byte_range,
+                [path] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                [columns] * len(ranges),
+                [profile_path is not None] * len(ranges),
+            )
+        )
+    if profile_path is not None:
+        profiler = EDAProfiler()
+        for _, _, chunk_profiler in chunks:
+            profiler.merge(chunk_profiler)
+        print_profile(profiler.write_report(profile_path), profile_path)
+
+    if columns is None:
+        columns = list(dict.fromkeys(col for _, chunk, _ in chunks for col in chunk))
+    if not columns:
+        return pd.DataFrame([{}] * total)
+    data = {}
+    for col in columns:
+        values = []
+        for n, chunk, _ in chunks:
+            values.extend(chunk[col] if col in chunk else [np.nan] * n)
+        data[col] = values
+    return pd.DataFrame(data, columns=columns, index=pd.RangeIndex(total))
 
 
 def load_jeopardy_data(
     url: str = "https://drive.google.com/uc?id=0BwT5wj_P7BKXb2hfM3d2RHU1ckE",
     data_dir: Optional[str] = None,
     filename: str = "jeopardy_data.json",
+    columns: Optional[List[str]] = None,
+    low_memory: bool = False,
+    arrow_strings: bool = False,
+    profile_path: Optional[str] = None,
+    parse_workers: int = 1,
 ) -> pd.DataFrame:
     """
     Download (if needed) and load the Jeopardy data as a pandas DataFrame.
@@ -29,9 +233,18 @@ def load_jeopardy_data(
         url (str): Google Drive URL to download from
         data_dir (Optional[str]): Directory to store data (default: ../data)
         filename (str): JSON filename (default: 'jeopardy_data.json')
+        columns (Optional[List[str]]): Only keep these columns (default: all)
+        low_memory (bool): Convert columns to compact dtypes after parsing
+            (see optimize_dtypes); peak memory while parsing is unchanged
+        arrow_strings (bool): Use Arrow-backed text columns, with or without
+            low_memory
+        profile_path (Optional[str]): Write an EDA report (see eda_profiler) here;
+            no statistics are computed when this is None
+        parse_workers (int): Parse the file in this many processes
+            (see parse_json_parallel)
 
     Returns:
-        pd.DataFrame: Loaded Jeopardy data with basic EDA output
+        pd.DataFrame: Loaded Jeopardy data
     """
     # Determine data directory - if not provided, use ../data relative to this file
     if data_dir is None:
@@ -56,17 +269,27 @@ def load_jeopardy_data(
     # Read the JSON file and return as DataFrame
     try:
         print("Reading JSON file...")
-        with open(output, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        df = pd.DataFrame(data)
+        if parse_workers > 1:
+            df = parse_json_parallel(
+                output, parse_workers, columns=columns, profile_path=profile_path
+            )
+        else:
+            with open(output, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if profile_path is not None:
+                profile_records(data, profile_path)
+            df = pd.DataFrame(data, columns=columns)
+            del data
         print("File read successfully as JSON.")
 
-        # Basic exploratory data analysis
-        print(f"Shape: {df.shape}")
-        print(f"Columns: {df.columns.tolist()}")
-        print("\nPercentage of missing values per column:")
-        missing_percentages = (df.isnull().mean() * 100).round(2)
-        print(missing_percentages)
+        if low_memory or arrow_strings:
+            before = df.memory_usage(deep=True).sum()
+            df = optimize_dtypes(df, arrow_strings=arrow_strings, compact=low_memory)
+            after = df.memory_usage(deep=True).sum()
+            print(
+                f"DataFrame memory usage after loading: {before / 1024**2:.1f} MB "
+                f"-> {after / 1024**2:.1f} MB"
+            )
 
         return df
     except json.JSONDecodeError as e:
@@ -92,12 +315,44 @@ if __name__ == "__main__":
     parser.add_argument(
         "--filename", type=str, default="jeopardy_data.json", help="JSON filename"
     )
+    parser.add_argument(
+        "--columns", type=str, nargs="+", default=None, help="Columns to load"
+    )
+    parser.add_argument(
+        "--low_memory",
+        action="store_true",
+        help="Convert to compact column dtypes after loading",
+    )
+    parser.add_argument(
+        "--arrow_strings",
+        action="store_true",
+        help="Store text columns as Arrow strings",
+    )
+    parser.add_argument(
+        "--profile_path",
+        type=str,
+        default=None,
+        help="Write a JSON EDA report (missing rates, lengths, distinct counts)",
+    )
+    parser.add_argument(
+        "--parse_workers",
+        type=int,
+        default=1,
+        help="Parse the JSON file in this many processes",
+    )
 
     args = parser.parse_args()
 
     try:
         df = load_jeopardy_data(
-            url=args.url, data_dir=args.data_dir, filename=args.filename
+            url=args.url,
+            data_dir=args.data_dir,
+            filename=args.filename,
+            columns=args.columns,
+            low_memory=args.low_memory,
+            arrow_strings=args.arrow_strings,
+            profile_path=args.profile_path,
+            parse_workers=args.parse_workers,
         )
 
         print("\nFirst 5 rows of the data:")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Streaming EDA Profiler
+
+Computes exploratory statistics for Jeopardy records in a single pass,
+one record at a time, and writes them to a JSON report: missing rates per
+column, question length histogram, HTML markup prevalence, approximate
+distinct counts per column (HyperLogLog, bounded memory) and the `round`
+and `value` distributions.
+"""
+
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+
+# Question length histogram bucket width (characters) and last bucket start
+LENGTH_BUCKET = 25
+LENGTH_MAX_BUCKET = 500
+HTML_TAG_RE = re.compile(r"<\s*/?\s*([a-zA-Z][a-zA-Z0-9]*)[^>]*>")
+DISTRIBUTION_COLUMNS = ["round", "value"]
+
+
+class HyperLogLog:
+    """Approximate distinct counter using 2**precision one-byte registers."""
+
+    def __init__(self, precision=14):
+        """
+        Args:
+            precision (int): log2 of the register count; the relative error
+                is about 1.04 / sqrt(2**precision) (~0.8% at 14)
+        """
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+        h = int.from_bytes(digest, "big")
+        bucket = h >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rest = h & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[bucket]:
+            self.registers[bucket] = rank
+
+    def merge(self, other):
+        """Add the values counted by another HyperLogLog of equal precision."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        """Return the estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class EDAProfiler:
+    """Accumulates EDA statistics over Jeopardy records in one pass."""
+
+    def __init__(self, hll_precision=14):
+        """
+        Args:
+            hll_precision (int): HyperLogLog precision for distinct counts
+        """
+        self.records = 0
+        self.columns = []
+        self.missing = Counter()
+        self.distinct = {}
+        self.hll_precision = hll_precision
+        self.length_histogram = Counter()
+        self.length_total = 0
+        self.length_min = None
+        self.length_max = None
+        self.html_questions = 0
+        self.html_tags = Counter()
+        self.distributions = {col: Counter() for col in DISTRIBUTION_COLUMNS}
+
+    def update(self, record):
+        """Add one record (dict of column -> value) to the statistics."""
+        self.records += 1
+        for col in record:
+            if col not in self.distinct:
+                self.columns.append(col)
+                self.distinct[col] = HyperLogLog(self.hll_precision)
+                # Earlier records did not have this column at all
+                self.missing[col] += self.records - 1
+        for col in self.columns:
+            value = record.get(col)
+            # Missing as pandas isnull() sees it; empty strings are values
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                self.missing[col] += 1
+                continue
+            self.distinct[col].add(value)
+            if col in self.distributions:
+                self.distributions[col][str(value)] += 1
+
+        question = record.get("question")
+        if isinstance(question, str):
+            length = len(question)
+            self.length_total += length
+            self.length_min = (
+                length if self.length_min is None else min(self.length_min, length)
+            )
+            self.length_max = (
+                length if self.length_max is None else max(self.length_max, length)
+            )
+            bucket = min(length // LENGTH_BUCKET * LENGTH_BUCKET, LENGTH_MAX_BUCKET)
+            self.length_histogram[bucket] += 1
+            tags = HTML_TAG_RE.findall(question)
+            if tags:
+                self.html_questions += 1
+                self.html_tags.update({tag.lower() for tag in tags})
+
+    def merge(self, other):
+        """
+        Add the statistics of a profiler that saw the records after this one's.
+
+        Profiles of consecutive chunks of a file, merged in file order, equal
+        the profile of the whole file.
+
+        Args:
+            other (EDAProfiler): Profiler with the same hll_precision
+        """
+        for col in self.columns:
+            if col not in other.distinct:
+                self.missing[col] += other.records
+        for col in other.columns:
+            if col not in self.distinct:
+                self.columns.append(col)
+                self.distinct[col] = HyperLogLog(self.hll_precision)
+                self.missing[col] += self.records
+            self.distinct[col].merge(other.distinct[col])
+        self.missing.update(other.missing)
+        self.records += other.records
+        self.length_histogram.update(other.length_histogram)
+        self.length_total += other.length_total
+        for attr, pick in [("length_min", min), ("length_max", max)]:
+            values = [
+                v for v in (getattr(self, attr), getattr(other, attr)) if v is not None
+            ]
+            setattr(self, attr, pick(values) if values else None)
+        self.html_questions += other.html_questions
+        self.html_tags.update(other.html_tags)
+        for col, counts in other.distributions.items():
+            self.distributions[col].update(counts)
+
+    def report(self):
+        """Return the statistics as a JSON-serializable dict."""
+        n = self.records
+        questions = sum(self.length_histogram.values())
+        return {
+            "records": n,
+            "columns": self.columns,
+            "missing_rate": {
+                col: self.missing[col] / n if n else 0.0 for col in self.columns
+            },
+            "approx_distinct": {
+                col: self.distinct[col].count() for col in self.columns
+            },
+            "question_length": {
+                "min": self.length_min,
+                "max": self.length_max,
+                "mean": self.length_total / questions if questions else None,
+                "bucket_width": LENGTH_BUCKET,
+                "histogram": {
+                    (
+                        f"{b}+"
+                        if b == LENGTH_MAX_BUCKET
+                        else f"{b}-{b + LENGTH_BUCKET - 1}"
+                    ): count
+                    for b, count in sorted(self.length_histogram.items())
+                },
+            },
+            "html_markup": {
+                "questions_with_html": self.html_questions,
+                "rate": self.html_questions / questions if questions else 0.0,
+                "questions_per_tag": dict(self.html_tags.most_common()),
+            },
+            "distributions": {
+                col: dict(counts.most_common())
+                for col, counts in self.distributions.items()
+            },
+        }
+
+    def write_report(self, path):
+        """
+        Write the report as JSON.
+
+        Args:
+            path (str): Output file path
+
+        Returns:
+            dict: The report that was written
+        """
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return report
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Cross-Run Exclusion Filter
+
+A persistent Bloom filter over the questions already emitted by earlier
+curation runs, so that new batches never repeat them. Each question is
+normalized (see near_duplicates.normalize_text) and hashed to 64 bits with
+BLAKE2b; the two 32-bit halves drive double hashing into a NumPy bit
+array. Membership checks take a fixed number of bit lookups per question
+and the filter size depends only on its capacity, not on how many runs
+have been added. A small fraction (the configured error rate) of
+never-emitted questions is excluded as well.
+
+Usage: python exclusion_filter.py --filter FILE.npz OUTPUT_FILE [OUTPUT_FILE ...]
+"""
+
+import os
+import json
+import math
+import argparse
+import hashlib
+
+import numpy as np
+
+from near_duplicates import normalize_text
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 0.001
+
+
+def question_keys(texts):
+    """
+    Hash question texts to 64-bit keys.
+
+    Args:
+        texts (Iterable[str]): Question texts
+
+    Returns:
+        np.ndarray: uint64 key per text
+    """
+    return np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(
+                    normalize_text(t).encode("utf-8"), digest_size=8
+                ).digest(),
+                "little",
+            )
+            for t in texts
+        ],
+        dtype=np.uint64,
+    )
+
+
+class ExclusionFilter:
+    """Bloom filter of previously emitted questions, stored as .npz."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+        """
+        Args:
+            capacity (int): Number of questions the filter is sized for
+            error_rate (float): False positive rate at full capacity
+        """
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = (num_bits + 7) // 8 * 8
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self.bits = np.zeros(self.num_bits // 8, dtype=np.uint8)
+
+    def _positions(self, texts):
+        keys = question_keys(texts)
+        h1 = keys & np.uint64(0xFFFFFFFF)
+        h2 = (keys >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, texts):
+        """Record question texts as emitted."""
+        positions = self._positions(texts).ravel()
+        np.bitwise_or.at(
+            self.bits,
+            positions >> np.uint64(3),
+            (1 << (positions & np.uint64(7))).astype(np.uint8),
+        )
+        self.count += len(texts)
+
+    def contains(self, texts):
+        """
+        Check which question texts were (probably) emitted before.
+
+        Returns:
+            np.ndarray: Boolean per text; False is always correct, True is
+                wrong with probability about error_rate
+        """
+        positions = self._positions(texts)
+        hits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7))) & 1
+        return hits.all(axis=1)
+
+    def fill_ratio(self):
+        """Fraction of bits set; the error rate grows with it."""
+        return float(np.unpackbits(self.bits).mean()) if len(self.bits) else 0.0
+
+    def save(self, path):
+        """Atomically write the filter to `path`."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                bits=self.bits,
+                num_hashes=np.int64(self.num_hashes),
+                capacity=np.int64(self.capacity),
+                count=np.int64(self.count),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a filter written by save()."""
+        with np.load(path) as saved:
+            filt = cls.__new__(cls)
+            filt.bits = saved["bits"]
+            filt.num_bits = len(filt.bits) * 8
+            filt.num_hashes = int(saved["num_hashes"])
+            filt.capacity = int(saved["capacity"])
+            filt.count = int(saved["count"])
+        return filt
+
+    @classmethod
+    def load_or_create(
+        cls, path, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE
+    ):
+        """Load the filter at `path`, or create an empty one if it does not exist."""
+        if os.path.exists(path):
+            return cls.load(path)
+        return cls(capacity, error_rate)
+
+
+def output_questions(path):
+    """
+    Read the question texts of a curation output file (.json or .jsonl).
+
+    Index-only outputs carry no question text and yield nothing.
+    """
+    with open(path, encoding="utf-8") as f:
+        if str(path).endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+    return [r["question"] or "" for r in records if "question" in r]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Add questions from curation output files to an exclusion filter"
+    )
+    parser.add_argument("files", nargs="+", help="jeopardy_ner_* output files")
+    parser.add_argument("--filter", required=True, help="Exclusion filter (.npz)")
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Questions a new filter is sized for",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=DEFAULT_ERROR_RATE,
+        help="False positive rate of a new filter at capacity",
+    )
+    args = parser.parse_args()
+
+    filt = ExclusionFilter.load_or_create(args.filter, args.capacity, args.error_rate)
+    for path in args.files:
+        questions = output_questions(path)
+        if not questions:
+            print(f"No question text in {path}; skipping")
+            continue
+        filt.add(questions)
+        print(f"Added {len(questions)} questions from {path}")
+    filt.save(args.filter)
+    print(
+        f"Saved {args.filter}: {filt.count} questions, "
+        f"{filt.fill_ratio() * 100:.1f}% of {filt.num_bits} bits set"
+    )
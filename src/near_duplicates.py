@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Question Detection
+
+Finds near-duplicate clues (re-aired questions, punctuation or casing
+variants) with MinHash signatures and LSH banding, so samplers can keep one
+question per cluster without pairwise comparison.
+
+Questions are normalized (lowercase, alphanumeric words only) and split into
+overlapping byte shingles. Each MinHash permutation is a universal hash
+(a * x + b) mod p applied to all shingles of a chunk of questions at once;
+the per-question minimum is taken with a single reduceat. Signatures are
+cut into bands and questions sharing a band bucket become candidates. A
+candidate joins a cluster if its estimated Jaccard similarity with the
+cluster's representative, its earliest row, reaches the threshold, so
+chains of similar questions do not merge. Each cluster is labelled by that
+row.
+"""
+
+import re
+import random
+
+import numpy as np
+
+DEFAULT_DEDUPE_THRESHOLD = 0.8
+# Mersenne prime 2**31 - 1: keeps a * x + b below 2**63 for 31-bit inputs
+_PRIME = np.uint64((1 << 31) - 1)
+_EMPTY = np.uint32(0xFFFFFFFF)
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize_text(text):
+    """Lowercase and reduce text to alphanumeric words separated by spaces."""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def _shingle_values(texts, shingle_size):
+    """
+    Pack every byte shingle of the normalized texts into an integer.
+
+    Texts shorter than `shingle_size` bytes are padded so that every
+    non-empty text has at least one shingle.
+
+    Returns:
+        tuple: (shingle values as uint64, start of each text's shingles,
+            number of shingles per text; 0 for empty texts)
+    """
+    encoded = [normalize_text(t).encode("utf-8") for t in texts]
+    encoded = [e.ljust(shingle_size) if e else e for e in encoded]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(texts))
+    counts = np.maximum(lengths - shingle_size + 1, 0)
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    text_starts = np.cumsum(lengths) - lengths
+    seg_starts = np.cumsum(counts) - counts
+    total = int(counts.sum())
+    positions = np.repeat(text_starts, counts) + (
+        np.arange(total, dtype=np.int64) - np.repeat(seg_starts, counts)
+    )
+    values = np.zeros(total, dtype=np.uint64)
+    for j in range(shingle_size):
+        values |= buf[positions + j].astype(np.uint64) << np.uint64(8 * j)
+    return values, seg_starts, counts
+
+
+def minhash_signatures(texts, num_perm=64, shingle_size=5, seed=1, chunk_size=10000):
+    """
+    Compute MinHash signatures of question texts.
+
+    Args:
+        texts (Sequence[str]): Question texts
+        num_perm (int): Number of hash permutations (signature length)
+        shingle_size (int): Shingle length in bytes of normalized text (<= 8)
+        seed (int): Seed for the permutation coefficients
+        chunk_size (int): Texts hashed together, bounding temporary memory
+
+    Returns:
+        np.ndarray: uint32 array of shape (len(texts), num_perm); rows of
+            texts without any words are all 0xFFFFFFFF
+    """
+    if not 1 <= shingle_size <= 8:
+        raise ValueError("shingle_size must be between 1 and 8")
+    rng = random.Random(seed)
+    a = np.array([rng.randrange(1, int(_PRIME)) for _ in range(num_perm)], np.uint64)
+    b = np.array([rng.randrange(0, int(_PRIME)) for _ in range(num_perm)], np.uint64)
+
+    signatures = np.full((len(texts), num_perm), _EMPTY, dtype=np.uint32)
+    for start in range(0, len(texts), chunk_size):
+        values, seg_starts, counts = _shingle_values(
+            texts[start : start + chunk_size], shingle_size
+        )
+        if not len(values):
+            continue
+        values %= _PRIME
+        rows = np.flatnonzero(counts) + start
+        seg_starts = seg_starts[counts > 0]
+        for i in range(num_perm):
+            hashed = (a[i] * values + b[i]) % _PRIME
+            signatures[rows, i] = np.minimum.reduceat(hashed, seg_starts)
+    return signatures
+
+
+def near_duplicate_labels(
+    signatures, bands=16, threshold=DEFAULT_DEDUPE_THRESHOLD, seed=1
+):
+    """
+    Cluster questions whose MinHash signatures are similar.
+
+    Each cluster is a star around its representative, its earliest row: a
+    question joins a cluster only if it is similar to the representative
+    itself, so chains of similar questions (templated clues) do not merge.
+    This is leader clustering in row order: in each band a question is
+    compared only with the earliest representative of its bucket, joins the
+    first one it is similar to, and otherwise becomes a representative. The
+    passes over the bands repeat until the representatives stop changing;
+    each pass is linear in the rows.
+
+    Args:
+        signatures (np.ndarray): Output of minhash_signatures
+        bands (int): LSH bands; must divide the signature length
+        threshold (float): Minimum estimated Jaccard similarity of a question
+            to its cluster representative
+        seed (int): Seed for combining a band's rows into one bucket key
+
+    Returns:
+        np.ndarray: Cluster label per row (the earliest row of its cluster);
+            rows without near-duplicates are labelled with themselves
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+    rows = num_perm // bands
+    rng = np.random.default_rng(seed)
+    mix = rng.integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+    labels = np.arange(n, dtype=np.int64)
+    candidates = np.flatnonzero((signatures != _EMPTY).any(axis=1))
+    if not len(candidates):
+        return labels
+    # Identical signatures join their first row directly; only distinct ones
+    # are banded, in row order, so repeated clues do not inflate the buckets
+    sig, first, inverse = np.unique(
+        signatures[candidates], axis=0, return_index=True, return_inverse=True
+    )
+    by_row = np.argsort(first)
+    sig, first = sig[by_row], first[by_row]
+    rank = np.empty_like(by_row)
+    rank[by_row] = np.arange(len(by_row))
+    inverse = rank[inverse.ravel()]
+
+    m = len(sig)
+    buckets = []
+    for band in range(bands):
+        block = sig[:, band * rows : (band + 1) * rows].astype(np.uint64)
+        keys = (block * mix).sum(axis=1)  # wraps modulo 2**64
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        buckets.append((order, starts, np.diff(np.r_[starts, m])))
+
+    # A question's status only depends on earlier ones, so each pass fixes
+    # at least the next undecided question and the passes converge
+    leader = np.ones(m, dtype=bool)
+    while True:
+        joined = np.full(m, -1, dtype=np.int64)
+        for order, starts, sizes in buckets:
+            earliest = np.where(leader[order], order, m)
+            anchor = np.repeat(np.minimum.reduceat(earliest, starts), sizes)
+            pending = (anchor < order) & (joined[order] < 0)
+            members, anchor = order[pending], anchor[pending]
+            similar = (sig[members] == sig[anchor]).mean(axis=1) >= threshold
+            joined[members[similar]] = anchor[similar]
+        if np.array_equal(joined < 0, leader):
+            break
+        leader = joined < 0
+
+    rep = np.where(leader, np.arange(m), joined)
+    labels[candidates] = candidates[first[rep[inverse]]]
+    return labels
+
+
+def find_near_duplicates(
+    texts, threshold=DEFAULT_DEDUPE_THRESHOLD, num_perm=64, bands=16, shingle_size=5
+):
+    """
+    Label near-duplicate question texts (see near_duplicate_labels).
+
+    Args:
+        texts (Sequence[str]): Question texts
+        threshold (float): Minimum estimated Jaccard similarity of shingles
+        num_perm (int): MinHash signature length
+        bands (int): LSH bands
+        shingle_size (int): Shingle length in bytes
+
+    Returns:
+        np.ndarray: Cluster label per text
+    """
+    signatures = minhash_signatures(texts, num_perm=num_perm, shingle_size=shingle_size)
+    return near_duplicate_labels(signatures, bands=bands, threshold=threshold)
+
+
+def collapse_duplicates(positions, labels):
+    """
+    Keep the first position of each near-duplicate cluster.
+
+    Args:
+        positions (array-like): Row positions
+        labels (np.ndarray): Cluster label per row
+
+    Returns:
+        np.ndarray: Positions with one entry per cluster, in original order
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    _, first = np.unique(labels[positions], return_index=True)
+    return positions[np.sort(first)]
+
+
+def duplicate_summary(labels):
+    """
+    Summarize near-duplicate clusters.
+
+    Returns:
+        dict: "clusters_collapsed" (clusters with more than one question)
+            and "questions_collapsed" (questions beyond the first of each)
+    """
+    sizes = np.bincount(labels, minlength=len(labels))
+    return {
+        "clusters_collapsed": int((sizes > 1).sum()),
+        "questions_collapsed": int((sizes[sizes > 1] - 1).sum()),
+    }
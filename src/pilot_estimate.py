@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Pilot Run Estimates
+
+Classifies a small seeded sample of questions to predict what a full
+curation run will cost and yield before starting it: per-detector
+throughput, projected wall time for the chosen worker count, and the
+projected size of each category with Wilson score confidence intervals,
+including whether every category can reach the requested sample size.
+Categories are sized by the pool samples are drawn from: excluded rows are
+left out and near-duplicate clusters count once.
+"""
+
+import math
+import time
+import random
+
+import numpy as np
+import pandas as pd
+
+from benchmark_detectors import time_detectors
+
+# z for two-sided 95% confidence intervals
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes, n, z=Z_95):
+    """
+    Wilson score confidence interval for a binomial proportion.
+
+    Args:
+        successes (int): Positive outcomes
+        n (int): Trials
+        z (float): Standard normal quantile (default: 95% interval)
+
+    Returns:
+        Tuple[float, float]: Lower and upper bound of the proportion
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def pilot_positions(total, pilot_size, seed=42):
+    """Seeded sample of row positions for the pilot, in row order."""
+    return sorted(random.Random(seed).sample(range(total), min(pilot_size, total)))
+
+
+def estimate_run(
+    classify_fn,
+    df,
+    detectors,
+    pilot_size,
+    sample_size,
+    workers=1,
+    seed=42,
+    excluded=None,
+    duplicate_labels=None,
+):
+    """
+    Classify a pilot sample and project the full run.
+
+    Args:
+        classify_fn (callable): Classifies a DataFrame like classify(), with the
+            run's settings already applied
+        df (pd.DataFrame): Full data
+        detectors (dict): Detector name -> batch function over texts, timed
+            individually (see benchmark_detectors.time_detectors)
+        pilot_size (int): Questions in the pilot sample
+        sample_size (int): Requested samples per category
+        workers (int): Worker processes of the full run
+        seed (int): Pilot sampling seed
+        excluded (Optional[np.ndarray]): Rows that are never sampled (boolean
+            per row, see exclusion_filter); they do not count
+        duplicate_labels (Optional[np.ndarray]): Near-duplicate cluster label
+            per row (see near_duplicates); each pilot question counts
+            1 / (size of its cluster), so that a cluster counts once in
+            expectation
+
+    Returns:
+        dict: "pilot_size", "total_questions", "detectors" (per-detector
+            questions/s), "seconds_per_question", "projected_seconds" and
+            per-category "categories" with pilot count, the count eligible
+            for sampling, its prevalence, 95% interval, projected count
+            range and "reachable" (True, False or "uncertain" for
+            --sample-size)
+    """
+    total = len(df)
+    positions = pilot_positions(total, pilot_size, seed)
+    pilot = df.iloc[positions]
+    texts = [str(q) if pd.notna(q) else "" for q in pilot["question"]]
+
+    _, timings = time_detectors(texts, detectors)
+    start = time.perf_counter()
+    classified = classify_fn(pilot)
+    seconds = time.perf_counter() - start
+    n = len(positions)
+    per_question = seconds / n if n else 0.0
+
+    cluster_sizes = None
+    if duplicate_labels is not None:
+        cluster_sizes = np.bincount(duplicate_labels, minlength=len(duplicate_labels))
+    categories = {}
+    for cat, idxs in classified.items():
+        eligible = np.asarray(idxs, dtype=np.int64)
+        if excluded is not None:
+            eligible = eligible[~excluded[eligible]]
+        if cluster_sizes is not None:
+            count = float((1.0 / cluster_sizes[duplicate_labels[eligible]]).sum())
+        else:
+            count = len(eligible)
+        low, high = wilson_interval(count, n)
+        projected_low, projected_high = math.floor(low * total), math.ceil(high * total)
+        if projected_low >= sample_size:
+            reachable = True
+        elif projected_high < sample_size:
+            reachable = False
+        else:
+            reachable = "uncertain"
+        categories[cat] = {
+            "pilot_count": len(idxs),
+            "pilot_eligible": count,
+            "prevalence": count / n if n else 0.0,
+            "prevalence_95ci": [low, high],
+            "projected_count": round(count / n * total) if n else 0,
+            "projected_count_95ci": [projected_low, projected_high],
+            "reachable": reachable,
+        }
+    return {
+        "pilot_size": n,
+        "total_questions": total,
+        "workers": workers,
+        "detectors": {name: t["per_second"] for name, t in timings.items()},
+        "seconds_per_question": per_question,
+        "projected_seconds": per_question * total / workers,
+        "categories": categories,
+    }
+
+
+def print_estimate(report, sample_size, exclusive=False):
+    """
+    Print an estimate_run report and warn about unreachable sample sizes.
+
+    With `exclusive`, the warnings note that disjoint sampling is not
+    accounted for in the projected sizes.
+    """
+    print(f"\nPilot: {report['pilot_size']} of {report['total_questions']} questions")
+    print("Detector throughput:")
+    for name, per_second in report["detectors"].items():
+        print(f"  {name:<22} {per_second:>10.0f} questions/s")
+    seconds = report["projected_seconds"]
+    print(
+        f"Projected classification time with {report['workers']} worker(s): "
+        f"{seconds:.0f}s ({seconds / 3600:.2f}h, assuming linear scaling)"
+    )
+    print("Projected category sizes (95% CI):")
+    for cat, stats in report["categories"].items():
+        low, high = stats["prevalence_95ci"]
+        count_low, count_high = stats["projected_count_95ci"]
+        print(
+            f"  {cat:<22} {stats['prevalence'] * 100:5.1f}% "
+            f"[{low * 100:.1f}-{high * 100:.1f}%]  "
+            f"~{stats['projected_count']} [{count_low}-{count_high}]"
+        )
+        if stats["reachable"] is False:
+            print(
+                f"  Warning: '{cat}' is unlikely to reach --sample-size {sample_size}"
+            )
+        elif stats["reachable"] == "uncertain":
+            print(f"  Warning: '{cat}' may not reach --sample-size {sample_size}")
+    if exclusive:
+        print(
+            "  Warning: --exclusive is not accounted for; questions in several "
+            "categories are only sampled once, so fewer may be available"
+        )
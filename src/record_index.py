@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Byte-Offset Record Index
+
+Indexes the records of a top-level JSON array file (such as
+JEOPARDY_QUESTIONS1.json) by their start/end byte offsets. The index is
+built once, stored next to the source file and rebuilt automatically when
+the source changes. Records can then be sliced straight out of a
+memory-mapped source without parsing it.
+"""
+
+import os
+import mmap
+from contextlib import contextmanager
+
+import numpy as np
+
+INDEX_SUFFIX = ".offsets.npz"
+
+_QUOTE, _BACKSLASH = ord('"'), ord("\\")
+_OPEN_OBJECT, _OPEN_ARRAY = ord("{"), ord("[")
+_CLOSE_OBJECT, _CLOSE_ARRAY = ord("}"), ord("]")
+
+
+def _string_quotes(data):
+    """Positions of the quotes that open or close JSON strings (not escaped)."""
+    quotes = np.flatnonzero(data == _QUOTE)
+    after_backslash = quotes[(quotes > 0) & (data[quotes - 1] == _BACKSLASH)]
+    if not len(after_backslash):
+        return quotes
+    # A quote is escaped when the backslash run right before it has odd length
+    backslashes = np.flatnonzero(data == _BACKSLASH)
+    run_starts = backslashes[np.r_[True, np.diff(backslashes) != 1]]
+    run_start = run_starts[np.searchsorted(run_starts, after_backslash, "right") - 1]
+    escaped = after_backslash[(after_backslash - run_start) % 2 == 1]
+    keep = np.ones(len(quotes), dtype=bool)
+    keep[np.searchsorted(quotes, escaped)] = False
+    return quotes[keep]
+
+
+def scan_record_offsets(buf, start=0, end=None):
+    """
+    Find the byte ranges of the elements of a top-level JSON array of objects.
+
+    The scan is vectorized with numpy: unescaped quotes delimit strings,
+    brackets outside strings are structural, and a cumulative sum over them
+    gives the nesting depth at every bracket.
+
+    Args:
+        buf (bytes-like): JSON document (bytes or mmap)
+        start (int): Offset to start scanning at (must be outside any record)
+        end (Optional[int]): Offset to stop scanning at (default: end of buf)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: int64 start offsets and exclusive end offsets
+
+    Raises:
+        ValueError: If the document is not a well-formed array of objects
+    """
+    end = len(buf) if end is None else end
+    data = np.frombuffer(buf, dtype=np.uint8)[start:end]
+    quotes = _string_quotes(data)
+    if len(quotes) % 2:
+        raise ValueError("Unterminated JSON string")
+    opening = (data == _OPEN_OBJECT) | (data == _OPEN_ARRAY)
+    brackets = np.flatnonzero(
+        opening | (data == _CLOSE_OBJECT) | (data == _CLOSE_ARRAY)
+    )
+    # Brackets after an odd number of string quotes are inside a string
+    brackets = brackets[np.searchsorted(quotes, brackets) % 2 == 0]
+    opens = opening[brackets]
+    depth = np.cumsum(np.where(opens, 1, -1))
+    if len(depth) and depth.min() < 0:
+        raise ValueError(
+            f"Unbalanced bracket at byte {start + brackets[np.argmax(depth < 0)]}"
+        )
+    if len(depth) and depth[-1] != 0:
+        raise ValueError("Unterminated JSON array")
+    record_opens = opens & (depth == 2)
+    not_objects = record_opens & (data[brackets] != _OPEN_OBJECT)
+    if not_objects.any():
+        raise ValueError(
+            f"Expected an object at byte {start + brackets[np.argmax(not_objects)]}"
+        )
+    starts = brackets[record_opens] + start
+    ends = brackets[~opens & (depth == 1)] + start + 1
+    return starts.astype(np.int64), ends.astype(np.int64)
+
+
+def index_path_for(json_path):
+    """Return where the offset index of a JSON file is stored."""
+    return f"{json_path}{INDEX_SUFFIX}"
+
+
+def build_record_index(json_path):
+    """
+    Scan a JSON array file and store its record offsets next to it.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Record start and end offsets
+    """
+    stat = os.stat(json_path)
+    with open_source(json_path) as buf:
+        starts, ends = scan_record_offsets(buf)
+    tmp_path = f"{index_path_for(json_path)}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            starts=starts,
+            ends=ends,
+            source_size=np.int64(stat.st_size),
+            source_mtime_ns=np.int64(stat.st_mtime_ns),
+        )
+    os.replace(tmp_path, index_path_for(json_path))
+    return starts, ends
+
+
+def load_record_index(json_path):
+    """
+    Load the record offsets of a JSON file, (re)building the index if needed.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Record start and end offsets
+    """
+    path = index_path_for(json_path)
+    if os.path.exists(path):
+        stat = os.stat(json_path)
+        with np.load(path) as saved:
+            if (
+                int(saved["source_size"]) == stat.st_size
+                and int(saved["source_mtime_ns"]) == stat.st_mtime_ns
+            ):
+                return saved["starts"], saved["ends"]
+        print(f"Record index {path} is stale. Rebuilding...")
+    else:
+        print(f"Building record index {path}...")
+    return build_record_index(json_path)
+
+
+@contextmanager
+def open_source(json_path):
+    """Memory-map a JSON file read-only."""
+    with open(json_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
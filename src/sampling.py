@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Sampling and Export Utilities
+
+Draws fixed-size samples from classified question indices and writes them
+out as JSON/JSONL files, either from the DataFrame, as raw record bytes
+sliced from the memory-mapped source file, or as record offsets only.
+Stratified sampling draws from a precomputed group index so that no single
+round, era or category dominates a sample.
+"""
+
+import json
+import random
+
+import numpy as np
+import pandas as pd
+
+from record_index import open_source
+
+STRATIFY_CHOICES = ["round", "decade", "category"]
+
+
+def sample_indices(indices, n):
+    """Sample n indices from the list."""
+    if len(indices) < n:
+        raise ValueError(
+            f"Not enough indices to sample: requested {n}, but only {len(indices)} available."
+        )
+    return random.sample(indices, n)
+
+
+def group_keys(df, by):
+    """
+    Compute the stratification group of every row in one vectorized pass.
+
+    Args:
+        df (pd.DataFrame): Jeopardy data
+        by (str): "round", "category" or "decade" (of air_date, e.g. "1990s")
+
+    Returns:
+        pd.Series: Group label per row; missing values become "unknown"
+    """
+    if by == "decade":
+        years = pd.to_datetime(df["air_date"], errors="coerce").dt.year
+        decades = (years // 10 * 10).astype("Int64").astype(str) + "s"
+        return decades.where(years.notna(), "unknown")
+    if by in ("round", "category"):
+        return df[by].astype(object).where(df[by].notna(), "unknown").astype(str)
+    raise ValueError(f"Cannot stratify by '{by}'. Choose from {STRATIFY_CHOICES}.")
+
+
+def build_group_index(keys, classified):
+    """
+    Map each category's member positions to their groups.
+
+    Groups are factorized once; each category is then split with a single
+    stable argsort, so every group's positions keep their original order.
+
+    Args:
+        keys (pd.Series): Group label per row (see group_keys)
+        classified (dict): Category -> row positions
+
+    Returns:
+        dict: Category -> {group label: np.ndarray of row positions}
+    """
+    codes, labels = pd.factorize(keys, sort=True)
+    index = {}
+    for cat, idxs in classified.items():
+        positions = np.asarray(idxs, dtype=np.int64)
+        member_codes = codes[positions]
+        order = np.argsort(member_codes, kind="stable")
+        counts = np.bincount(member_codes, minlength=len(labels))
+        groups = np.split(positions[order], np.cumsum(counts)[:-1])
+        index[cat] = {
+            labels[g]: members for g, members in enumerate(groups) if len(members)
+        }
+    return index
+
+
+def allocate(group_sizes, n, allocation="equal"):
+    """
+    Decide how many samples to draw from each group.
+
+    "equal" gives every group the same share, capped at its size, with the
+    leftover spread over groups that still have members (water-filling).
+    "proportional" follows group sizes using largest remainders. Leftover
+    samples go to randomly chosen groups (via `random`), never by label order.
+
+    Args:
+        group_sizes (dict): Group label -> number of members
+        n (int): Total samples to allocate (at most the sum of sizes)
+        allocation (str): "equal" or "proportional"
+
+    Returns:
+        dict: Group label -> samples to draw
+    """
+    labels = sorted(group_sizes)
+    sizes = np.array([group_sizes[g] for g in labels], dtype=np.int64)
+    total = int(sizes.sum())
+    if n > total:
+        raise ValueError(
+            f"Not enough indices to sample: requested {n}, but only {total} available."
+        )
+    if allocation == "proportional":
+        quotas = sizes * n / total if total else sizes * 0.0
+        counts = np.floor(quotas).astype(np.int64)
+        remainder = n - int(counts.sum())
+        # Largest remainders first; ties are broken in random order
+        shuffled = np.array(random.sample(range(len(labels)), len(labels)), np.int64)
+        fractions = (quotas - counts)[shuffled]
+        counts[shuffled[np.argsort(-fractions, kind="stable")[:remainder]]] += 1
+    elif allocation == "equal":
+        # Largest level such that sum(min(size, level)) <= n
+        ordered = np.sort(sizes)
+        filled = np.concatenate([[0], np.cumsum(ordered)])
+        level = 0
+        for i, size in enumerate(ordered):
+            groups_left = len(ordered) - i
+            if filled[i] + size * groups_left >= n:
+                level = (n - filled[i]) // groups_left
+                break
+        else:
+            level = int(ordered[-1]) if len(ordered) else 0
+        counts = np.minimum(sizes, level)
+        remainder = n - int(counts.sum())
+        spare = random.sample(np.flatnonzero(counts < sizes).tolist(), remainder)
+        counts[spare] += 1
+    else:
+        raise ValueError(f"Unknown allocation '{allocation}'")
+    return {g: int(c) for g, c in zip(labels, counts) if c}
+
+
+def drop_taken(positions, taken):
+    """
+    Remove already-sampled positions in one vectorized mask lookup.
+
+    Args:
+        positions (array-like): Row positions
+        taken (np.ndarray): Boolean per row, True once a row has been sampled
+
+    Returns:
+        np.ndarray: Positions not yet taken, in their original order
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    return positions[~taken[positions]]
+
+
+def stratified_sample(groups, n, allocation="equal"):
+    """
+    Sample n row positions across groups, O(groups + n).
+
+    Args:
+        groups (dict): Group label -> np.ndarray of row positions
+            (one category of build_group_index)
+        n (int): Number of positions to sample
+        allocation (str): "equal" or "proportional" (see allocate)
+
+    Returns:
+        list: Sampled row positions
+    """
+    counts = allocate({g: len(m) for g, m in groups.items()}, n, allocation)
+    sampled = []
+    for group, k in counts.items():
+        members = groups[group]
+        sampled.extend(int(members[i]) for i in random.sample(range(len(members)), k))
+    return sampled
+
+
+def save_samples(samples, df, outdir, fmt, timestamp):
+    """Save sampled data to files."""
+    for cat, idxs in samples.items():
+        if not idxs:
+            continue
+        outpath = outdir / f"jeopardy_ner_{cat}_{timestamp}.{fmt}"
+        subset = df.iloc[idxs].reset_index(drop=True)
+        # Keep dates and show numbers as in the source file when loaded in
+        # low-memory mode
+        for col in subset.select_dtypes("datetime").columns:
+            subset[col] = subset[col].dt.strftime("%Y-%m-%d")
+        if "show_number" in subset and pd.api.types.is_integer_dtype(
+            subset["show_number"]
+        ):
+            subset["show_number"] = subset["show_number"].astype("string")
+        if fmt == "json":
+            subset.to_json(outpath, orient="records", indent=2)
+        else:
+            subset.to_json(outpath, orient="records", lines=True)
+        print(f"Saved {len(subset)} to {outpath}")
+
+
+def save_raw_samples(samples, source_path, offsets, outdir, fmt, timestamp):
+    """
+    Save sampled records by copying their bytes from the source JSON file.
+
+    Records are written exactly as they appear in the source; for JSONL,
+    records that span several lines are re-serialized onto one line.
+
+    Args:
+        samples (dict): Category -> sampled row positions
+        source_path (str): JSON array file the data was loaded from
+        offsets (Tuple[np.ndarray, np.ndarray]): Record start/end offsets
+            (see record_index.load_record_index)
+        outdir (Path): Output directory
+        fmt (str): "json" or "jsonl"
+        timestamp (str): Timestamp used in output filenames
+    """
+    starts, ends = offsets
+    with open_source(source_path) as buf:
+        for cat, idxs in samples.items():
+            if not idxs:
+                continue
+            outpath = outdir / f"jeopardy_ner_{cat}_{timestamp}.{fmt}"
+            with open(outpath, "wb") as f:
+                if fmt == "json":
+                    f.write(b"[\n")
+                for n, idx in enumerate(idxs):
+                    record = buf[starts[idx] : ends[idx]]
+                    if fmt == "json":
+                        f.write(record if n == 0 else b",\n" + record)
+                    else:
+                        if b"\n" in record:
+                            record = json.dumps(json.loads(record)).encode("utf-8")
+                        f.write(record + b"\n")
+                if fmt == "json":
+                    f.write(b"\n]\n")
+            print(f"Saved {len(idxs)} to {outpath}")
+
+
+def save_index_samples(samples, offsets, outdir, fmt, timestamp):
+    """
+    Save only the record IDs and byte ranges of sampled records.
+
+    Each entry is {"id": row position, "offset": start byte, "length": bytes}
+    into the source JSON file, for consumers that already have the source.
+    """
+    starts, ends = offsets
+    for cat, idxs in samples.items():
+        if not idxs:
+            continue
+        outpath = outdir / f"jeopardy_ner_{cat}_{timestamp}.index.{fmt}"
+        entries = [
+            {
+                "id": int(idx),
+                "offset": int(starts[idx]),
+                "length": int(ends[idx] - starts[idx]),
+            }
+            for idx in idxs
+        ]
+        with open(outpath, "w") as f:
+            if fmt == "json":
+                json.dump(entries, f, indent=2)
+            else:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+        print(f"Saved {len(entries)} record offsets to {outpath}")
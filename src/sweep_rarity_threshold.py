@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Rarity Threshold Sweep
+
+Answers "how many questions qualify as unusual proper nouns at threshold X?"
+from the per-question rarity array stored by
+`curate_jeopardy_dataset.py --rarity-file`, without re-running spaCy.
+Alternatively, rarity is recomputed from a stored spaCy annotation store
+(`--annotation-store`), which allows changing the proper noun rule itself
+(token length, alphabetic-only, POS tags) without tagging again.
+Optionally writes a sample at a chosen threshold.
+
+Usage: python sweep_rarity_threshold.py (--rarity-file FILE | --annotation-store DIR)
+       [--thresholds T ...] [--threshold T --sample-size N]
+"""
+
+import sys
+import argparse
+import random
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+from data_download_and_eda import load_jeopardy_data
+from sampling import sample_indices, save_samples
+
+DEFAULT_THRESHOLDS = [1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9]
+
+
+def load_rarity(path):
+    """Load a per-question rarity array written by curate_jeopardy_dataset.py."""
+    return np.load(path)
+
+
+def rarity_from_store(path, min_length=3, pos_tags=("PROPN",), require_alpha=True):
+    """
+    Recompute per-question rarity from stored spaCy annotations.
+
+    Args:
+        path (str): Annotation store directory
+        min_length (int): Minimum token length to qualify
+        pos_tags (Iterable[str]): Coarse POS tags that qualify
+        require_alpha (bool): Only alphabetic tokens qualify
+
+    Returns:
+        np.ndarray: float32 rarity per question (inf where nothing qualifies)
+    """
+    from annotation_store import AnnotationStore
+    from check_for_unusual_proper_nouns import unusual_proper_noun_score_doc
+
+    store = AnnotationStore(path)
+    rarity = np.full(len(store), np.inf, dtype=np.float32)
+    for pos, doc in enumerate(store.iter_docs()):
+        score = unusual_proper_noun_score_doc(doc, min_length, pos_tags, require_alpha)
+        if score is not None:
+            rarity[pos] = score
+    return rarity
+
+
+def count_qualifying(rarity, thresholds):
+    """
+    Count questions whose rarest proper noun is below each threshold.
+
+    Args:
+        rarity (np.ndarray): Per-question minimum proper noun frequency
+        thresholds (list): Global frequency thresholds to evaluate
+
+    Returns:
+        dict: Threshold -> number of qualifying questions
+    """
+    ordered = np.sort(rarity)
+    cutoffs = np.asarray(thresholds, dtype=rarity.dtype)
+    counts = np.searchsorted(ordered, cutoffs, side="left")
+    return {t: int(c) for t, c in zip(thresholds, counts)}
+
+
+def qualifying_indices(rarity, threshold):
+    """Return row positions of questions that qualify at the given threshold."""
+    cutoff = rarity.dtype.type(threshold)
+    return np.flatnonzero(rarity < cutoff).tolist()
+
+
+def main():
+    """Print qualifying counts per threshold and optionally save a sample."""
+    parser = argparse.ArgumentParser(
+        description="Sweep unusual proper noun thresholds over stored rarity scores"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--rarity-file", type=str, help="Rarity array (.npy)")
+    source.add_argument(
+        "--annotation-store", type=str, help="Stored spaCy annotations directory"
+    )
+    parser.add_argument(
+        "--min-length",
+        type=int,
+        default=3,
+        help="With --annotation-store: minimum proper noun length",
+    )
+    parser.add_argument(
+        "--pos",
+        type=str,
+        nargs="+",
+        default=["PROPN"],
+        help="With --annotation-store: POS tags that qualify",
+    )
+    parser.add_argument(
+        "--allow-non-alpha",
+        action="store_true",
+        help="With --annotation-store: also score non-alphabetic tokens",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=DEFAULT_THRESHOLDS,
+        help="Thresholds to report counts for",
+    )
+    parser.add_argument(
+        "--threshold", type=float, help="Save a sample of questions at this threshold"
+    )
+    parser.add_argument("--data-dir", type=str, help="Raw data dir (default: ../data)")
+    parser.add_argument(
+        "--output-dir", type=str, help="Output dir (default: ../output)"
+    )
+    parser.add_argument(
+        "--sample-size", type=int, default=1000, help="Examples to sample"
+    )
+    parser.add_argument(
+        "--format", choices=["json", "jsonl"], default="jsonl", help="Output format"
+    )
+    args = parser.parse_args()
+
+    if args.rarity_file:
+        rarity = load_rarity(args.rarity_file)
+    else:
+        rarity = rarity_from_store(
+            args.annotation_store,
+            min_length=args.min_length,
+            pos_tags=tuple(args.pos),
+            require_alpha=not args.allow_non_alpha,
+        )
+    total = len(rarity)
+    print(f"{'threshold':>10}  {'qualifying':>10}  {'percent':>7}")
+    for threshold, count in count_qualifying(rarity, args.thresholds).items():
+        pct = count / total * 100 if total else 0
+        print(f"{threshold:>10.1e}  {count:>10}  {pct:>6.2f}%")
+
+    if args.threshold is None:
+        return
+
+    random.seed(42)
+    root = Path(__file__).parent.parent
+    data_dir = Path(args.data_dir) if args.data_dir else root / "data"
+    outdir = Path(args.output_dir) if args.output_dir else root / "output"
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        idxs = sample_indices(
+            qualifying_indices(rarity, args.threshold), args.sample_size
+        )
+    except ValueError as e:
+        print(f"Error at threshold {args.threshold:.1e}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    df = load_jeopardy_data(data_dir=str(data_dir), filename="JEOPARDY_QUESTIONS1.json")
+    if len(df) != total:
+        print(
+            f"Error: rarity file covers {total} questions but the data has {len(df)}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    save_samples({"unusual_proper_nouns": idxs}, df, outdir, args.format, timestamp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Tests for annotation_store.py
+
+Validates sharded DocBin storage of tagged questions using a blank spaCy
+pipeline with hand-set POS tags, so no trained model is needed.
+"""
+
+import sys
+import os
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from annotation_store import AnnotationStore, AnnotationWriter, store_dir
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return spacy.blank("en")
+
+
+def tagged(nlp, words, pos):
+    return Doc(nlp.vocab, words=words, pos=pos)
+
+
+def test_store_dir_is_keyed_by_hash_and_model(nlp, tmp_path):
+    path = store_dir(str(tmp_path), "0123456789abcdef0123", nlp)
+    assert os.path.basename(path).startswith("0123456789abcdef_en_")
+    assert os.path.basename(path).endswith(nlp.meta["version"])
+
+
+def test_round_trip_keeps_row_alignment(nlp, tmp_path):
+    """Docs come back in row order, with empty Docs for skipped rows."""
+    path = str(tmp_path / "store")
+    writer = AnnotationWriter(path, 7, "hash", nlp, shard_size=2)
+    writer.add(1, tagged(nlp, ["Zorkblatt", "won"], ["PROPN", "VERB"]))
+    writer.add(2, tagged(nlp, ["Paris"], ["PROPN"]))
+    writer.add(5, tagged(nlp, ["the", "end"], ["DET", "NOUN"]))
+    writer.close()
+
+    store = AnnotationStore(path)
+    assert len(store) == 7
+    assert store.manifest["shards"] == [f"shard_{i:05d}.spacy" for i in range(4)]
+    docs = list(store.iter_docs())
+    assert [[t.text for t in d] for d in docs] == [
+        [],
+        ["Zorkblatt", "won"],
+        ["Paris"],
+        [],
+        [],
+        ["the", "end"],
+        [],
+    ]
+    assert [t.pos_ for t in docs[1]] == ["PROPN", "VERB"]
+    assert docs[2][0].is_alpha
+
+
+def test_incomplete_or_missing_store_is_rejected(nlp, tmp_path):
+    with pytest.raises(ValueError):
+        AnnotationStore(str(tmp_path / "missing"))
+    writer = AnnotationWriter(str(tmp_path / "partial"), 3, "hash", nlp, shard_size=1)
+    writer.add(0, tagged(nlp, ["Paris"], ["PROPN"]))
+    with pytest.raises(ValueError):
+        AnnotationStore(str(tmp_path / "partial"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+"""
+Tests for benchmark_detectors.py
+
+Validates timing and agreement helpers with simple stand-in detectors.
+"""
+
+import sys
+import os
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from benchmark_detectors import agreement, load_detectors, time_detectors
+
+
+def test_time_detectors_runs_each_detector():
+    detectors = {
+        "digits": lambda texts: [any(c.isdigit() for c in t) for t in texts],
+        "long": lambda texts: [len(t) > 5 for t in texts],
+    }
+    outputs, timings = time_detectors(["a1", "abcdefg"], detectors)
+    assert outputs == {"digits": [True, False], "long": [False, True]}
+    assert set(timings) == {"digits", "long"}
+    assert all(t["per_second"] > 0 for t in timings.values())
+
+
+def test_load_detectors_skips_proper_nouns_without_model(monkeypatch, capsys):
+    """A missing spaCy model drops only the proper noun detector."""
+    pytest.importorskip("enchant")
+    import check_for_unusual_proper_nouns
+
+    monkeypatch.setattr(check_for_unusual_proper_nouns, "nlp", None)
+    detectors = load_detectors()
+    assert "unusual_proper_nouns" not in detectors
+    assert "skipping the unusual_proper_nouns detector" in capsys.readouterr().err
+    outputs, _ = time_detectors(["Born in 1879", "Hello world"], detectors)
+    assert outputs["numbers"] == [True, False]
+
+
+@pytest.mark.parametrize(
+    "reference,candidate,expected_agreement,expected_kappa",
+    [
+        ([True, False, True, False], [True, False, True, False], 1.0, 1.0),
+        ([True, True, False, False], [False, False, True, True], 0.0, -1.0),
+        ([True, False, True, False], [True, True, False, False], 0.5, 0.0),
+    ],
+)
+def test_agreement(reference, candidate, expected_agreement, expected_kappa):
+    stats = agreement(reference, candidate)
+    assert stats["agreement"] == pytest.approx(expected_agreement)
+    assert stats["kappa"] == pytest.approx(expected_kappa)
+    assert stats["both"] + stats["only_reference"] == sum(reference)
+    assert stats["both"] + stats["only_candidate"] == sum(candidate)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
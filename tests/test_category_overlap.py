@@ -0,0 +1,57 @@
+"""
+Tests for category_overlap.py
+
+Validates bitmask construction and the overlap statistics derived from it.
+"""
+
+import sys
+import os
+import itertools
+import random
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from category_overlap import category_masks, overlap_summary
+
+CLASSIFIED = {
+    "numbers": [0, 1, 2],
+    "non_english": [1, 2, 3],
+    "unusual_proper_nouns": [2],
+}
+
+
+def test_category_masks():
+    assert category_masks(CLASSIFIED, 5).tolist() == [1, 3, 7, 2, 0]
+
+
+def test_overlap_summary_counts():
+    summary = overlap_summary(CLASSIFIED, 5)
+    assert summary["matrix"]["numbers"] == {
+        "numbers": 3,
+        "non_english": 2,
+        "unusual_proper_nouns": 1,
+    }
+    assert summary["jaccard"]["numbers"]["non_english"] == pytest.approx(2 / 4)
+    assert summary["combinations"]["numbers+non_english+unusual_proper_nouns"] == 1
+    assert summary["combinations"]["numbers+non_english"] == 1
+    assert summary["combinations"]["non_english"] == 1
+    assert summary["combinations"]["none"] == 1
+    assert sum(summary["combinations"].values()) == 5
+
+
+def test_overlap_matrix_matches_set_intersections():
+    """The bitmask matrix agrees with explicit set intersections."""
+    random.seed(1)
+    classified = {
+        cat: sorted(random.sample(range(200), k))
+        for cat, k in [("a", 80), ("b", 120), ("c", 30), ("d", 0)]
+    }
+    matrix = overlap_summary(classified, 200)["matrix"]
+    for a, b in itertools.product(classified, repeat=2):
+        assert matrix[a][b] == len(set(classified[a]) & set(classified[b]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""
+Tests for check_for_non_english_ngrams.py
+
+Validates the vectorized character trigram scorer used as an alternative
+non-English engine.
+"""
+
+import sys
+import os
+import numpy as np
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from check_for_non_english_ngrams import (
+    NgramLanguageScorer,
+    encode_tokens,
+    load_model,
+    train_model,
+    trigram_hashes,
+    word_hashes,
+)
+from corpus_arena import CorpusArena
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return NgramLanguageScorer(train_model())
+
+
+TEST_CASES = [
+    # English, including inflections and names a dictionary may reject
+    ("Hello world this is English", False),
+    ("The quick brown fox jumps over the lazy dog", False),
+    ("She walked quickly while he was jumping", False),
+    ("Shakespeare wrote Hamlet in Washington", False),
+    ("", False),
+    ("Numbers 123 and 45.67 should be ignored", False),
+    # Clearly non-English
+    ("Hola mundo cómo estás", True),
+    ("Guten Tag, wie geht es dir heute", True),
+    ("Hello мир world", True),
+    ("English with 中文 characters", True),
+    # A single foreign word in an English clue
+    ("Say hello in Spanish: hola", True),
+    ("German greeting: guten tag", True),
+    ("The French say this, merci, to thank you", True),
+    ("In Italy friends part with a quick ciao", True),
+    ("Bless you! Or, as the Germans say, gesundheit", True),
+    ("Wonderful! Or, in German, wunderbar", True),
+    # English words that are also foreign words stay English
+    ("Did the man see a hat at the war memorial", False),
+]
+
+
+@pytest.mark.parametrize("text,expected", TEST_CASES)
+def test_contains_non_english_batch(scorer, text, expected):
+    assert scorer.contains_non_english_batch([text]) == [expected]
+
+
+def test_batch_matches_individual_texts(scorer):
+    """Scoring texts together gives the same result as one at a time."""
+    texts = [text for text, _ in TEST_CASES]
+    together = scorer.text_scores(texts)
+    alone = np.concatenate([scorer.text_scores([t]) for t in texts])
+    np.testing.assert_array_equal(together, alone)
+
+
+def test_contains_non_english_in_range(scorer):
+    """Arena ranges give the batch result for the rows they cover."""
+    texts = [text for text, expected in TEST_CASES]
+    with CorpusArena.create(texts) as arena:
+        assert scorer.contains_non_english_in_range(arena, 4, 9) == [
+            expected for _, expected in TEST_CASES[4:9]
+        ]
+
+
+def test_text_without_scoreable_tokens(scorer):
+    """Texts with only numbers or short tokens score -inf."""
+    assert np.isneginf(scorer.text_scores(["42 is ok", ""])).all()
+
+
+def test_lexicon_overrides_trigrams(scorer):
+    """Lexicon words score +/-inf whatever their trigrams; others score finite."""
+    scores = scorer.score_tokens(["bonjour", "danke", "chat", "hat", "zqxwv"])
+    assert np.isposinf(scores[:2]).all()
+    assert np.isneginf(scores[2:4]).all()
+    assert np.isfinite(scores[4])
+
+
+def test_word_hashes_distinguish_tokens():
+    """Equal tokens hash equally (case-insensitively), different tokens differ."""
+    hashes = word_hashes(encode_tokens(["Hola", "hola", "holà", "hol"]))
+    assert hashes[0] == hashes[1]
+    assert len(set(hashes[1:].tolist())) == 3
+
+
+def test_encode_tokens_padding_and_truncation():
+    """Tokens get ^/$ markers, are lowercased, zero-padded and truncated."""
+    codes = encode_tokens(["Ab", "x" * 100])
+    assert codes.shape == (2, 32)
+    assert codes[0, :4].tolist() == [ord("^"), ord("a"), ord("b"), ord("$")]
+    assert (codes[0, 4:] == 0).all()
+    assert codes[1, -1] == ord("$")
+
+
+def test_trigram_hashes_mask_padding():
+    """Only real trigrams are marked valid: len(token) + 2 markers - 2."""
+    slots, valid = trigram_hashes(encode_tokens(["cat", "horse"]), bits=10)
+    assert valid.sum(axis=1).tolist() == [3, 5]
+    assert slots.min() >= 0 and slots.max() < 1 << 10
+
+
+def test_load_model_trains_once(tmp_path):
+    """The model is trained on first load and read back from disk after."""
+    path = str(tmp_path / "model.npz")
+    first = load_model(path)
+    assert os.path.exists(path)
+    second = load_model(path)
+    for name, array in first.items():
+        np.testing.assert_array_equal(second[name], array)
+
+
+def test_load_model_retrains_outdated_file(tmp_path):
+    """A table-only model file from before the lexicon is retrained."""
+    path = str(tmp_path / "model.npz")
+    np.savez_compressed(path, llr=np.zeros(1 << 10, dtype=np.float16))
+    model = load_model(path)
+    assert len(model["llr"]) == 1 << 18 and len(model["words"])
+    with np.load(path) as saved:
+        assert "words" in saved
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -11,7 +11,12 @@ import pytest
 # Ensure src is in path for import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from check_for_non_english_words import contains_non_english_and_words
+from check_for_non_english_words import (
+    contains_non_english_and_words,
+    contains_non_english_and_words_batch,
+    contains_non_english_and_words_in_range,
+)
+from corpus_arena import CorpusArena
 
 TEST_CASES = [
     # Basic English cases
@@ -104,5 +109,22 @@ def test_contains_non_english_comprehensive(text, expected):
     assert result == expected
 
 
+def test_contains_non_english_batch_matches_single():
+    """Batch detection agrees with the per-text check for every case."""
+    texts = [text for text, _ in TEST_CASES]
+    assert contains_non_english_and_words_batch(texts) == [
+        contains_non_english_and_words(text) for text in texts
+    ]
+
+
+def test_contains_non_english_in_range():
+    """Arena ranges give the batch result for the rows they cover."""
+    texts = [text for text, _ in TEST_CASES]
+    with CorpusArena.create(texts) as arena:
+        assert contains_non_english_and_words_in_range(
+            arena, 1, len(texts)
+        ) == contains_non_english_and_words_batch(texts[1:])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -11,7 +11,12 @@ import pytest
 # Ensure src is in path for import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from check_for_numbers import contains_number
+from corpus_arena import CorpusArena
+from check_for_numbers import (
+    contains_number,
+    contains_number_batch,
+    contains_number_in_range,
+)
 
 TEST_CASES = [
     # Basic cases with no numbers
@@ -137,5 +142,20 @@ def test_contains_number_comprehensive(text, expected):
     assert result == expected
 
 
+def test_contains_number_batch_matches_single():
+    """Batch detection agrees with contains_number for every case."""
+    texts = [text for text, _ in TEST_CASES]
+    assert contains_number_batch(texts) == [expected for _, expected in TEST_CASES]
+
+
+def test_contains_number_in_range():
+    """Arena ranges give the batch result for the rows they cover."""
+    texts = [text for text, _ in TEST_CASES]
+    expected = [expected for _, expected in TEST_CASES]
+    with CorpusArena.create(texts) as arena:
+        assert contains_number_in_range(arena, 0, len(texts)) == expected
+        assert contains_number_in_range(arena, 2, 5) == expected[2:5]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
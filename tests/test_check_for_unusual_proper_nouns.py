@@ -13,7 +13,16 @@ import pytest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 try:
-    from check_for_unusual_proper_nouns import has_unusual_proper_nouns, nlp
+    from check_for_unusual_proper_nouns import (
+        has_unusual_proper_nouns,
+        nlp,
+        tag_text,
+        unusual_proper_noun_score,
+        unusual_proper_noun_score_doc,
+        unusual_proper_noun_scores,
+        unusual_proper_noun_scores_in_range,
+    )
+    from corpus_arena import CorpusArena
 
     SPACY_AVAILABLE = nlp is not None
 except Exception:
@@ -217,6 +226,59 @@ def test_different_thresholds(threshold):
     assert isinstance(result, bool)
 
 
+@pytest.mark.parametrize("text,expected", TEST_CASES)
+def test_unusual_proper_noun_score_matches_boolean(text, expected):
+    """The rarity score agrees with has_unusual_proper_nouns at the default threshold."""
+    score = unusual_proper_noun_score(text)
+    assert (score is not None and score < 1e-6) == has_unusual_proper_nouns(text)
+
+
+def test_unusual_proper_noun_score_no_proper_nouns():
+    """Text without qualifying proper nouns has no score."""
+    assert unusual_proper_noun_score("") is None
+    assert unusual_proper_noun_score("the quick brown fox jumps") is None
+
+
+def test_unusual_proper_noun_scores_matches_single():
+    """Batch scoring with nlp.pipe agrees with per-text scoring."""
+    texts = [text for text, _ in TEST_CASES]
+    assert unusual_proper_noun_scores(texts) == [
+        unusual_proper_noun_score(text) for text in texts
+    ]
+
+
+def test_unusual_proper_noun_scores_in_range():
+    """Arena ranges are scored like the same texts passed as a list."""
+    texts = [text for text, _ in TEST_CASES]
+    with CorpusArena.create(texts) as arena:
+        assert unusual_proper_noun_scores_in_range(
+            arena, 3, 9
+        ) == unusual_proper_noun_scores(texts[3:9])
+
+
+def test_unusual_proper_noun_score_doc_rule_options():
+    """Rule options on a tagged Doc can only narrow or widen what qualifies."""
+    doc = tag_text("The wizard Zorkblatt cast spells")
+    assert unusual_proper_noun_score_doc(doc) == unusual_proper_noun_score(doc.text)
+    assert unusual_proper_noun_score_doc(doc, min_length=50) is None
+    assert unusual_proper_noun_score_doc(doc, pos_tags=()) is None
+
+
+def test_corpus_rarity_rule():
+    """With corpus counts, proper nouns common in the corpus no longer qualify."""
+    text = "The wizard Zorkblatt cast spells"
+    assert has_unusual_proper_nouns(text, corpus_counts={})
+    assert has_unusual_proper_nouns(
+        text, corpus_counts={"zorkblatt": 9}, corpus_rare_threshold=10
+    )
+    assert not has_unusual_proper_nouns(
+        text, corpus_counts={"zorkblatt": 10}, corpus_rare_threshold=10
+    )
+    assert unusual_proper_noun_scores([text], corpus_counts={"zorkblatt": 500}) == [
+        unusual_proper_noun_score(text, corpus_counts={"zorkblatt": 500})
+    ]
+
+
 def find_best_threshold(test_cases, thresholds=None, verbose=True):
     """
     Find optimal threshold by testing different values and calculating accuracy metrics.
@@ -0,0 +1,118 @@
+"""
+Tests for checkpoint.py
+
+Validates atomic checkpoint writes, periodic saving and resume validation.
+"""
+
+import sys
+import os
+import numpy as np
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from checkpoint import ClassificationCheckpoint
+
+
+def empty_results():
+    return {"numbers": [], "non_english": [], "unusual_proper_nouns": []}
+
+
+def test_save_and_restore_round_trip(tmp_path):
+    """A resumed checkpoint restores position, results and rarity scores."""
+    path = tmp_path / "ckpt.npz"
+    writer = ClassificationCheckpoint(path)
+    results = empty_results()
+    rarity = np.full(5, np.inf, dtype=np.float32)
+    writer.start(5, results, rarity=rarity)
+    results["numbers"] = [0, 2]
+    results["unusual_proper_nouns"] = [1]
+    rarity[1] = 3e-7
+    writer.save(3, results, rarity=rarity)
+    assert not os.path.exists(f"{path}.tmp")
+
+    reader = ClassificationCheckpoint(path, resume=True)
+    restored = empty_results()
+    restored_rarity = np.full(5, np.inf, dtype=np.float32)
+    assert reader.start(5, restored, rarity=restored_rarity) == 3
+    assert restored == results
+    np.testing.assert_array_equal(restored_rarity, rarity)
+
+
+def test_start_without_resume_ignores_checkpoint(tmp_path):
+    """Without resume, an existing checkpoint is not loaded."""
+    path = tmp_path / "ckpt.npz"
+    writer = ClassificationCheckpoint(path)
+    writer.start(4, empty_results())
+    writer.save(2, {"numbers": [1]})
+    results = empty_results()
+    assert ClassificationCheckpoint(path).start(4, results) == 0
+    assert results == empty_results()
+
+
+def test_resume_without_file_starts_at_zero(tmp_path):
+    """Resuming with no checkpoint on disk starts from the beginning."""
+    checkpoint = ClassificationCheckpoint(tmp_path / "missing.npz", resume=True)
+    assert checkpoint.start(10, empty_results()) == 0
+
+
+def test_tick_saves_every_n_rows(tmp_path):
+    """tick only writes once enough rows have been processed."""
+    path = tmp_path / "ckpt.npz"
+    checkpoint = ClassificationCheckpoint(path, every_rows=3, every_seconds=1e9)
+    results = empty_results()
+    checkpoint.start(10, results)
+    checkpoint.tick(2, results)
+    assert not path.exists()
+    checkpoint.tick(3, results)
+    with np.load(path) as saved:
+        assert int(saved["position"]) == 3
+
+
+@pytest.mark.parametrize("total,rarity_len", [(6, 5), (5, None)])
+def test_resume_rejects_mismatched_setup(tmp_path, total, rarity_len):
+    """Resuming with a different row count or rarity setup raises ValueError."""
+    path = tmp_path / "ckpt.npz"
+    writer = ClassificationCheckpoint(path)
+    rarity = np.full(5, np.inf, dtype=np.float32)
+    writer.start(5, empty_results(), rarity=rarity)
+    writer.save(2, empty_results(), rarity=rarity)
+
+    reader = ClassificationCheckpoint(path, resume=True)
+    other_rarity = None if rarity_len is None else np.zeros(rarity_len, np.float32)
+    with pytest.raises(ValueError):
+        reader.start(total, empty_results(), rarity=other_rarity)
+
+
+def test_resume_rejects_changed_settings(tmp_path):
+    """A checkpoint only resumes under the settings it was written with."""
+    path = tmp_path / "ckpt.npz"
+    settings = {"non_english_engine": "enchant", "rarity_rule": "global"}
+    writer = ClassificationCheckpoint(path, settings=settings)
+    writer.start(5, empty_results())
+    writer.save(2, empty_results())
+
+    same = ClassificationCheckpoint(path, resume=True, settings=dict(settings))
+    assert same.start(5, empty_results()) == 2
+    changed = ClassificationCheckpoint(
+        path, resume=True, settings={**settings, "non_english_engine": "ngram"}
+    )
+    with pytest.raises(ValueError, match="non_english_engine"):
+        changed.start(5, empty_results())
+    with pytest.raises(ValueError, match="rarity_rule"):
+        ClassificationCheckpoint(path, resume=True).start(5, empty_results())
+
+
+def test_clear_removes_file(tmp_path):
+    """clear deletes the checkpoint file."""
+    path = tmp_path / "ckpt.npz"
+    checkpoint = ClassificationCheckpoint(path)
+    checkpoint.start(1, empty_results())
+    checkpoint.save(1, empty_results())
+    checkpoint.clear()
+    assert not path.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,237 @@
+"""
+Tests for classification_service.py
+
+Runs the service on localhost with a stand-in batch classifier, so no
+spaCy or enchant models are needed.
+"""
+
+import sys
+import os
+import json
+import asyncio
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from classification_service import (
+    ClassificationService,
+    ServiceMetrics,
+    load_batch_classifier,
+)
+
+
+def digit_classifier(batches):
+    """Batch classifier flagging digits; records each batch it receives."""
+
+    def classify_batch(texts):
+        batches.append(list(texts))
+        return [{"numbers": any(c.isdigit() for c in t)} for t in texts]
+
+    return classify_batch
+
+
+async def request(port, method, path, payload=None, content_length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    if content_length is None:
+        content_length = len(body)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {content_length}\r\n\r\n".encode("ascii") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def run_with_service(scenario, batches, **kwargs):
+    async def main():
+        service = ClassificationService(digit_classifier(batches), **kwargs)
+        port = await service.start(port=0)
+        try:
+            return await scenario(port, service)
+        finally:
+            await service.stop()
+
+    return asyncio.run(main())
+
+
+def test_classify_single_and_multiple_texts():
+    """Both request shapes return one result per text, in order."""
+    batches = []
+
+    async def scenario(port, service):
+        single = await request(port, "POST", "/classify", {"text": "Year 1969"})
+        multi = await request(
+            port, "POST", "/classify", {"texts": ["no digits", "5 floors"]}
+        )
+        return single, multi
+
+    single, multi = run_with_service(scenario, batches)
+    assert single == (200, {"results": [{"numbers": True}]})
+    assert multi == (200, {"results": [{"numbers": False}, {"numbers": True}]})
+
+
+def test_concurrent_requests_are_micro_batched():
+    """Concurrent requests inside the wait window share a batch."""
+    batches = []
+
+    async def scenario(port, service):
+        texts = [f"clue {i}" for i in range(8)]
+        responses = await asyncio.gather(
+            *(request(port, "POST", "/classify", {"text": t}) for t in texts)
+        )
+        _, metrics = await request(port, "GET", "/metrics")
+        return responses, metrics
+
+    responses, metrics = run_with_service(
+        scenario, batches, max_batch_size=64, max_wait_ms=200
+    )
+    assert all(r == (200, {"results": [{"numbers": True}]}) for r in responses)
+    assert sum(len(b) for b in batches) == 8
+    assert len(batches) < 8
+    assert metrics["requests"] == 8
+    assert metrics["texts"] == 8
+    assert metrics["batches"] == len(batches)
+    assert metrics["latency_ms"]["p50"] is not None
+
+
+def test_batch_size_limit():
+    """A batch never exceeds max_batch_size."""
+    batches = []
+
+    async def scenario(port, service):
+        return await request(
+            port, "POST", "/classify", {"texts": [str(i) for i in range(10)]}
+        )
+
+    status, payload = run_with_service(
+        scenario, batches, max_batch_size=3, max_wait_ms=50
+    )
+    assert status == 200 and len(payload["results"]) == 10
+    assert max(len(b) for b in batches) <= 3
+
+
+@pytest.mark.parametrize(
+    "method,path,payload,status",
+    [
+        ("GET", "/health", None, 200),
+        ("GET", "/unknown", None, 404),
+        ("POST", "/classify", {"texts": [1, 2]}, 400),
+        ("POST", "/classify", {"wrong": "shape"}, 400),
+        ("POST", "/classify", {"texts": "abc"}, 400),
+        ("POST", "/classify", {"text": ["abc"]}, 400),
+    ],
+)
+def test_routes_and_errors(method, path, payload, status):
+    """Unknown routes and malformed bodies are rejected with JSON errors."""
+
+    async def scenario(port, service):
+        return await request(port, method, path, payload)
+
+    assert run_with_service(scenario, [])[0] == status
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_invalid_content_length_rejected(content_length):
+    """A non-numeric or negative Content-Length gets a 400 response."""
+
+    async def scenario(port, service):
+        return await request(
+            port, "POST", "/classify", {"text": "x"}, content_length=content_length
+        )
+
+    status, payload = run_with_service(scenario, [])
+    assert status == 400 and "Content-Length" in payload["error"]
+
+
+def test_classifier_error_fails_request():
+    """A failing classifier returns an error instead of hanging the request."""
+
+    def broken(texts):
+        raise RuntimeError("model crashed")
+
+    async def main():
+        service = ClassificationService(broken, max_wait_ms=1)
+        port = await service.start(port=0)
+        try:
+            return await request(port, "POST", "/classify", {"text": "clue"})
+        finally:
+            await service.stop()
+
+    status, payload = asyncio.run(main())
+    assert status == 500
+    assert "model crashed" in payload["error"]
+
+
+def test_failing_text_fails_only_its_request():
+    """Requests batched with a failing text still get their results."""
+
+    def picky(texts):
+        if "bad" in texts:
+            raise RuntimeError("cannot classify")
+        return [{"numbers": any(c.isdigit() for c in t)} for t in texts]
+
+    async def main():
+        service = ClassificationService(picky, max_batch_size=8, max_wait_ms=200)
+        port = await service.start(port=0)
+        try:
+            return await asyncio.gather(
+                request(port, "POST", "/classify", {"text": "clue 1"}),
+                request(port, "POST", "/classify", {"text": "bad"}),
+                request(port, "POST", "/classify", {"texts": ["clue", "bad"]}),
+                request(port, "POST", "/classify", {"text": "clue"}),
+            )
+        finally:
+            await service.stop()
+
+    good, bad, mixed, other = asyncio.run(main())
+    assert good == (200, {"results": [{"numbers": True}]})
+    assert other == (200, {"results": [{"numbers": False}]})
+    assert bad[0] == 500 and "cannot classify" in bad[1]["error"]
+    assert mixed[0] == 500
+
+
+def test_overlong_header_rejected():
+    """A header line over the stream limit gets a 413 instead of a dropped connection."""
+
+    async def scenario(port, service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            b"POST /classify HTTP/1.1\r\nX-Padding: "
+            + b"a" * (128 * 1024)
+            + b"\r\nContent-Length: 0\r\n\r\n"
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    status, payload = run_with_service(scenario, [])
+    assert status == 413 and "too long" in payload["error"]
+
+
+def test_load_batch_classifier_requires_model(monkeypatch):
+    """A missing spaCy model is reported when loading, not on the first request."""
+    pytest.importorskip("check_for_non_english_words")
+    import check_for_unusual_proper_nouns
+
+    monkeypatch.setattr(check_for_unusual_proper_nouns, "nlp", None)
+    with pytest.raises(ValueError, match="spaCy model not available"):
+        load_batch_classifier()
+
+
+def test_metrics_snapshot_empty():
+    """A fresh metrics object reports zeros and no latencies."""
+    snapshot = ServiceMetrics().snapshot()
+    assert snapshot["requests"] == 0
+    assert snapshot["mean_batch_size"] == 0
+    assert snapshot["latency_ms"]["p99"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for corpus_arena.py
+
+Validates packing texts into shared memory, reading them back by position
+and range, and attaching from worker processes.
+"""
+
+import sys
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from corpus_arena import CorpusArena
+
+TEXTS = ["Who wrote Hamlet?", "", "Hola mundo cómo estás", "中文 characters", None]
+
+
+def range_texts(arena, start, stop):
+    return arena.texts(start, stop)
+
+
+def test_roundtrip():
+    with CorpusArena.create(TEXTS) as arena:
+        assert len(arena) == 5
+        assert arena.texts() == ["" if t is None else t for t in TEXTS]
+        assert arena.text(2) == "Hola mundo cómo estás"
+        assert bytes(arena.raw(3)) == "中文 characters".encode("utf-8")
+        assert arena.texts(1, 3) == ["", "Hola mundo cómo estás"]
+        assert arena.texts(4, 10) == [""]
+        assert arena.texts(3, 3) == []
+
+
+def test_empty_arena():
+    with CorpusArena.create([]) as arena:
+        assert len(arena) == 0
+        assert arena.texts() == []
+        assert arena.ranges(4) == []
+
+
+def test_ranges_cover_all_rows():
+    with CorpusArena.create([str(i) for i in range(10)]) as arena:
+        ranges = arena.ranges(3)
+        assert ranges[0][0] == 0 and ranges[-1][1] == 10
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        assert len(arena.ranges(50)) == 10
+
+
+def test_pickles_by_name():
+    """Pickling sends only the name, not the texts."""
+    texts = ["x" * 1000] * 100
+    with CorpusArena.create(texts) as arena:
+        payload = pickle.dumps(arena)
+        assert len(payload) < 200
+        view = pickle.loads(payload)
+        assert view.texts(98) == texts[98:]
+        view.close()
+
+
+def test_workers_read_shared_texts():
+    texts = [f"Question {i}" for i in range(100)]
+    with CorpusArena.create(texts) as arena:
+        with ProcessPoolExecutor(2) as pool:
+            chunks = list(
+                pool.map(range_texts, [arena] * 4, [0, 25, 50, 75], [25, 50, 75, 100])
+            )
+    assert sum(chunks, []) == texts
+
+
+def test_unlink_frees_block():
+    arena = CorpusArena.create(["a"])
+    name = arena.name
+    arena.unlink()
+    with pytest.raises(FileNotFoundError):
+        CorpusArena.attach(name, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for corpus_frequency.py
+
+Validates per-question token counts, the compact on-disk format and reuse
+of a stored index across runs.
+"""
+
+import sys
+import os
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from corpus_frequency import CorpusFrequencyIndex, corpus_tokens, index_path_for
+
+TEXTS = [
+    "Zorkblatt's wand: Zorkblatt cast spells",
+    "Captain Xerothane & ZORKBLATT sailed in 1848",
+    "",
+    "Ça va? Über-cool",
+]
+
+
+def test_corpus_tokens():
+    """Tokens are lowercased alphabetic runs; digits and punctuation split them."""
+    assert corpus_tokens("Zorkblatt's wand: R2-D2") == {
+        "zorkblatt",
+        "s",
+        "wand",
+        "r",
+        "d",
+    }
+    assert corpus_tokens("Ça va? Über-cool") == {"ça", "va", "über", "cool"}
+
+
+def test_counts_questions_not_occurrences():
+    index = CorpusFrequencyIndex.build(TEXTS)
+    assert index.count("Zorkblatt") == 2
+    assert index.count("xerothane") == 1
+    assert index.count("über") == 1
+    assert index.count("missing") == 0
+    assert index.num_questions == 4
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "counts.npz")
+    index = CorpusFrequencyIndex.build(TEXTS)
+    index.save(path)
+    loaded = CorpusFrequencyIndex.load(path)
+    assert loaded.counts == index.counts
+    assert loaded.num_questions == 4
+    assert loaded.corpus_hash == index.corpus_hash
+    assert os.listdir(tmp_path) == ["counts.npz"]
+
+
+def test_empty_corpus_roundtrip(tmp_path):
+    path = str(tmp_path / "counts.npz")
+    CorpusFrequencyIndex.build([]).save(path)
+    assert len(CorpusFrequencyIndex.load(path)) == 0
+
+
+def test_load_or_build_reuses_and_rebuilds(tmp_path, capsys):
+    path = str(tmp_path / "counts.npz")
+    CorpusFrequencyIndex.load_or_build(path, TEXTS)
+    assert "Building" in capsys.readouterr().out
+
+    index = CorpusFrequencyIndex.load_or_build(path, TEXTS)
+    assert capsys.readouterr().out == ""
+    assert index.count("zorkblatt") == 2
+
+    index = CorpusFrequencyIndex.load_or_build(path, TEXTS + ["Zorkblatt again"])
+    assert "stale" in capsys.readouterr().out
+    assert index.count("zorkblatt") == 3
+
+
+def test_index_path_for():
+    assert index_path_for("data/q.json") == "data/q.json.token_counts.npz"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,37 @@
+"""
+Tests for corpus_hashing.py
+
+Validates that the corpus hash identifies texts and their order.
+"""
+
+import sys
+import os
+import subprocess
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from corpus_hashing import corpus_hash
+
+
+def test_corpus_hash_depends_on_order_and_boundaries():
+    assert corpus_hash(["a", "b"]) == corpus_hash(["a", "b"])
+    assert corpus_hash(["a", "b"]) != corpus_hash(["b", "a"])
+    assert corpus_hash(["ab"]) != corpus_hash(["a", "b"])
+
+
+def test_corpus_hash_does_not_import_spacy():
+    """Hashing a corpus needs no NLP dependencies."""
+    src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+    code = (
+        f"import sys; sys.path.insert(0, {src!r}); "
+        "import corpus_frequency, corpus_hashing; "
+        "sys.exit('spacy' in sys.modules)"
+    )
+    # -I: ignore PYTHONPATH and user site so only the imports above count
+    assert subprocess.run([sys.executable, "-I", "-c", code]).returncode == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,13 +6,35 @@ Validates classification of Jeopardy questions into numbers, non-English, and un
 
 import sys
 import os
+import argparse
 import pytest
+import numpy as np
 import pandas as pd
 
 # Ensure src is in path for import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from curate_jeopardy_dataset import classify
+import curate_jeopardy_dataset
+from checkpoint import ClassificationCheckpoint
+from corpus_arena import CorpusArena
+from check_for_non_english_ngrams import NgramLanguageScorer, train_model
+from check_for_unusual_proper_nouns import nlp
+from curate_jeopardy_dataset import (
+    TopKRarest,
+    classification_settings,
+    classify,
+    classify_parallel,
+    draw_samples,
+    new_rarity_array,
+    question_texts,
+    select_rarest,
+)
+
+# Tests whose results depend on proper noun tagging
+requires_model = pytest.mark.skipif(
+    nlp is None,
+    reason="spaCy model 'en_core_web_sm' not available. Install with: python -m spacy download en_core_web_sm",
+)
 
 # Test cases: (questions_list, expected_numbers_indices, expected_non_english_indices, expected_unusual_proper_nouns_indices)
 TEST_CASES = [
@@ -136,5 +158,317 @@ def test_classify_comprehensive(
     assert all(isinstance(indices, list) for indices in result.values())
 
 
+def test_top_k_rarest_keeps_lowest_scores():
+    """TopKRarest keeps only the k lowest scores, ordered rarest first."""
+    rarest = TopKRarest(3)
+    for idx, score in enumerate([5e-7, 1e-9, 3e-7, 8e-8, 9e-7, 1e-9]):
+        rarest.push(score, idx)
+    assert len(rarest) == 3
+    # Ties keep the earlier question
+    assert rarest.indices() == [1, 5, 3]
+
+
+def test_top_k_rarest_keeps_one_question_per_cluster():
+    """With labels, the rarest question of each cluster competes for k slots."""
+    labels = np.array([0, 0, 2, 2, 4, 5])
+    rarest = TopKRarest(2, labels=labels)
+    for score, idx in [(3e-9, 0), (1e-9, 1), (2e-9, 2), (5e-10, 3), (9e-9, 4)]:
+        rarest.push(score, idx)
+    assert rarest.indices() == [3, 1]
+    rarest.push(1e-10, 5)
+    assert len(rarest) == 2
+    assert rarest.indices() == [5, 3]
+    assert select_rarest(rarest, 2, duplicate_labels=labels) == [5, 3]
+
+    restored = TopKRarest(2, labels=labels)
+    restored.load_entries(rarest.entries())
+    restored.push(1e-11, 0)
+    assert restored.indices() == [0, 5]
+
+
+def test_top_k_rarest_fills_k_clusters_despite_duplicates():
+    """Many near-duplicates of the rarest questions cannot crowd out k clusters."""
+    labels = np.repeat(np.arange(10) * 5, 5)
+    rarest = TopKRarest(4, labels=labels)
+    for idx in range(len(labels)):
+        rarest.push((idx + 1) * 1e-9, idx)
+    assert select_rarest(rarest, 4, duplicate_labels=labels) == [0, 5, 10, 15]
+
+
+def test_select_rarest_not_enough():
+    """select_rarest raises like sample_indices when fewer than n are kept."""
+    rarest = TopKRarest(5)
+    rarest.push(1e-8, 0)
+    with pytest.raises(ValueError):
+        select_rarest(rarest, 5)
+
+
+def test_select_rarest_skips_near_duplicates():
+    """Only the rarest question of a near-duplicate cluster is selected."""
+    rarest = TopKRarest(4)
+    for score, idx in [(1e-9, 0), (2e-9, 1), (3e-9, 2), (4e-9, 3)]:
+        rarest.push(score, idx)
+    labels = np.array([0, 0, 2, 2])
+    assert select_rarest(rarest, 2, duplicate_labels=labels) == [0, 2]
+    with pytest.raises(ValueError):
+        select_rarest(rarest, 3, duplicate_labels=labels)
+
+
+@requires_model
+def test_classify_feeds_rarest():
+    """classify offers every unusual proper noun question to the heap."""
+    df = pd.DataFrame(
+        {"question": ["The wizard Zorkblatt cast spells", "Who wrote Hamlet?"]}
+    )
+    rarest = TopKRarest(10)
+    result = classify(df, rarest=rarest)
+    assert len(rarest) > 0
+    assert rarest.indices() == result["unusual_proper_nouns"]
+
+
+@requires_model
+def test_classify_stores_rarity():
+    """classify records a finite rarity only for questions with proper nouns."""
+    df = pd.DataFrame(
+        {"question": ["The wizard Zorkblatt cast spells", "", "the year was 1969"]}
+    )
+    rarity = new_rarity_array(len(df))
+    result = classify(df, rarity=rarity)
+    assert rarity.dtype == np.float32
+    assert rarity[0] < 1e-6
+    assert np.isinf(rarity[1]) and np.isinf(rarity[2])
+    assert result["unusual_proper_nouns"] == [0]
+
+
+def test_classify_resume_matches_uninterrupted(tmp_path, monkeypatch):
+    """A run interrupted mid-way and resumed equals an uninterrupted run."""
+    questions = [
+        "The wizard Zorkblatt cast 3 spells",
+        "Say bonjour in France",
+        "Princess Xyrellia ruled the kingdom",
+        "CRASH here",
+        "Hero Blorzaniq saved 12 villages",
+        "Captain Xerothane commanded 50 ships",
+    ]
+    df = pd.DataFrame({"question": questions})
+    expected_rarest = TopKRarest(2)
+    expected_rarity = new_rarity_array(len(df))
+    expected = classify(df, rarest=expected_rarest, rarity=expected_rarity)
+
+    path = tmp_path / "ckpt.npz"
+    original = curate_jeopardy_dataset.contains_number
+
+    def crash_on_marker(text):
+        if text.startswith("CRASH"):
+            raise KeyboardInterrupt
+        return original(text)
+
+    monkeypatch.setattr(curate_jeopardy_dataset, "contains_number", crash_on_marker)
+    with pytest.raises(KeyboardInterrupt):
+        classify(
+            df,
+            rarest=TopKRarest(2),
+            rarity=new_rarity_array(len(df)),
+            checkpoint=ClassificationCheckpoint(path, every_rows=1),
+        )
+    monkeypatch.setattr(curate_jeopardy_dataset, "contains_number", original)
+
+    rarest = TopKRarest(2)
+    rarity = new_rarity_array(len(df))
+    resumed = classify(
+        df,
+        rarest=rarest,
+        rarity=rarity,
+        checkpoint=ClassificationCheckpoint(path, resume=True),
+    )
+    assert resumed == expected
+    assert rarest.indices() == expected_rarest.indices()
+    np.testing.assert_array_equal(rarity, expected_rarity)
+
+
+def test_classification_settings_track_rule_and_exclusions():
+    """Settings differ whenever the engine, rarity rule or exclusions differ."""
+    args = argparse.Namespace(
+        non_english_engine="enchant",
+        foreign_threshold=0.0,
+        rarity_rule="global",
+        corpus_rare_threshold=10,
+        select="top-k",
+        dedupe=False,
+        dedupe_threshold=0.8,
+    )
+    base = classification_settings(args)
+    assert "corpus_rare_threshold" not in base
+    corpus_args = argparse.Namespace(
+        **{**vars(args), "rarity_rule": "global-and-corpus"}
+    )
+    assert classification_settings(corpus_args)["corpus_rare_threshold"] == 10
+    excluded = np.array([False, True, False])
+    with_exclusions = classification_settings(args, excluded)
+    assert with_exclusions != base
+    assert with_exclusions == classification_settings(args, excluded.copy())
+    assert with_exclusions != classification_settings(args, ~excluded)
+
+
+def test_classify_with_ngram_engine():
+    """The n-gram engine replaces enchant for the non-English category only."""
+    df = pd.DataFrame(
+        {"question": ["Guten Tag, wie geht es dir heute", "I have 3 cats", None]}
+    )
+    scorer = NgramLanguageScorer(train_model())
+    expected = classify(df)
+    result = classify(df, ngram_scorer=scorer)
+    assert result["non_english"] == [0]
+    assert result["numbers"] == expected["numbers"]
+    assert result["unusual_proper_nouns"] == expected["unusual_proper_nouns"]
+
+
+@pytest.mark.parametrize("ngram", [False, True])
+def test_classify_parallel_matches_classify(ngram):
+    """Workers over a shared arena produce exactly the serial results."""
+    questions = [q for case in TEST_CASES for q in case[0]] + [None, "  "]
+    df = pd.DataFrame({"question": questions}, index=range(100, 100 + len(questions)))
+    scorer = NgramLanguageScorer(train_model()) if ngram else None
+    rarest, rarity = TopKRarest(3), new_rarity_array(len(df))
+    expected = classify(df, rarest=rarest, rarity=rarity, ngram_scorer=scorer)
+    parallel_rarest, parallel_rarity = TopKRarest(3), new_rarity_array(len(df))
+    result = classify_parallel(
+        df, 2, rarest=parallel_rarest, rarity=parallel_rarity, ngram_scorer=scorer
+    )
+    assert result == expected
+    assert parallel_rarest.indices() == rarest.indices()
+    np.testing.assert_array_equal(parallel_rarity, rarity)
+
+
+@requires_model
+def test_classify_range_loses_only_failing_rows(monkeypatch):
+    """A row that fails to score in a worker does not void its whole range."""
+    import check_for_unusual_proper_nouns as proper_nouns
+
+    word_frequency = proper_nouns.word_frequency
+
+    def failing_word_frequency(word, *args, **kwargs):
+        if word == "zorkblatt":
+            raise RuntimeError("bad row")
+        return word_frequency(word, *args, **kwargs)
+
+    monkeypatch.setattr(proper_nouns, "word_frequency", failing_word_frequency)
+    df = pd.DataFrame(
+        {
+            "question": [
+                "The wizard Zorkblatt cast spells",
+                "The sorcerer Quixblorp cast spells",
+            ]
+        }
+    )
+    rarity = new_rarity_array(len(df))
+    expected = classify(df, rarity=rarity)
+    assert expected["unusual_proper_nouns"] == [1]
+
+    monkeypatch.setattr(curate_jeopardy_dataset, "_worker_arena", None)
+    arena = CorpusArena.create(question_texts(df))
+    try:
+        curate_jeopardy_dataset._init_classify_worker(arena, None, {})
+        _, _, scores = curate_jeopardy_dataset._classify_range(0, len(df), 0.0)
+    finally:
+        arena.unlink()
+    assert scores[0] is None
+    assert scores[1] == pytest.approx(float(rarity[1]))
+
+
+@requires_model
+def test_classify_corpus_rarity_rule():
+    """Corpus counts drop proper nouns that are common in the corpus."""
+    df = pd.DataFrame(
+        {"question": ["The wizard Zorkblatt cast spells", "Captain Xerothane sailed"]}
+    )
+    result = classify(
+        df, corpus_counts={"zorkblatt": 50, "xerothane": 1}, corpus_rare_threshold=10
+    )
+    assert result["unusual_proper_nouns"] == [1]
+    assert classify(df)["unusual_proper_nouns"] == [0, 1]
+
+
+def test_draw_samples_stratified_and_top_k():
+    """Stratified categories use the group index; top-k uses the heap."""
+    from sampling import build_group_index
+
+    classified = {
+        "numbers": [0, 1, 2, 3],
+        "non_english": [1, 2],
+        "unusual_proper_nouns": [0, 3],
+    }
+    keys = pd.Series(["a", "a", "a", "b"])
+    rarest = TopKRarest(2)
+    rarest.push(1e-7, 0)
+    rarest.push(1e-9, 3)
+    samples = draw_samples(
+        classified, 2, rarest=rarest, group_index=build_group_index(keys, classified)
+    )
+    assert 3 in samples["numbers"]
+    assert sorted(samples["non_english"]) == [1, 2]
+    assert samples["unusual_proper_nouns"] == [3, 0]
+    with pytest.raises(ValueError, match="non_english"):
+        draw_samples(classified, 3)
+
+
+@pytest.mark.parametrize("stratify", [False, True])
+def test_draw_samples_exclusive_is_disjoint(stratify):
+    """Exclusive sampling never repeats a question across categories."""
+    from sampling import build_group_index
+
+    classified = {
+        "numbers": list(range(0, 60)),
+        "non_english": list(range(20, 80)),
+        "unusual_proper_nouns": list(range(40, 70)),
+    }
+    group_index = None
+    if stratify:
+        keys = pd.Series(["a", "b"] * 40)
+        group_index = build_group_index(keys, classified)
+    samples = draw_samples(classified, 10, group_index=group_index, exclusive=True)
+    assert list(samples) == list(classified)
+    chosen = [i for idxs in samples.values() for i in idxs]
+    assert len(chosen) == len(set(chosen)) == 30
+    for cat, idxs in samples.items():
+        assert set(idxs) <= set(classified[cat])
+
+
+def test_draw_samples_exclusive_not_enough():
+    """Exclusive sampling fails when categories cannot be filled disjointly."""
+    classified = {"numbers": [0, 1, 2], "non_english": [0, 1, 2]}
+    draw_samples(classified, 2)
+    with pytest.raises(ValueError):
+        draw_samples(classified, 2, exclusive=True)
+
+
+@pytest.mark.parametrize("exclusive", [False, True])
+def test_draw_samples_skips_excluded(exclusive):
+    """Excluded rows are never sampled, including by top-k selection."""
+    classified = {"numbers": [0, 1, 2, 3], "unusual_proper_nouns": [4, 5, 6]}
+    rarest = TopKRarest(3)
+    for idx in [4, 5, 6]:
+        rarest.push(idx * 1e-9, idx)
+    excluded = np.zeros(7, dtype=bool)
+    excluded[[1, 4]] = True
+    samples = draw_samples(
+        classified, 2, rarest=rarest, exclusive=exclusive, excluded=excluded
+    )
+    assert samples["unusual_proper_nouns"] == [5, 6]
+    assert sorted(samples["numbers"]) in ([0, 2], [0, 3], [2, 3])
+    assert excluded.sum() == 2  # the caller's mask is left untouched
+
+
+@requires_model
+def test_classify_does_not_offer_excluded_to_rarest():
+    df = pd.DataFrame(
+        {"question": ["The wizard Zorkblatt cast spells", "Captain Xerothane sailed"]}
+    )
+    rarest = TopKRarest(10)
+    result = classify(df, rarest=rarest, excluded=np.array([True, False]))
+    assert result["unusual_proper_nouns"] == [0, 1]
+    assert rarest.indices() == [1]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
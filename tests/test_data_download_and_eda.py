@@ -0,0 +1,188 @@
+"""
+Tests for data loading in data_download_and_eda.py
+
+Validates column projection, the low-memory dtype conversion, the opt-in
+EDA report and parallel parsing.
+"""
+
+import sys
+import os
+import json
+import pytest
+import pandas as pd
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_download_and_eda import (
+    load_jeopardy_data,
+    optimize_dtypes,
+    parse_json_parallel,
+)
+
+RECORDS = [
+    {
+        "category": "HISTORY",
+        "air_date": "2004-12-31",
+        "question": "'For the last 8 years of his life, Galileo was under house arrest'",
+        "value": "$200",
+        "answer": "Copernicus",
+        "round": "Jeopardy!",
+        "show_number": "4680",
+    },
+    {
+        "category": "ESPN's TOP 10 ALL-TIME ATHLETES",
+        "air_date": "2004-12-31",
+        "question": "'No. 2: 1912 Olympian; football star at Carlisle Indian School'",
+        "value": None,
+        "answer": "Jim Thorpe",
+        "round": "Final Jeopardy!",
+        "show_number": "4680",
+    },
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with open(tmp_path / "jeopardy.json", "w") as f:
+        json.dump(RECORDS, f)
+    return str(tmp_path)
+
+
+def test_default_load_is_unchanged(data_dir):
+    """Without options the DataFrame matches pd.DataFrame over the records."""
+    df = load_jeopardy_data(data_dir=data_dir, filename="jeopardy.json")
+    pd.testing.assert_frame_equal(df, pd.DataFrame(RECORDS))
+
+
+def test_column_projection(data_dir):
+    """Only the requested columns are kept, in the requested order."""
+    df = load_jeopardy_data(
+        data_dir=data_dir, filename="jeopardy.json", columns=["question", "round"]
+    )
+    assert df.columns.tolist() == ["question", "round"]
+
+
+def test_low_memory_dtypes(data_dir):
+    """Low-memory mode uses categoricals, datetimes and integer show numbers."""
+    df = load_jeopardy_data(
+        data_dir=data_dir, filename="jeopardy.json", low_memory=True
+    )
+    for col in ["round", "category", "value"]:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["air_date"])
+    assert df["show_number"].dtype == "int32"
+    assert df["question"].tolist() == [r["question"] for r in RECORDS]
+    assert pd.isna(df.loc[1, "value"])
+
+
+def test_optimize_dtypes_nullable_show_number():
+    """Missing show numbers become missing values of a nullable integer."""
+    df = optimize_dtypes(pd.DataFrame({"show_number": ["12", None]}))
+    assert df["show_number"].dtype == "Int32"
+    assert df["show_number"].tolist()[0] == 12
+
+
+@pytest.mark.parametrize(
+    "col,values",
+    [
+        ("air_date", ["2004-12-31", "unknown"]),
+        ("air_date", ["2004-12-31", "12/31/2004"]),
+        ("show_number", ["4680", "special"]),
+        ("show_number", ["4680", "0042"]),
+    ],
+)
+def test_optimize_dtypes_keeps_lossy_columns(col, values):
+    """Columns that would not write back unchanged keep the source strings."""
+    df = optimize_dtypes(pd.DataFrame({col: values}))
+    assert df[col].tolist() == values
+
+
+def test_optimize_dtypes_arrow_strings():
+    """Arrow-backed strings are used for text columns when requested."""
+    pytest.importorskip("pyarrow")
+    df = optimize_dtypes(pd.DataFrame(RECORDS), arrow_strings=True)
+    assert df["question"].dtype == pd.StringDtype("pyarrow")
+    assert df["answer"].tolist() == ["Copernicus", "Jim Thorpe"]
+
+
+def test_arrow_strings_without_low_memory(data_dir):
+    """arrow_strings applies on its own, leaving the other columns unchanged."""
+    pytest.importorskip("pyarrow")
+    df = load_jeopardy_data(
+        data_dir=data_dir, filename="jeopardy.json", arrow_strings=True
+    )
+    assert df["question"].dtype == pd.StringDtype("pyarrow")
+    assert df["round"].dtype == object
+
+
+def test_no_profile_by_default(data_dir, capsys):
+    """Loading without a profile path prints no EDA statistics."""
+    load_jeopardy_data(data_dir=data_dir, filename="jeopardy.json")
+    assert "missing" not in capsys.readouterr().out
+    assert sorted(os.listdir(data_dir)) == ["jeopardy.json"]
+
+
+def test_profile_path_writes_report(data_dir, tmp_path):
+    """A profile path produces a JSON report over the raw records."""
+    path = tmp_path / "profile.json"
+    df = load_jeopardy_data(
+        data_dir=data_dir, filename="jeopardy.json", profile_path=str(path)
+    )
+    pd.testing.assert_frame_equal(df, pd.DataFrame(RECORDS))
+    with open(path) as f:
+        report = json.load(f)
+    assert report["records"] == 2
+    assert report["missing_rate"]["value"] == 0.5
+    assert report["distributions"]["round"] == {"Jeopardy!": 1, "Final Jeopardy!": 1}
+
+
+IRREGULAR_RECORDS = RECORDS * 5 + [
+    {"question": "Only a question"},
+    {"extra": [1, {"x": "]"}], "value": 400, "question": None},
+    {},
+    {"question": 'Brackets "[{" inside a string', "value": 1.5, "flag": True},
+]
+
+
+@pytest.mark.parametrize("records", [RECORDS, IRREGULAR_RECORDS, [], [{}, {}]])
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parse_json_parallel_matches_dataframe(tmp_path, records, workers):
+    """Parallel parsing gives exactly pd.DataFrame over the records."""
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump(records, f, indent=1)
+    df = parse_json_parallel(path, workers, ranges_per_worker=2)
+    pd.testing.assert_frame_equal(df, pd.DataFrame(records))
+
+
+def test_parse_json_parallel_columns(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump(IRREGULAR_RECORDS, f)
+    columns = ["value", "question", "missing"]
+    df = parse_json_parallel(path, 2, columns=columns)
+    pd.testing.assert_frame_equal(df, pd.DataFrame(IRREGULAR_RECORDS, columns=columns))
+
+
+def test_load_with_parse_workers(data_dir, tmp_path):
+    """parse_workers changes how, not what, is loaded, including the EDA report."""
+    serial_report = tmp_path / "serial.json"
+    parallel_report = tmp_path / "parallel.json"
+    expected = load_jeopardy_data(
+        data_dir=data_dir, filename="jeopardy.json", profile_path=str(serial_report)
+    )
+    df = load_jeopardy_data(
+        data_dir=data_dir,
+        filename="jeopardy.json",
+        profile_path=str(parallel_report),
+        parse_workers=2,
+    )
+    pd.testing.assert_frame_equal(df, expected)
+    assert json.loads(parallel_report.read_text()) == json.loads(
+        serial_report.read_text()
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Tests for eda_profiler.py
+
+Validates the HyperLogLog distinct counter and the single-pass statistics
+collected by EDAProfiler.
+"""
+
+import sys
+import os
+import json
+import pytest
+import pandas as pd
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eda_profiler import EDAProfiler, HyperLogLog
+
+
+def profile(records):
+    profiler = EDAProfiler()
+    for record in records:
+        profiler.update(record)
+    return profiler.report()
+
+
+@pytest.mark.parametrize("n", [10, 1000, 50000])
+def test_hyperloglog_estimate(n):
+    """Distinct counts are within a few percent of the true value."""
+    hll = HyperLogLog()
+    for i in range(n):
+        hll.add(f"value-{i}")
+        hll.add(f"value-{i}")  # duplicates must not count
+    assert abs(hll.count() - n) <= max(1, 0.03 * n)
+
+
+def test_hyperloglog_bounded_memory():
+    """Register storage does not grow with the number of values."""
+    hll = HyperLogLog(precision=10)
+    for i in range(20000):
+        hll.add(i)
+    assert len(hll.registers) == 1024
+
+
+def test_missing_rates():
+    """None, NaN and absent keys count as missing, like isnull(); "" does not."""
+    records = [
+        {"question": "a", "value": "$200"},
+        {"question": "b", "value": None},
+        {"question": "", "value": "$400", "answer": "x"},
+        {"question": float("nan")},
+    ]
+    report = profile(records)
+    assert report["columns"] == ["question", "value", "answer"]
+    assert report["missing_rate"] == {"question": 0.25, "value": 0.5, "answer": 0.75}
+    assert report["missing_rate"] == pd.DataFrame(records).isnull().mean().to_dict()
+    assert report["approx_distinct"]["value"] == 2
+
+
+def test_question_length_histogram():
+    """Lengths are bucketed by LENGTH_BUCKET with an open-ended last bucket."""
+    report = profile(
+        [{"question": "x" * 10}, {"question": "x" * 30}, {"question": "x" * 900}]
+    )
+    lengths = report["question_length"]
+    assert lengths["min"] == 10
+    assert lengths["max"] == 900
+    assert lengths["histogram"] == {"0-24": 1, "25-49": 1, "500+": 1}
+
+
+def test_html_markup():
+    """Questions containing tags are counted once, per tag name."""
+    report = profile(
+        [
+            {"question": '<a href="http://x">This</a> <A href="y">one</A>'},
+            {"question": "Plain text"},
+            {"question": "Line<br />break"},
+            {"question": "1 < 2 and 3 > 2"},
+        ]
+    )
+    html = report["html_markup"]
+    assert html["questions_with_html"] == 2
+    assert html["rate"] == 0.5
+    assert html["questions_per_tag"] == {"a": 1, "br": 1}
+
+
+def test_merge_matches_single_pass():
+    """Merging profiles of consecutive chunks equals profiling them all at once."""
+    records = [
+        {"question": "<b>Bold</b> one", "value": "$200", "round": "Jeopardy!"},
+        {"question": "", "value": None},
+        {"question": "Third <i>clue</i>", "answer": "x", "round": "Final"},
+        {"question": "Fourth", "value": "$400", "extra": 1},
+        {"answer": "y", "round": "Jeopardy!"},
+    ]
+    merged = EDAProfiler()
+    for chunk in [records[:2], records[2:2], records[2:4], records[4:]]:
+        profiler = EDAProfiler()
+        for record in chunk:
+            profiler.update(record)
+        merged.merge(profiler)
+    assert merged.report() == profile(records)
+
+
+def test_distributions_and_write(tmp_path):
+    """round/value counts are reported and the report is written as JSON."""
+    profiler = EDAProfiler()
+    for record in [
+        {"round": "Jeopardy!", "value": "$200"},
+        {"round": "Jeopardy!", "value": "$400"},
+        {"round": "Double Jeopardy!", "value": "$400"},
+    ]:
+        profiler.update(record)
+    path = tmp_path / "report.json"
+    report = profiler.write_report(str(path))
+    with open(path) as f:
+        assert json.load(f) == report
+    assert report["distributions"] == {
+        "round": {"Jeopardy!": 2, "Double Jeopardy!": 1},
+        "value": {"$400": 2, "$200": 1},
+    }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Tests for exclusion_filter.py
+
+Validates Bloom filter membership, persistence and reading questions from
+curation output files.
+"""
+
+import sys
+import os
+import json
+import pytest
+import numpy as np
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from exclusion_filter import ExclusionFilter, output_questions, question_keys
+
+
+def test_question_keys_normalize():
+    """Case and punctuation variants share a key."""
+    keys = question_keys(["Who wrote Hamlet?", "who wrote hamlet", "Who wrote Lear?"])
+    assert keys.dtype == np.uint64
+    assert keys[0] == keys[1] != keys[2]
+
+
+def test_no_false_negatives():
+    filt = ExclusionFilter(capacity=1000, error_rate=0.01)
+    added = [f"Question {i}" for i in range(1000)]
+    filt.add(added)
+    assert filt.contains(added).all()
+    assert filt.count == 1000
+
+
+def test_false_positive_rate():
+    """At capacity, false positives stay near the configured error rate."""
+    filt = ExclusionFilter(capacity=5000, error_rate=0.01)
+    filt.add([f"Emitted {i}" for i in range(5000)])
+    rate = filt.contains([f"Fresh {i}" for i in range(20000)]).mean()
+    assert rate < 0.02
+
+
+def test_size_depends_on_capacity_only():
+    filt = ExclusionFilter(capacity=10000, error_rate=0.001)
+    size = filt.bits.nbytes
+    for run in range(30):
+        filt.add([f"Run {run} question {i}" for i in range(100)])
+    assert filt.bits.nbytes == size < 20000
+
+
+def test_save_and_load_or_create(tmp_path):
+    path = str(tmp_path / "filter.npz")
+    filt = ExclusionFilter.load_or_create(path, capacity=100)
+    assert not filt.contains(["Who wrote Hamlet?"]).any()
+    filt.add(["Who wrote Hamlet?"])
+    filt.save(path)
+    assert os.listdir(tmp_path) == ["filter.npz"]
+
+    loaded = ExclusionFilter.load_or_create(path)
+    assert loaded.contains(["Who wrote Hamlet?", "Who wrote Lear?"]).tolist() == [
+        True,
+        False,
+    ]
+    assert (loaded.num_hashes, loaded.capacity, loaded.count) == (
+        filt.num_hashes,
+        100,
+        1,
+    )
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_output_questions(tmp_path, fmt):
+    records = [{"question": "Q1", "answer": "A"}, {"question": None}]
+    path = tmp_path / f"jeopardy_ner_numbers_x.{fmt}"
+    with open(path, "w") as f:
+        if fmt == "json":
+            json.dump(records, f)
+        else:
+            f.write("\n".join(json.dumps(r) for r in records) + "\n")
+    assert output_questions(path) == ["Q1", ""]
+
+
+def test_output_questions_index_only(tmp_path):
+    path = tmp_path / "jeopardy_ner_numbers_x.index.jsonl"
+    path.write_text(json.dumps({"id": 0, "offset": 1, "length": 2}) + "\n")
+    assert output_questions(path) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+"""
+Tests for near_duplicates.py
+
+Validates MinHash signatures, LSH clustering of near-duplicate questions
+and collapsing of sampled positions to one question per cluster.
+"""
+
+import sys
+import os
+import pytest
+import numpy as np
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from near_duplicates import (
+    collapse_duplicates,
+    duplicate_summary,
+    find_near_duplicates,
+    minhash_signatures,
+    near_duplicate_labels,
+    normalize_text,
+)
+
+QUESTIONS = [
+    "'This Brooklyn congressman defeated Alfonse D'Amato for a Senate seat in 1998'",
+    "Chopin was born in Poland, & his first printed work at age 7 was a polonaise",
+    "This brooklyn congressman defeated Alfonse D'Amato for a senate seat in 1998!",
+    "",
+    "Chopin was born in Poland; his first printed work at age 7 was a polonaise in G",
+    "The Wax Museum of Witches and Seafarers opened in this New England city",
+]
+
+
+def test_normalize_text():
+    """Case and punctuation do not matter after normalization."""
+    assert normalize_text("Hello, World!  (Again)") == "hello world again"
+
+
+def test_signatures_ignore_punctuation_and_case():
+    """Variants that normalize to the same text get identical signatures."""
+    sig = minhash_signatures(QUESTIONS)
+    assert sig.shape == (len(QUESTIONS), 64)
+    assert sig.dtype == np.uint32
+    np.testing.assert_array_equal(sig[0], sig[2])
+    assert (sig[0] != sig[5]).mean() > 0.9
+
+
+def test_signatures_are_chunk_independent():
+    """Chunking only bounds memory; it does not change the result."""
+    np.testing.assert_array_equal(
+        minhash_signatures(QUESTIONS, chunk_size=2), minhash_signatures(QUESTIONS)
+    )
+
+
+def test_find_near_duplicates():
+    """Near-duplicates share the label of their earliest row; empty text is alone."""
+    labels = find_near_duplicates(QUESTIONS)
+    assert labels.tolist() == [0, 1, 0, 3, 1, 5]
+
+
+def test_threshold_controls_clustering():
+    """A similarity threshold of 1 keeps only exact normalized duplicates."""
+    labels = find_near_duplicates(QUESTIONS, threshold=1.0)
+    assert labels.tolist() == [0, 1, 0, 3, 4, 5]
+
+
+def test_members_similar_to_representative_only():
+    """A question similar to a member but not to its representative stays apart."""
+    sig = np.array([[1, 2, 3, 4], [1, 2, 3, 9], [8, 2, 3, 9], [5, 6, 7, 0]])
+    labels = near_duplicate_labels(sig.astype(np.uint32), bands=4, threshold=0.75)
+    assert labels.tolist() == [0, 0, 2, 3]
+
+
+def test_chains_do_not_merge():
+    """Each row is similar to the next, but clusters stay with their first row."""
+    # Row k changes one more band than row k - 1
+    sig = np.array(
+        [
+            [1, 1, 2, 2, 3, 3, 4, 4],
+            [9, 9, 2, 2, 3, 3, 4, 4],
+            [9, 9, 8, 8, 3, 3, 4, 4],
+            [9, 9, 8, 8, 7, 7, 4, 4],
+        ]
+    )
+    labels = near_duplicate_labels(sig.astype(np.uint32), bands=4, threshold=0.75)
+    assert labels.tolist() == [0, 0, 2, 2]
+
+
+def test_members_reach_threshold_with_representative():
+    """In templated clues every member is similar to its cluster label itself."""
+    texts = [
+        f"This state capital has a population of {i} and was founded in {1700 + i}"
+        for i in range(2000)
+    ]
+    sig = minhash_signatures(texts)
+    labels = near_duplicate_labels(sig)
+    assert len(np.unique(labels)) > 1
+    similarity = (sig == sig[labels]).mean(axis=1)
+    assert similarity.min() >= 0.8
+
+
+def test_bands_must_divide_signature():
+    with pytest.raises(ValueError):
+        near_duplicate_labels(np.zeros((2, 10), dtype=np.uint32), bands=4)
+
+
+def test_collapse_duplicates_keeps_first_in_order():
+    labels = np.array([0, 1, 0, 3, 1, 5])
+    assert collapse_duplicates([4, 2, 0, 1, 5], labels).tolist() == [4, 2, 5]
+    assert collapse_duplicates([], labels).tolist() == []
+
+
+def test_duplicate_summary():
+    summary = duplicate_summary(np.array([0, 0, 0, 3, 4, 4]))
+    assert summary == {"clusters_collapsed": 2, "questions_collapsed": 3}
+
+
+def test_many_questions():
+    """Every re-aired copy in a larger corpus is found."""
+    base = [f"Clue number {i} is about topic {i * 7919 % 1000}" for i in range(500)]
+    texts = base + [t.upper() + "." for t in base[:100]]
+    labels = find_near_duplicates(texts)
+    assert labels[500:].tolist() == list(range(100))
+    assert duplicate_summary(labels)["clusters_collapsed"] == 100
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
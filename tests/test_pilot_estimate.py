@@ -0,0 +1,124 @@
+"""
+Tests for pilot_estimate.py
+
+Validates Wilson intervals, seeded pilot sampling and the projections made
+from a pilot classification.
+"""
+
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pilot_estimate import (
+    estimate_run,
+    pilot_positions,
+    print_estimate,
+    wilson_interval,
+)
+
+
+def test_wilson_interval_known_value():
+    """Matches the textbook interval for 10 successes in 100 trials."""
+    low, high = wilson_interval(10, 100)
+    assert low == pytest.approx(0.0552, abs=1e-4)
+    assert high == pytest.approx(0.1744, abs=1e-4)
+
+
+def test_wilson_interval_edges():
+    """Zero and all successes stay inside [0, 1]; no trials is uninformative."""
+    assert wilson_interval(0, 50)[0] == pytest.approx(0.0, abs=1e-12)
+    assert wilson_interval(50, 50)[1] == pytest.approx(1.0, abs=1e-12)
+    assert 0 < wilson_interval(0, 50)[1] < 0.1
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_pilot_positions_seeded_and_sorted():
+    positions = pilot_positions(1000, 50, seed=7)
+    assert positions == pilot_positions(1000, 50, seed=7)
+    assert positions != pilot_positions(1000, 50, seed=8)
+    assert positions == sorted(set(positions))
+    assert pilot_positions(10, 50) == list(range(10))
+
+
+def fake_classify(pilot):
+    """Every 5th question is a number; none is non-English."""
+    return {
+        "numbers": [i for i in pilot.index if i % 5 == 0],
+        "non_english": [],
+    }
+
+
+def test_estimate_run_projections(capsys):
+    df = pd.DataFrame({"question": [f"Question {i}" for i in range(10000)]})
+    detectors = {"numbers": lambda texts: [t.endswith("0") for t in texts]}
+    report = estimate_run(
+        fake_classify, df, detectors, pilot_size=2000, sample_size=1000, workers=4
+    )
+    assert report["pilot_size"] == 2000
+    assert report["total_questions"] == 10000
+    assert report["detectors"]["numbers"] > 0
+    assert report["projected_seconds"] == pytest.approx(
+        report["seconds_per_question"] * 10000 / 4
+    )
+
+    numbers = report["categories"]["numbers"]
+    assert numbers["prevalence"] == pytest.approx(0.2, abs=0.03)
+    low, high = numbers["prevalence_95ci"]
+    assert low < numbers["prevalence"] < high
+    count_low, count_high = numbers["projected_count_95ci"]
+    assert count_low <= numbers["projected_count"] <= count_high
+    assert numbers["reachable"] is True
+    assert report["categories"]["non_english"]["reachable"] is False
+
+    print_estimate(report, 1000)
+    out = capsys.readouterr().out
+    assert "'non_english' is unlikely to reach --sample-size 1000" in out
+    assert "'numbers'" not in out
+
+
+def test_estimate_run_counts_only_eligible_questions():
+    """Excluded rows are dropped and near-duplicate clusters count once."""
+    df = pd.DataFrame({"question": [f"Question {i}" for i in range(10000)]})
+    positions = np.arange(len(df))
+    excluded = positions % 10 == 0
+    report = estimate_run(
+        fake_classify, df, {}, pilot_size=2000, sample_size=1000, excluded=excluded
+    )
+    numbers = report["categories"]["numbers"]
+    assert numbers["prevalence"] == pytest.approx(0.1, abs=0.02)
+    assert numbers["pilot_eligible"] < numbers["pilot_count"]
+
+    # Rows i and i + 5 (i % 10 < 5) are near-duplicates of each other
+    labels = positions - np.where(positions % 10 >= 5, 5, 0)
+    report = estimate_run(
+        fake_classify,
+        df,
+        {},
+        pilot_size=2000,
+        sample_size=1000,
+        duplicate_labels=labels,
+    )
+    assert report["categories"]["numbers"]["prevalence"] == pytest.approx(0.1, abs=0.02)
+
+
+def test_print_estimate_notes_exclusive(capsys):
+    df = pd.DataFrame({"question": [f"Question {i}" for i in range(1000)]})
+    report = estimate_run(fake_classify, df, {}, pilot_size=200, sample_size=10)
+    print_estimate(report, 10, exclusive=True)
+    assert "--exclusive is not accounted for" in capsys.readouterr().out
+
+
+def test_estimate_run_uncertain_reachability():
+    """A sample size inside the projected interval is reported as uncertain."""
+    df = pd.DataFrame({"question": [f"Question {i}" for i in range(10000)]})
+    report = estimate_run(fake_classify, df, {}, pilot_size=500, sample_size=2000)
+    assert report["categories"]["numbers"]["reachable"] == "uncertain"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+"""
+Tests for record_index.py
+
+Validates record boundary scanning and the cached offset index.
+"""
+
+import sys
+import os
+import json
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from record_index import (
+    index_path_for,
+    load_record_index,
+    open_source,
+    scan_record_offsets,
+)
+
+RECORDS = [
+    {"question": "'Braces { and } and [brackets] in a string'", "value": "$200"},
+    {"question": 'Escaped \\"quote\\" and \\\\ backslash', "value": None},
+    {"question": "Nested", "extra": {"list": [1, {"a": "}"}]}},
+    {"question": "Non-ASCII: Kraków, 東京", "value": "$1,000"},
+    {"question": "Ends in a backslash \\", "extra": ['\\"]', "\\\\"]},
+]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_scan_matches_records(indent):
+    """Each offset range parses back to the corresponding record."""
+    buf = json.dumps(RECORDS, indent=indent, ensure_ascii=False).encode("utf-8")
+    starts, ends = scan_record_offsets(buf)
+    assert len(starts) == len(RECORDS)
+    for start, end, record in zip(starts, ends, RECORDS):
+        assert json.loads(buf[start:end]) == record
+
+
+@pytest.mark.parametrize("buf", [b"[]", b"  [ ]  "])
+def test_scan_empty_array(buf):
+    starts, ends = scan_record_offsets(buf)
+    assert len(starts) == len(ends) == 0
+
+
+@pytest.mark.parametrize(
+    "buf", [b'[{"a": 1}', b'[{"a": 1}]]', b"[[1, 2]]", b'[{"a": "1]']
+)
+def test_scan_rejects_malformed(buf):
+    with pytest.raises(ValueError):
+        scan_record_offsets(buf)
+
+
+def test_index_is_cached_and_rebuilt_when_stale(tmp_path):
+    """The index is stored next to the source and rebuilt after changes."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(RECORDS))
+    starts, _ = load_record_index(str(path))
+    assert os.path.exists(index_path_for(str(path)))
+    cached_starts, _ = load_record_index(str(path))
+    assert cached_starts.tolist() == starts.tolist()
+
+    path.write_text(json.dumps(RECORDS[:2], indent=2))
+    starts, ends = load_record_index(str(path))
+    assert len(starts) == 2
+    with open_source(str(path)) as buf:
+        assert json.loads(buf[starts[1] : ends[1]]) == RECORDS[1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,244 @@
+"""
+Tests for sampling.py
+
+Validates index sampling and sample export.
+"""
+
+import sys
+import os
+import json
+import random
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from record_index import load_record_index
+from sampling import (
+    allocate,
+    build_group_index,
+    drop_taken,
+    group_keys,
+    sample_indices,
+    save_index_samples,
+    save_raw_samples,
+    save_samples,
+    stratified_sample,
+)
+
+
+def test_sample_indices_size_and_membership():
+    """Sampled indices are distinct members of the input."""
+    random.seed(0)
+    result = sample_indices(list(range(100)), 10)
+    assert len(result) == len(set(result)) == 10
+    assert set(result) <= set(range(100))
+
+
+def test_sample_indices_not_enough():
+    """Requesting more indices than available raises ValueError."""
+    with pytest.raises(ValueError):
+        sample_indices([1, 2, 3], 4)
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_save_samples_writes_rows(tmp_path, fmt):
+    """Saved files hold exactly the sampled rows, skipping empty categories."""
+    df = pd.DataFrame({"question": ["a", "b", "c"], "answer": ["x", "y", "z"]})
+    save_samples({"numbers": [2, 0], "non_english": []}, df, Path(tmp_path), fmt, "ts")
+    files = os.listdir(tmp_path)
+    assert files == [f"jeopardy_ner_numbers_ts.{fmt}"]
+    with open(tmp_path / files[0]) as f:
+        if fmt == "json":
+            records = json.load(f)
+        else:
+            records = [json.loads(line) for line in f]
+    assert [r["question"] for r in records] == ["c", "a"]
+
+
+def test_save_samples_keeps_source_date_format(tmp_path):
+    """Parsed air dates are written back as YYYY-MM-DD strings."""
+    df = pd.DataFrame({"question": ["a"], "air_date": pd.to_datetime(["2004-12-31"])})
+    save_samples({"numbers": [0]}, df, Path(tmp_path), "jsonl", "ts")
+    with open(tmp_path / "jeopardy_ner_numbers_ts.jsonl") as f:
+        assert json.loads(f.readline())["air_date"] == "2004-12-31"
+
+
+def test_save_samples_keeps_source_show_number(tmp_path):
+    """Integer show numbers are written back as strings, as in the source."""
+    df = pd.DataFrame(
+        {"question": ["a", "b"], "show_number": pd.array([4680, None], "Int32")}
+    )
+    save_samples({"numbers": [0, 1]}, df, Path(tmp_path), "jsonl", "ts")
+    with open(tmp_path / "jeopardy_ner_numbers_ts.jsonl") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["show_number"] for r in records] == ["4680", None]
+
+
+STRATA_DF = pd.DataFrame(
+    {
+        "round": [
+            "Jeopardy!",
+            "Double Jeopardy!",
+            None,
+            "Jeopardy!",
+            "Final Jeopardy!",
+        ],
+        "air_date": [
+            "1984-09-10",
+            "1999-01-01",
+            "2004-12-31",
+            "bad date",
+            "1991-05-05",
+        ],
+        "category": ["HISTORY", "SCIENCE", "HISTORY", "ART", "SCIENCE"],
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "by,expected",
+    [
+        (
+            "round",
+            [
+                "Jeopardy!",
+                "Double Jeopardy!",
+                "unknown",
+                "Jeopardy!",
+                "Final Jeopardy!",
+            ],
+        ),
+        ("decade", ["1980s", "1990s", "2000s", "unknown", "1990s"]),
+        ("category", ["HISTORY", "SCIENCE", "HISTORY", "ART", "SCIENCE"]),
+    ],
+)
+def test_group_keys(by, expected):
+    assert group_keys(STRATA_DF, by).tolist() == expected
+
+
+def test_group_keys_rejects_unknown_column():
+    with pytest.raises(ValueError):
+        group_keys(STRATA_DF, "answer")
+
+
+def test_build_group_index():
+    """Each category's positions are split by group, keeping their order."""
+    keys = group_keys(STRATA_DF, "decade")
+    index = build_group_index(keys, {"numbers": [4, 1, 0], "non_english": []})
+    assert {g: m.tolist() for g, m in index["numbers"].items()} == {
+        "1980s": [0],
+        "1990s": [4, 1],
+    }
+    assert index["non_english"] == {}
+
+
+@pytest.mark.parametrize(
+    "sizes,n,allocation,expected",
+    [
+        ({"a": 5, "b": 100, "c": 3}, 20, "equal", {"a": 5, "b": 12, "c": 3}),
+        ({"a": 5, "b": 100, "c": 3}, 20, "proportional", {"a": 1, "b": 18, "c": 1}),
+        ({"a": 2, "b": 2}, 4, "equal", {"a": 2, "b": 2}),
+        ({"a": 2, "b": 2}, 0, "equal", {}),
+    ],
+)
+def test_allocate(sizes, n, allocation, expected):
+    result = allocate(sizes, n, allocation)
+    assert result == expected
+    assert sum(result.values()) == n
+    assert all(result[g] <= sizes[g] for g in result)
+
+
+@pytest.mark.parametrize("allocation", ["equal", "proportional"])
+def test_allocate_remainder_not_biased_by_label_order(allocation):
+    """Leftover samples go to random groups, not the first labels."""
+    sizes = {f"CAT{i:05d}": 3 for i in range(27000)}
+    random.seed(0)
+    result = allocate(sizes, 1000, allocation)
+    assert sum(result.values()) == 1000 and set(result.values()) == {1}
+    first = sum(1 for g in result if g < "CAT01000")
+    assert first < 100
+    random.seed(0)
+    assert allocate(sizes, 1000, allocation) == result
+
+
+def test_allocate_equal_remainder_spread():
+    """An uneven split gives the one leftover sample to a single group."""
+    result = allocate({"a": 10, "b": 10, "c": 10}, 10, "equal")
+    assert sorted(result.values()) == [3, 3, 4]
+
+
+def test_allocate_not_enough():
+    with pytest.raises(ValueError):
+        allocate({"a": 2, "b": 1}, 4)
+
+
+def test_drop_taken_keeps_order():
+    taken = np.array([False, True, False, True, False])
+    assert drop_taken([4, 3, 2, 1, 0], taken).tolist() == [4, 2, 0]
+
+
+def test_stratified_sample_respects_groups():
+    """Samples are distinct members drawn according to the allocation."""
+    random.seed(0)
+    groups = {"a": np.arange(0, 50), "b": np.arange(50, 53), "c": np.arange(53, 60)}
+    sample = stratified_sample(groups, 15)
+    assert len(set(sample)) == 15
+    assert sum(1 for i in sample if 50 <= i < 53) == 3
+    assert sum(1 for i in sample if i >= 53) == 6
+
+
+@pytest.fixture
+def source(tmp_path):
+    records = [{"question": f"q{i}", "air_date": "2004-12-31"} for i in range(5)]
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps(records, indent=2))
+    return str(path), records
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_save_raw_samples_copies_records(tmp_path, source, fmt):
+    """Raw mode writes the sampled source records in sample order."""
+    path, records = source
+    outdir = tmp_path / "out"
+    outdir.mkdir()
+    save_raw_samples(
+        {"numbers": [3, 1], "non_english": []},
+        path,
+        load_record_index(path),
+        outdir,
+        fmt,
+        "ts",
+    )
+    assert os.listdir(outdir) == [f"jeopardy_ner_numbers_ts.{fmt}"]
+    with open(outdir / f"jeopardy_ner_numbers_ts.{fmt}") as f:
+        if fmt == "json":
+            written = json.load(f)
+        else:
+            written = [json.loads(line) for line in f]
+    assert written == [records[3], records[1]]
+
+
+def test_save_index_samples_offsets(tmp_path, source):
+    """Index-only mode emits ids and byte ranges that slice the source."""
+    path, records = source
+    outdir = tmp_path / "out"
+    outdir.mkdir()
+    save_index_samples(
+        {"numbers": [4, 0]}, load_record_index(path), outdir, "jsonl", "ts"
+    )
+    with open(outdir / "jeopardy_ner_numbers_ts.index.jsonl") as f:
+        entries = [json.loads(line) for line in f]
+    assert [e["id"] for e in entries] == [4, 0]
+    with open(path, "rb") as f:
+        data = f.read()
+    for entry in entries:
+        chunk = data[entry["offset"] : entry["offset"] + entry["length"]]
+        assert json.loads(chunk) == records[entry["id"]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
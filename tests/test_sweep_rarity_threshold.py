@@ -0,0 +1,69 @@
+"""
+Tests for sweep_rarity_threshold.py
+
+Validates threshold counts and selections computed from stored rarity arrays.
+"""
+
+import sys
+import os
+import numpy as np
+import pytest
+
+# Ensure src is in path for import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import spacy
+from spacy.tokens import Doc
+
+from annotation_store import AnnotationWriter
+from sweep_rarity_threshold import (
+    count_qualifying,
+    load_rarity,
+    qualifying_indices,
+    rarity_from_store,
+)
+
+RARITY = np.array([1e-9, np.inf, 5e-7, 2e-6, 1e-6, 3e-8, np.inf], dtype=np.float32)
+
+
+@pytest.mark.parametrize(
+    "threshold,expected",
+    [(1e-10, []), (1e-8, [0]), (1e-6, [0, 2, 5]), (1e-5, [0, 2, 3, 4, 5])],
+)
+def test_qualifying_indices(threshold, expected):
+    """Questions qualify strictly below the threshold; inf never qualifies."""
+    assert qualifying_indices(RARITY, threshold) == expected
+
+
+def test_count_qualifying_matches_indices():
+    """Sweep counts agree with explicit selections at every threshold."""
+    thresholds = [1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10]
+    counts = count_qualifying(RARITY, thresholds)
+    for t in thresholds:
+        assert counts[t] == len(qualifying_indices(RARITY, t))
+
+
+def test_load_rarity_round_trip(tmp_path):
+    """Arrays stored with np.save load back unchanged."""
+    path = tmp_path / "rarity.npy"
+    np.save(path, RARITY)
+    np.testing.assert_array_equal(load_rarity(path), RARITY)
+
+
+def test_rarity_from_store_applies_rule(tmp_path):
+    """Rarity is recomputed from stored Docs under different proper noun rules."""
+    nlp = spacy.blank("en")
+    path = str(tmp_path / "store")
+    writer = AnnotationWriter(path, 3, "hash", nlp)
+    writer.add(0, Doc(nlp.vocab, words=["Zorkblatt", "won"], pos=["PROPN", "VERB"]))
+    writer.add(2, Doc(nlp.vocab, words=["Qx", "zorkblatt"], pos=["PROPN", "NOUN"]))
+    writer.close()
+
+    default = rarity_from_store(path)
+    assert default[0] < 1e-6 and np.isinf(default[1]) and np.isinf(default[2])
+    assert np.isinf(rarity_from_store(path, min_length=10)[0])
+    assert rarity_from_store(path, pos_tags=("PROPN", "NOUN"))[2] < 1e-6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])